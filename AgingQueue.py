@@ -0,0 +1,230 @@
+import heapq
+
+
+class AgingQueue:
+    """
+    A ready queue for priority scheduling with aging, ordered by priority and then by ready queue time.
+
+    A process in the queue has its priority decreased by one (down to zero) every aging_period time
+    units it spends there. Instead of decreasing the priority of every queued process and rebuilding
+    the heap on every tick, the queue ages processes lazily: processes that entered the queue at
+    times with the same remainder modulo aging_period (the same phase) age at the same ticks, so each
+    phase keeps a heap keyed on a virtual priority (the priority plus the number of aging ticks of
+    that phase before the process entered). The current priority of a process is then its virtual
+    priority minus the number of aging ticks of its phase so far, which preserves the order inside
+    the phase. Processes that reach priority zero move to a second heap of their phase, ordered by
+    ready queue time only. The priority attribute of a process is written back when it leaves the queue.
+
+    Attributes:
+        - aging_period (int): The time a process spends in the ready queue before its priority is decreased.
+        - time (int): The current time, set by age().
+        - heaps (list): One heap of (virtual priority, ready queue time, sequence, process) per phase.
+        - aged_heaps (list): One heap of (ready queue time, sequence, process) per phase, for priority zero.
+        - sequence (int): The sequence number given to the next process added to the queue.
+        - size (int): The number of processes in the queue.
+
+    Methods:
+        - __init__: Initializes an empty AgingQueue.
+        - age: Moves the queue to a given time, aging the processes in it.
+        - append: Adds a process to the queue.
+        - pop: Removes and returns the process with the highest priority.
+        - peek: Returns the process with the highest priority without removing it.
+        - next_time_below: Returns the first time at which a queued process drops below a given priority.
+        - sync_priorities: Writes the current priority back to every process in the queue.
+        - copy_heap_to_list: Creates a list of the processes in the queue.
+        - is_empty: Checks if the queue is empty.
+        - __len__: Returns the number of processes in the queue.
+    """
+
+    def __init__(self, aging_period=5):
+        """
+        Initializes an AgingQueue instance.
+
+        Parameters:
+            - aging_period (int): The time a process spends in the ready queue before its priority is decreased.
+        """
+
+        self.aging_period = aging_period
+        self.time = 0
+        self.heaps = [[] for _ in range(aging_period)]
+        self.aged_heaps = [[] for _ in range(aging_period)]
+        self.sequence = 0
+        self.size = 0
+
+    def age(self, time):
+        """
+        Moves the queue to a given time, aging the processes in it.
+
+        Parameters:
+            - time (int): The current time.
+        """
+        self.time = time
+
+    def append(self, process):
+        """
+        Adds a process to the queue.
+
+        Parameters:
+            - process (Process): The process, with its ready_queue_time set to the current time.
+        """
+
+        phase = process.ready_queue_time % self.aging_period
+        virtual = process.priority + self.offset(phase, process.ready_queue_time)
+        heapq.heappush(self.heaps[phase], (virtual, process.ready_queue_time, self.sequence, process))
+        self.sequence = self.sequence + 1
+        self.size = self.size + 1
+
+    def pop(self):
+        """
+        Removes and returns the process with the highest priority.
+
+        Returns:
+            The process with the lowest priority value, with its priority attribute updated.
+        """
+
+        phase, aged = self.top()
+        if aged:
+            _, _, process = heapq.heappop(self.aged_heaps[phase])
+            process.priority = 0
+        else:
+            virtual, _, _, process = heapq.heappop(self.heaps[phase])
+            process.priority = virtual - self.offset(phase, self.time)
+        self.size = self.size - 1
+        return process
+
+    def peek(self):
+        """
+        Returns the process with the highest priority without removing it.
+
+        Returns:
+            The process with the lowest priority value, with its priority attribute updated.
+        """
+
+        phase, aged = self.top()
+        if aged:
+            process = self.aged_heaps[phase][0][2]
+            process.priority = 0
+        else:
+            virtual, _, _, process = self.heaps[phase][0]
+            process.priority = virtual - self.offset(phase, self.time)
+        return process
+
+    def next_time_below(self, priority):
+        """
+        Returns the first time after the current time at which a process in the queue
+        has a priority lower than a given one, assuming nothing enters or leaves the queue.
+
+        Parameters:
+            - priority (int): The priority to compare with.
+
+        Returns:
+            The time, or None if no process in the queue can drop below that priority.
+        """
+
+        if priority <= 0:
+            return None
+
+        time = None
+        for phase in range(self.aging_period):
+            if self.aged_heaps[phase]:
+                return self.time + 1
+            if not self.heaps[phase]:
+                continue
+
+            # the current priority drops below `priority` once the offset of the phase exceeds virtual - priority
+            offset = self.heaps[phase][0][0] - priority + 1
+            candidate = max(phase + offset * self.aging_period, self.time + 1)
+            if time is None or candidate < time:
+                time = candidate
+        return time
+
+    def sync_priorities(self):
+        """
+        Writes the current priority back to every process in the queue.
+        """
+
+        for phase in range(self.aging_period):
+            self.graduate(phase)
+            for virtual, _, _, process in self.heaps[phase]:
+                process.priority = virtual - self.offset(phase, self.time)
+            for _, _, process in self.aged_heaps[phase]:
+                process.priority = 0
+
+    def copy_heap_to_list(self):
+        """
+        Creates a list of the processes in the queue.
+
+        Returns:
+            A list containing the processes in the queue, in no particular order.
+        """
+
+        list_heap = []
+        for phase in range(self.aging_period):
+            list_heap.extend(entry[3] for entry in self.heaps[phase])
+            list_heap.extend(entry[2] for entry in self.aged_heaps[phase])
+        return list_heap
+
+    def is_empty(self):
+        """
+        Checks if the queue is empty.
+
+        Returns:
+            True if the queue is empty, False otherwise.
+        """
+        return self.size == 0
+
+    def __len__(self):
+        """
+        Returns the number of processes in the queue.
+        """
+        return self.size
+
+    def offset(self, phase, time):
+        """
+        Returns the number of aging ticks of a phase up to a given time.
+
+        Parameters:
+            - phase (int): The phase (ready queue time modulo aging_period).
+            - time (int): The time.
+        """
+        return (time - phase) // self.aging_period
+
+    def graduate(self, phase):
+        """
+        Moves the processes of a phase that have reached priority zero to the aged heap of that phase.
+
+        Parameters:
+            - phase (int): The phase (ready queue time modulo aging_period).
+        """
+
+        heap = self.heaps[phase]
+        offset = self.offset(phase, self.time)
+        while heap and heap[0][0] <= offset:
+            _, ready_queue_time, sequence, process = heapq.heappop(heap)
+            heapq.heappush(self.aged_heaps[phase], (ready_queue_time, sequence, process))
+
+    def top(self):
+        """
+        Finds the phase holding the process with the highest priority.
+
+        Returns:
+            A tuple (phase, aged) where aged tells whether the process is in the aged heap of the phase.
+        """
+
+        if self.is_empty():
+            raise IndexError("pop from an empty priority queue")
+
+        best = None
+        for phase in range(self.aging_period):
+            self.graduate(phase)
+            if self.aged_heaps[phase]:
+                ready_queue_time, sequence, _ = self.aged_heaps[phase][0]
+                key = (0, ready_queue_time, sequence, phase, True)
+            elif self.heaps[phase]:
+                virtual, ready_queue_time, sequence, _ = self.heaps[phase][0]
+                key = (virtual - self.offset(phase, self.time), ready_queue_time, sequence, phase, False)
+            else:
+                continue
+            if best is None or key < best:
+                best = key
+        return best[3], best[4]
@@ -0,0 +1,68 @@
+class ArrivalIndex:
+    """
+    A cursor over the processes of a workload, sorted by arrival time.
+
+    The processes are sorted once, so handling the arrivals at a given time only touches the processes
+    arriving at that time instead of scanning the whole workload. Processes with the same arrival time
+    keep the order they have in the workload.
+
+    Attributes:
+        - processes (list): The processes of the workload, sorted by arrival time.
+        - position (int): Index in processes of the next process to arrive.
+
+    Methods:
+        - __init__: Initializes an ArrivalIndex over a list of processes.
+        - next_time: Returns the arrival time of the next process to arrive.
+        - pop_arrivals: Removes and returns the processes arriving at a given time.
+        - is_empty: Checks if every process has arrived.
+    """
+
+    def __init__(self, processes):
+        """
+        Initializes an ArrivalIndex instance.
+
+        Parameters:
+            - processes (list): List of processes of the workload. Every process is admitted, including
+                all the processes arriving at time 0, which the simulation handles at time 0.
+        """
+
+        # sorted() is stable, so simultaneous arrivals keep the order of the workload
+        self.processes = sorted(processes, key=lambda process: process.arrival_time)
+        self.position = 0
+
+    def next_time(self):
+        """
+        Returns the arrival time of the next process to arrive.
+
+        Returns:
+            The arrival time of the next process, or None if every process has arrived.
+        """
+
+        if self.is_empty():
+            return None
+        return self.processes[self.position].arrival_time
+
+    def pop_arrivals(self, time):
+        """
+        Removes and returns the processes arriving at a given time.
+
+        Parameters:
+            - time (int): The current time.
+
+        Returns:
+            A list of the processes arriving at that time, in workload order.
+        """
+
+        start = self.position
+        while self.position < len(self.processes) and self.processes[self.position].arrival_time <= time:
+            self.position = self.position + 1
+        return self.processes[start:self.position]
+
+    def is_empty(self):
+        """
+        Checks if every process has arrived.
+
+        Returns:
+            True if there are no more arrivals, False otherwise.
+        """
+        return self.position >= len(self.processes)
@@ -0,0 +1,111 @@
+from ArrivalIndex import *
+
+
+class ArrivalStream:
+    """
+    A cursor over a stream of processes sorted by arrival time, with the same methods as ArrivalIndex.
+
+    ArrivalIndex sorts the whole workload up front, so it holds every process in memory. An
+    ArrivalStream instead pulls processes from an iterator (for example a trace file reader) only
+    when the simulation reaches their arrival time, keeping a single process of lookahead, so the
+    processes that have not arrived yet are never held in memory. A process that has arrived is held
+    by the queues for as long as it keeps coming back, so memory is bounded by the processes that
+    have arrived and still come back, and only stays constant when processes do not come back. The stream must be sorted by arrival time;
+    processes with the same arrival time keep the order of the stream.
+
+    Attributes:
+        - processes (iterator): The processes that have not been read yet.
+        - next_process (Process): The next process to arrive, or None if the stream is exhausted.
+        - last_time (int): The arrival time of the last process read, to check the order of the stream.
+
+    Methods:
+        - __init__: Initializes an ArrivalStream over an iterable of processes.
+        - next_time: Returns the arrival time of the next process to arrive.
+        - pop_arrivals: Removes and returns the processes arriving at a given time.
+        - is_empty: Checks if every process has arrived.
+        - read: Reads the next process from the stream.
+    """
+
+    def __init__(self, processes):
+        """
+        Initializes an ArrivalStream instance.
+
+        Parameters:
+            - processes (iterable): The processes of the workload, sorted by arrival time.
+        """
+
+        self.processes = iter(processes)
+        self.next_process = None
+        self.last_time = None
+        self.read()
+
+    def next_time(self):
+        """
+        Returns the arrival time of the next process to arrive.
+
+        Returns:
+            The arrival time of the next process, or None if every process has arrived.
+        """
+
+        if self.next_process is None:
+            return None
+        return self.next_process.arrival_time
+
+    def pop_arrivals(self, time):
+        """
+        Removes and returns the processes arriving at a given time.
+
+        Parameters:
+            - time (int): The current time.
+
+        Returns:
+            A list of the processes arriving at that time, in stream order.
+        """
+
+        arrivals = []
+        while self.next_process is not None and self.next_process.arrival_time <= time:
+            arrivals.append(self.next_process)
+            self.read()
+        return arrivals
+
+    def is_empty(self):
+        """
+        Checks if every process has arrived.
+
+        Returns:
+            True if there are no more arrivals, False otherwise.
+        """
+        return self.next_process is None
+
+    def read(self):
+        """
+        Reads the next process from the stream into next_process, or None if the stream is exhausted.
+        """
+
+        process = next(self.processes, None)
+        if process is not None:
+            if self.last_time is not None and process.arrival_time < self.last_time:
+                raise ValueError("the processes of a stream must be sorted by arrival time")
+            self.last_time = process.arrival_time
+        self.next_process = process
+
+
+def open_arrivals(processes):
+    """
+    Sets up the arrivals of a simulation over a workload.
+
+    A list of processes (or a ProcessTable) is indexed by an ArrivalIndex; any other iterable is
+    treated as a stream sorted by arrival time and read lazily by an ArrivalStream. The simulation
+    starts with an idle CPU and admits every process at its arrival time, so the processes arriving
+    at time 0 all enter the ready queue at time 0, and no process runs before it arrives.
+
+    Parameters:
+        - processes (list or iterable): The processes of the workload.
+
+    Returns:
+        - ArrivalIndex or ArrivalStream: The arrivals of the workload.
+    """
+
+    if hasattr(processes, "__getitem__"):
+        return ArrivalIndex(processes)
+    return ArrivalStream(processes)
@@ -0,0 +1,415 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from types import SimpleNamespace
+
+from EventEngine import *
+from Workload import *
+
+# The states of a process of a batch
+FUTURE, READY, RUNNING, WAITING, GONE = range(5)
+
+# The arrays of a batch, one row per instance and one column per process
+FIELDS = ("arrival_time", "burst_time", "come_back", "priority", "remaining_time", "ready_queue_time", "start_time",
+          "finish_time", "cpu_turn_time", "first_start_time", "waiting_time", "completions", "cpu_time",
+          "has_executed", "state", "queue_key", "comeback_time")
+
+# Larger than any time or ready queue key of a batch, it keeps a cell out of a minimum
+NEVER = 2 ** 62
+
+
+class BatchEngine:
+    """
+    A tick-driven engine that runs one algorithm over a batch of workloads in lockstep, with NumPy arrays.
+
+    Running thousands of small workloads one after the other spends most of the time in the Python
+    objects of each run. The engine instead holds the batch as 2-D arrays, one row per instance
+    (workload) and one column per process, so every field of the processes (remaining time, ready
+    queue time, priority, ...) is a single array, and advances every instance by one time unit at
+    each step with vectorized operations. Workloads with fewer processes than the largest one are
+    padded with processes that never arrive.
+
+    The ready queue of an instance is not a data structure: it is the set of processes in the READY
+    state, and the next process to run is the one with the smallest (primary key, queue key). The
+    primary key is the burst time (SJF), the remaining time (SRTF) or the aged priority (PP), and
+    FCFS and RR only use the queue key, which is the order in which the processes entered the queue:
+    the time they entered it, then arrivals by workload order, comebacks by the time they finished
+    and the preempted process last, as in the tick loops. The aged priority of a queued process is
+    computed from its priority when it entered the queue and the time it has spent there, like the
+    AgingQueue. Each step follows the phases of one iteration of the tick loops in the same order, so
+    every instance ends with the same process fields and metrics as run_algorithm_FCFS, run_algorithm_SJF,
+    run_algorithm_SRTF, run_algorithm_RR or run_algorithm_PP. The engine does not record Gantt charts.
+
+    As in the tick loops, every CPU starts idle and each process enters the ready queue at its arrival
+    time, so all the processes arriving at time 0 are admitted at time 0.
+
+    Attributes:
+        - algorithm (str): One of "FCFS", "SJF", "SRTF", "RR" or "PP".
+        - time_limit (int): The time limit for the simulation.
+        - is_preemptive (bool): Indicates whether the PP algorithm is preemptive or non-preemptive.
+        - sizes (numpy.ndarray): The number of processes of each instance.
+        - arrival_time, burst_time, come_back (numpy.ndarray): The fixed fields of the processes, one row per instance.
+        - priority, remaining_time, ready_queue_time, start_time, finish_time, cpu_turn_time,
+            first_start_time, waiting_time, completions, cpu_time, has_executed (numpy.ndarray):
+            The simulation fields of the processes, one row per instance, as in Process.
+        - state (numpy.ndarray): The state of every process: FUTURE, READY, RUNNING, WAITING or GONE.
+        - queue_key (numpy.ndarray): The order in which the ready processes entered the ready queue.
+        - comeback_time (numpy.ndarray): The time at which each waiting process comes back, or NEVER.
+        - flat (SimpleNamespace): One-dimensional views of all the arrays above, indexed by cell
+            (row * columns + column), which are much faster to index with arrays of cells.
+        - running (numpy.ndarray): The cell of the running process of each instance, or -1 if its CPU is idle.
+        - arrivals (tuple): The cells of the real (not padding) processes and their arrival times,
+            sorted by arrival time and then by cell.
+        - position (int): Index in the arrivals of the next process to arrive.
+
+    Methods:
+        - __init__: Initializes a BatchEngine over the process fields of a batch.
+        - from_workloads: Static method to create a BatchEngine over a list of workloads.
+        - run: Runs every instance up to the time limit.
+        - step: Advances every instance by one time unit.
+        - select: Returns the next ready process of every instance.
+        - dispatch: Moves processes from the ready queue onto the CPU.
+        - finish: Moves processes that finished their burst from the CPU to the waiting queue.
+        - leave_cpu: Takes processes off the CPU.
+        - end: Ends the simulation at the time limit.
+        - metrics: Returns the metrics of every instance as arrays.
+    """
+
+    def __init__(self, arrival_time, burst_time, come_back, priority, algorithm, time_limit, is_preemptive=True,
+                 sizes=None):
+        """
+        Initializes a BatchEngine instance.
+
+        Parameters:
+            - arrival_time, burst_time, come_back, priority (array-like): The fields defining the
+                processes, as 2-D arrays with one row per instance and one column per process.
+            - algorithm (str): One of "FCFS", "SJF", "SRTF", "RR" or "PP".
+            - time_limit (int): The time limit for the simulation.
+            - is_preemptive (bool): Indicates whether the PP algorithm is preemptive or non-preemptive.
+            - sizes (array-like): The number of processes of each instance; the columns beyond it are
+                padding. By default every instance has a process in every column.
+        """
+
+        if numpy is None:
+            raise ImportError("the batch engine needs NumPy")
+        if algorithm not in ("FCFS", "SJF", "SRTF", "RR", "PP"):
+            raise ValueError("unknown scheduling algorithm for the batch engine: " + str(algorithm))
+
+        self.algorithm = algorithm
+        self.time_limit = time_limit
+        self.is_preemptive = is_preemptive
+
+        self.arrival_time = numpy.array(arrival_time, dtype=numpy.int64, ndmin=2)
+        self.burst_time = numpy.array(burst_time, dtype=numpy.int64, ndmin=2)
+        self.come_back = numpy.array(come_back, dtype=numpy.int64, ndmin=2)
+        self.priority = numpy.array(priority, dtype=numpy.int64, ndmin=2)
+        shape = self.arrival_time.shape
+        if not (self.burst_time.shape == self.come_back.shape == self.priority.shape == shape):
+            raise ValueError("all process fields must have the same shape")
+        instances, columns = shape
+
+        if sizes is None:
+            self.sizes = numpy.full(instances, columns, dtype=numpy.int64)
+        else:
+            self.sizes = numpy.array(sizes, dtype=numpy.int64)
+            if self.sizes.shape != (instances,) or numpy.any(self.sizes < 0) or numpy.any(self.sizes > columns):
+                raise ValueError("every instance needs a size between 0 and the number of columns")
+        real = numpy.arange(columns) < self.sizes[:, None]
+
+        self.remaining_time = self.burst_time.copy()
+        for name in ("ready_queue_time", "start_time", "finish_time", "cpu_turn_time", "first_start_time",
+                     "waiting_time", "completions", "cpu_time"):
+            setattr(self, name, numpy.zeros(shape, dtype=numpy.int64))
+        self.has_executed = numpy.zeros(shape, dtype=bool)
+
+        self.queue_key = numpy.zeros(shape, dtype=numpy.int64)
+        self.comeback_time = numpy.full(shape, NEVER, dtype=numpy.int64)
+
+        # the padding processes never arrive
+        self.state = numpy.where(real, FUTURE, GONE).astype(numpy.int8)
+        # every array is a new contiguous array, so reshaping it gives a view
+        self.flat = SimpleNamespace(**{name: getattr(self, name).reshape(-1) for name in FIELDS})
+        # every CPU starts idle, and the processes arriving at time 0 are dispatched by the first step
+        self.running = numpy.full(instances, -1, dtype=numpy.int64)
+
+        # sort the arrivals once; the stable sort keeps simultaneous arrivals in cell order,
+        # which is workload order within an instance
+        arriving = numpy.flatnonzero(self.flat.state == FUTURE)
+        times = self.flat.arrival_time[arriving]
+        order = numpy.argsort(times, kind="stable")
+        self.arrivals = (arriving[order], times[order])
+        self.position = 0
+
+    @staticmethod
+    def from_workloads(workloads, algorithm, time_limit, is_preemptive=True):
+        """
+        Static method to create a BatchEngine over a list of workloads, padding the smaller ones.
+
+        Parameters:
+            - workloads (list): The workloads, as Workload instances or lists of processes that have not run yet.
+            - algorithm (str): One of "FCFS", "SJF", "SRTF", "RR" or "PP".
+            - time_limit (int): The time limit for the simulation.
+            - is_preemptive (bool): Indicates whether the PP algorithm is preemptive or non-preemptive.
+
+        Returns:
+            - BatchEngine: The engine, with one instance per workload, in order.
+        """
+
+        if numpy is None:
+            raise ImportError("the batch engine needs NumPy")
+
+        workloads = [workload if isinstance(workload, Workload) else Workload.from_processes(workload)
+                     for workload in workloads]
+        sizes = [len(workload) for workload in workloads]
+        shape = (len(workloads), max(sizes, default=0))
+
+        fields = []
+        for name in ("arrival_time", "burst_time", "come_back", "priority"):
+            field = numpy.zeros(shape, dtype=numpy.int64)
+            for row, workload in enumerate(workloads):
+                field[row, :sizes[row]] = getattr(workload, name)
+            fields.append(field)
+        return BatchEngine(*fields, algorithm, time_limit, is_preemptive, sizes)
+
+    def run(self):
+        """
+        Runs every instance up to the time limit.
+        """
+
+        for time in range(0, self.time_limit):
+            self.step(time)
+        self.end()
+
+    def step(self, time):
+        """
+        Advances every instance by one time unit, in the same order as one iteration of the tick loops.
+
+        Parameters:
+            - time (int): The new time.
+        """
+
+        flat = self.flat
+        columns = self.state.shape[1]
+        # the queue key orders the processes entering the ready queue at the same time: arrivals by
+        # column, then comebacks by the time they finished, then the preempted process
+        base = time * (columns + self.time_limit + 2)
+
+        # handle the debut of new processes
+        cells, times = self.arrivals
+        stop = self.position + numpy.searchsorted(times[self.position:], time, side="right")
+        if stop > self.position:
+            cells = cells[self.position:stop]
+            flat.state[cells] = READY
+            flat.ready_queue_time[cells] = time
+            flat.queue_key[cells] = base + cells % columns
+            self.position = stop
+
+        # handle the return of processes from the waiting queue
+        cells = numpy.flatnonzero(flat.comeback_time == time)
+        if len(cells):
+            flat.state[cells] = READY
+            flat.remaining_time[cells] = flat.burst_time[cells]
+            flat.ready_queue_time[cells] = time
+            flat.queue_key[cells] = base + columns + flat.finish_time[cells]
+            flat.comeback_time[cells] = NEVER
+
+        # run the running processes for one time unit, and finish the ones that have completed their burst
+        cells = self.running[self.running >= 0]
+        remaining = numpy.maximum(flat.remaining_time[cells] - 1, 0)
+        flat.remaining_time[cells] = remaining
+        finished = remaining == 0
+        self.finish(time, cells[finished])
+        cells = cells[~finished]
+
+        ready = self.state == READY
+        has_ready = ready.any(axis=1)
+        if not has_ready.any():
+            return
+        best, keys = self.select(time, ready)
+
+        # interrupt the running processes that another ready process replaces
+        if self.algorithm in ("SRTF", "RR") or (self.algorithm == "PP" and self.is_preemptive):
+            rows = cells // columns
+            waiting = has_ready[rows]
+            cells, rows = cells[waiting], rows[waiting]
+            if self.algorithm == "SRTF":
+                replaced = keys[best[rows]] < flat.remaining_time[cells]
+            elif self.algorithm == "RR":
+                replaced = (time - flat.start_time[cells]) % EventEngine.quantum == 0
+            else:
+                replaced = keys[best[rows]] < flat.priority[cells]
+            cells, rows = cells[replaced], rows[replaced]
+
+            self.leave_cpu(time, cells)
+            flat.state[cells] = READY
+            flat.ready_queue_time[cells] = time
+            flat.queue_key[cells] = base + columns + self.time_limit + 1
+            self.dispatch(time, best[rows], keys)
+
+        # fetch the next process from the ready queue where the CPU is idle
+        rows = numpy.flatnonzero((self.running < 0) & has_ready)
+        self.dispatch(time, best[rows], keys)
+
+    def select(self, time, ready):
+        """
+        Returns the next ready process of every instance: the one with the smallest primary key,
+        then the smallest queue key.
+
+        Parameters:
+            - time (int): The current time.
+            - ready (numpy.ndarray): True for the ready processes.
+
+        Returns:
+            - tuple: The cell of the next process of every instance (meaningless for an instance
+                without ready processes), and the primary key of every cell (burst time, remaining
+                time or aged priority), or None for FCFS and RR.
+        """
+
+        instances, columns = ready.shape
+        first = numpy.arange(instances) * columns
+        if self.algorithm in ("FCFS", "RR"):
+            return first + numpy.argmin(numpy.where(ready, self.queue_key, NEVER), axis=1), None
+
+        if self.algorithm == "SJF":
+            keys = self.burst_time
+        elif self.algorithm == "SRTF":
+            keys = self.remaining_time
+        else:
+            # the priority of a queued process decreases by one (down to zero) every aging_period
+            # time units it spends in the queue
+            keys = numpy.maximum(self.priority - (time - self.ready_queue_time) // EventEngine.aging_period, 0)
+
+        smallest = numpy.where(ready, keys, NEVER).min(axis=1, keepdims=True)
+        candidates = ready & (keys == smallest)
+        return first + numpy.argmin(numpy.where(candidates, self.queue_key, NEVER), axis=1), keys.reshape(-1)
+
+    def dispatch(self, time, cells, keys=None):
+        """
+        Moves processes from the ready queue onto the CPU.
+
+        Parameters:
+            - time (int): The current time.
+            - cells (numpy.ndarray): The processes, at most one per instance.
+            - keys (numpy.ndarray): The aged priority of every cell (PP), written back to the processes.
+        """
+
+        flat = self.flat
+        flat.waiting_time[cells] += time - flat.ready_queue_time[cells]
+        flat.first_start_time[cells] = numpy.where(flat.has_executed[cells], flat.first_start_time[cells], time)
+        flat.has_executed[cells] = True
+        flat.start_time[cells] = time
+        flat.state[cells] = RUNNING
+        self.running[cells // self.state.shape[1]] = cells
+        if self.algorithm == "PP" and keys is not None:
+            flat.priority[cells] = keys[cells]
+
+    def finish(self, time, cells):
+        """
+        Moves processes that finished their burst from the CPU to the waiting queue, or out of the
+        simulation if they never come back.
+
+        Parameters:
+            - time (int): The current time.
+            - cells (numpy.ndarray): The finished processes, at most one per instance.
+        """
+
+        flat = self.flat
+        flat.finish_time[cells] = time
+        flat.completions[cells] += 1
+        self.leave_cpu(time, cells)
+
+        come_back = flat.come_back[cells]
+        flat.comeback_time[cells] = numpy.where(come_back > 0, time + come_back, NEVER)
+        flat.state[cells] = numpy.where(come_back > 0, WAITING, GONE)
+        self.running[cells // self.state.shape[1]] = -1
+
+    def leave_cpu(self, time, cells):
+        """
+        Takes processes off the CPU.
+
+        Parameters:
+            - time (int): The current time.
+            - cells (numpy.ndarray): The running processes, at most one per instance.
+        """
+
+        flat = self.flat
+        flat.cpu_turn_time[cells] = time
+        flat.cpu_time[cells] += time - flat.start_time[cells]
+
+    def end(self):
+        """
+        Ends the simulation at the time limit: closes the segments of the running processes and,
+        for PP, writes the aged priorities back to the queued processes, as the tick loops do.
+        """
+
+        self.leave_cpu(self.time_limit, self.running[self.running >= 0])
+
+        if self.algorithm == "PP":
+            # the tick loop ages the queue up to its last iteration
+            last = max(self.time_limit - 1, 0)
+            ready = self.state == READY
+            aged = numpy.maximum(self.priority - (last - self.ready_queue_time) // EventEngine.aging_period, 0)
+            self.priority[ready] = aged[ready]
+
+    def metrics(self, percentiles=(50, 90, 99)):
+        """
+        Returns the metrics of every instance, as calculate_metrics computes them for one run.
+
+        Parameters:
+            - percentiles (tuple): The percentiles to compute for the waiting, turnaround and response times.
+
+        Returns:
+            - dict: The keys of calculate_metrics, each mapped to an array with one value per instance
+                (and the percentile keys to a dict from percentile to such an array). Values that
+                calculate_metrics returns as None are NaN.
+        """
+
+        executed = self.has_executed
+        count = executed.sum(axis=1)
+        completions = self.completions.sum(axis=1)
+        metrics = {"processes": self.sizes.copy(), "executed": count, "completions": completions}
+
+        for name, values in (("waiting_time", self.waiting_time),
+                             ("turnaround_time", self.cpu_turn_time - self.arrival_time),
+                             ("response_time", self.first_start_time - self.arrival_time)):
+            total = numpy.where(executed, values, 0).sum(axis=1)
+            metrics["average_" + name] = numpy.where(count > 0, total / numpy.maximum(count, 1), numpy.nan)
+            metrics[name + "_percentiles"] = batch_percentiles(values, executed, count, percentiles)
+
+        if self.time_limit:
+            metrics["throughput"] = completions / self.time_limit
+            metrics["cpu_utilisation"] = self.cpu_time.sum(axis=1) / self.time_limit
+        else:
+            metrics["throughput"] = numpy.full(len(count), numpy.nan)
+            metrics["cpu_utilisation"] = numpy.full(len(count), numpy.nan)
+
+        return metrics
+
+
+def batch_percentiles(values, selected, count, percentiles):
+    """
+    Computes percentiles of the selected values of every row, as calculate_percentiles does for one run.
+
+    The rows are grouped by the number of selected values, so each group is a single call to
+    numpy.percentile, which then interpolates exactly as it does for one run.
+
+    Parameters:
+        - values (numpy.ndarray): The values, one row per instance.
+        - selected (numpy.ndarray): True for the values to include.
+        - count (numpy.ndarray): The number of selected values of each row.
+        - percentiles (tuple): The percentiles to compute, between 0 and 100.
+
+    Returns:
+        - dict: Maps each percentile to an array with one value per row, NaN for rows without selected values.
+    """
+
+    result = {percentile: numpy.full(len(count), numpy.nan) for percentile in percentiles}
+    ordered = numpy.sort(numpy.where(selected, values, NEVER), axis=1)
+    for size in numpy.unique(count[count > 0]):
+        rows = count == size
+        computed = numpy.percentile(ordered[rows, :size], percentiles, axis=1)
+        for percentile, column in zip(percentiles, computed):
+            result[percentile][rows] = column
+    return result
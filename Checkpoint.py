@@ -0,0 +1,230 @@
+import os
+import pickle
+from array import array
+from time import perf_counter
+
+from EventEngine import *
+from Process import *
+from ProcessTable import *
+
+# The format version written in every checkpoint; checkpoints of another version are rejected
+CHECKPOINT_VERSION = 2
+
+# The attributes of an EventEngine that make up the state of a run, besides its processes and Gantt chart
+ENGINE_FIELDS = ("algorithm", "time_limit", "is_preemptive", "quanta", "boost_period", "granularity", "time",
+                 "running_process", "ready_queue", "waiting_queue", "arrivals")
+
+
+class Checkpointer:
+    """
+    Periodically saves the complete state of an event-driven simulation to a checkpoint file, and
+    resumes a simulation from it.
+
+    A checkpoint holds the clock, the running process, the ready queue, the waiting queue and the
+    arrival cursor of an EventEngine, the state of every process (as one array per ProcessTable
+    column) and the state of the Gantt chart recorder. The queues are pickled as they are, with
+    every process replaced by its row in the workload, so a checkpoint costs a few bytes per
+    process and the resumed run rebuilds the exact same queues, ties and sequence numbers included.
+    A resumed run therefore produces the same Gantt chart and metrics as an uninterrupted one.
+
+    The file is written to a temporary file first and then renamed over the previous checkpoint,
+    so a crash while saving leaves the previous checkpoint intact.
+
+    Segments a Gantt chart sink wrote after the last checkpoint are removed on resume if the sink
+    writes to a seekable stream (a file reopened in "r+" mode); segments already written to a
+    terminal or a pipe are written again.
+
+    Attributes:
+        - path (str): The path of the checkpoint file.
+        - interval (float): The number of seconds between two checkpoints.
+        - next_save (float): The clock reading after which the next checkpoint is due.
+        - saves (int): The number of checkpoints saved.
+
+    Methods:
+        - __init__: Initializes a Checkpointer saving to a file at an interval.
+        - due: Checks if the next checkpoint is due.
+        - save: Saves the state of an engine to the checkpoint file.
+        - resume: Rebuilds the engine saved in the checkpoint file.
+    """
+
+    def __init__(self, path, interval=60.0):
+        """
+        Initializes a Checkpointer instance.
+
+        Parameters:
+            - path (str): The path of the checkpoint file.
+            - interval (float): The number of seconds between two checkpoints.
+        """
+
+        self.path = path
+        self.interval = interval
+        self.next_save = perf_counter() + interval
+        self.saves = 0
+
+    def due(self):
+        """
+        Checks if the next checkpoint is due.
+
+        Returns:
+            - bool: True if interval seconds have passed since the last checkpoint.
+        """
+        return perf_counter() >= self.next_save
+
+    def save(self, engine):
+        """
+        Saves the state of an engine, between two events, to the checkpoint file.
+
+        Parameters:
+            - engine (EventEngine): The engine.
+        """
+
+        processes = engine.processes
+        if isinstance(processes, ProcessTable):
+            kind = "table"
+            columns = {name: getattr(processes, name) for name in ProcessTable.columns}
+        else:
+            kind = "list"
+            columns = {name: array("b" if name == "has_executed" else "q", (getattr(process, name)
+                                                                            for process in processes))
+                       for name in ProcessTable.columns}
+
+        # the processes go first, so loading can rebuild them before the queues that refer to them
+        header = {"version": CHECKPOINT_VERSION, "kind": kind, "columns": columns}
+        state = {"engine": {name: getattr(engine, name) for name in ENGINE_FIELDS},
+                 "gantt": engine.gantt.checkpoint() if hasattr(engine.gantt, "checkpoint") else None}
+
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as stream:
+            pickle.dump(header, stream, pickle.HIGHEST_PROTOCOL)
+            ProcessPickler(stream, processes).dump(state)
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.replace(temporary, self.path)
+
+        self.saves = self.saves + 1
+        self.next_save = perf_counter() + self.interval
+
+    def resume(self, gantt=None):
+        """
+        Rebuilds the engine saved in the checkpoint file, ready to run to its time limit and
+        to keep saving checkpoints with this Checkpointer.
+
+        Parameters:
+            - gantt (GanttRecorder): Records the rest of the Gantt chart. Its buffer and its sink are
+                restored to their state at the checkpoint.
+
+        Returns:
+            - EventEngine: The engine. Its processes attribute holds the restored processes.
+        """
+
+        with open(self.path, "rb") as stream:
+            header = pickle.load(stream)
+            if not isinstance(header, dict) or header.get("version") != CHECKPOINT_VERSION:
+                raise ValueError("not a checkpoint of this version: " + str(self.path))
+
+            # rebuild the processes, then load the queues, whose row references resolve to them
+            columns = header["columns"]
+            if header["kind"] == "table":
+                processes = ProcessTable(columns["number"], columns["arrival_time"], columns["burst_time"],
+                                         columns["come_back"], columns["priority"])
+                for name in ProcessTable.columns[5:]:
+                    setattr(processes, name, columns[name])
+            else:
+                processes = list(map(Process, columns["number"], columns["arrival_time"], columns["burst_time"],
+                                     columns["come_back"], columns["priority"]))
+                for name in ProcessTable.columns[5:]:
+                    convert = bool if name == "has_executed" else int
+                    for process, value in zip(processes, columns[name]):
+                        setattr(process, name, convert(value))
+
+            state = ProcessUnpickler(stream, processes).load()
+        engine_state = state["engine"]
+
+        engine = EventEngine.__new__(EventEngine)
+        for name in ENGINE_FIELDS:
+            setattr(engine, name, engine_state[name])
+        engine.processes = processes
+        engine.instruments = None
+        engine.checkpoint = self
+        engine.cycles = None
+        engine.gantt = gantt if gantt is not None else lambda time, process: None
+        if gantt is not None and state["gantt"] is not None:
+            gantt.restore(state["gantt"])
+
+        self.next_save = perf_counter() + self.interval
+        return engine
+
+
+class ProcessPickler(pickle.Pickler):
+    """
+    A pickler that writes every process of a workload as a reference to its row.
+
+    Attributes:
+        - rows (dict): Maps the id of each Process to its row, for a list of processes.
+        - table (ProcessTable): The table of the processes, for a ProcessTable.
+
+    Methods:
+        - __init__: Initializes a ProcessPickler for the processes of a workload.
+        - persistent_id: Returns the row of a process, or None for any other object.
+    """
+
+    def __init__(self, stream, processes):
+        """
+        Initializes a ProcessPickler instance.
+
+        Parameters:
+            - stream: The binary stream to write to.
+            - processes (list or ProcessTable): The processes of the workload.
+        """
+
+        super().__init__(stream, pickle.HIGHEST_PROTOCOL)
+        self.table = processes if isinstance(processes, ProcessTable) else None
+        self.rows = None if self.table is not None else {id(process): row for row, process in enumerate(processes)}
+
+    def persistent_id(self, obj):
+        """
+        Returns the row of a process, or None for any other object, which is pickled as usual.
+
+        Parameters:
+            - obj: The object being pickled.
+        """
+
+        if type(obj) is Process:
+            return self.rows[id(obj)]
+        if type(obj) is ProcessView and obj.table is self.table:
+            return obj.index
+        return None
+
+
+class ProcessUnpickler(pickle.Unpickler):
+    """
+    An unpickler that reads the row references written by ProcessPickler back as processes.
+
+    Attributes:
+        - processes (list or ProcessTable): The processes of the workload.
+
+    Methods:
+        - __init__: Initializes a ProcessUnpickler for the processes of a workload.
+        - persistent_load: Returns the process at a row.
+    """
+
+    def __init__(self, stream, processes):
+        """
+        Initializes a ProcessUnpickler instance.
+
+        Parameters:
+            - stream: The binary stream to read from.
+            - processes (list or ProcessTable): The processes of the workload, rebuilt from the checkpoint.
+        """
+
+        super().__init__(stream)
+        self.processes = processes
+
+    def persistent_load(self, row):
+        """
+        Returns the process at a row.
+
+        Parameters:
+            - row (int): The row written by ProcessPickler.
+        """
+        return self.processes[row]
@@ -0,0 +1,46 @@
+from Scheduler import *
+
+
+def compare_policies(workload, algorithms=tuple(MENU_OPTIONS.values()), time_limit=200, gantts=None):
+    """
+    Runs several scheduling algorithms over the same workload, and returns one metrics table for
+    all of them.
+
+    Each algorithm is an event-driven run of run_simulation on its own new processes. The schedule
+    of each algorithm depends on its own ready queue, waiting queue and comebacks, so the runs share
+    nothing but the workload, and the results are the same as separate runs of run_simulation.
+
+    Parameters:
+        - workload (Workload or list): The workload, as a Workload or a list of processes that have not run yet.
+        - algorithms (iterable): The algorithms to compare, as accepted by run_simulation (the menu
+            algorithms by default). Each algorithm may appear once.
+        - time_limit (int): The time limit for the simulation.
+        - gantts (dict): Maps an algorithm name (in upper case) to the GanttRecorder of its Gantt chart.
+            The charts of the other algorithms are discarded.
+
+    Returns:
+        - dict: Maps every algorithm name, in upper case and in the order given, to its metrics,
+            as returned by calculate_metrics.
+    """
+
+    if not isinstance(workload, Workload):
+        workload = Workload.from_processes(workload)
+    if len(workload) == 0:
+        raise ValueError("a comparison needs at least one process")
+
+    names = [algorithm.upper() for algorithm in algorithms]
+    for name in names:
+        if name not in ALGORITHMS:
+            raise ValueError("unknown scheduling algorithm: " + str(name))
+    if len(set(names)) != len(names):
+        raise ValueError("every algorithm of a comparison may appear only once")
+    if gantts is None:
+        gantts = {}
+
+    table = {}
+    for name in names:
+        gantt = gantts.get(name)
+        if gantt is None:
+            gantt = GanttRecorder(NullSink())
+        table[name] = run_simulation(workload.processes(), name, time_limit, True, gantt)["metrics"]
+    return table
@@ -0,0 +1,332 @@
+from collections import deque
+
+from AgingQueue import *
+from FairQueue import *
+from MultilevelQueue import *
+
+# The attributes of a process that accumulate over a run; over each period of a periodic schedule
+# they grow by the same amount
+ACCUMULATED_FIELDS = ("waiting_time", "cpu_time", "completions", "vruntime")
+
+# The attributes of a process holding the time of its last event; over each period of a periodic
+# schedule they move forward by the period, if they change at all
+TIME_FIELDS = ("finish_time", "cpu_turn_time", "start_time", "ready_queue_time")
+
+
+class CycleDetector:
+    """
+    Detects when an event-driven simulation repeats itself and extrapolates it to the time limit.
+
+    Every process comes back a fixed time after each burst, so once every process has arrived the
+    schedule of a workload often becomes periodic. After each event, once every process has arrived,
+    the detector fingerprints the state of the scheduler relative to the clock. The fingerprint
+    covers the running process (with its remaining time and the time since it got the CPU), the
+    ready processes in the order they were added (with their remaining times and priorities), the
+    waiting processes in the order they come back (with their priorities, which keep their aging,
+    and the time until each comeback), and the aging phases (PP), the levels, boost phase and
+    current slice (MLFQ) or the virtual runtimes relative to min_vruntime (CFS). Every queue orders processes that entered
+    it at the same time by the order they were added, so the order in which they were added stands
+    for their ready queue times. Equal fingerprints at two times mean the schedule after the second
+    time repeats the schedule after the first one, shifted by the period between them.
+
+    The detector keeps the hash of each fingerprint, and when two hashes match it compares the
+    fingerprints themselves one period later, when the state must repeat again. A process that waited
+    in the ready queue through the whole first period adds a different waiting time when it finally
+    gets the CPU, so the detector then measures the growth of the waiting times over one more period,
+    which only involves processes that entered the ready queue within the schedule's periodic part,
+    and checks that the state repeats at its end as well. It then skips every whole
+    period that fits before the time limit: it records the Gantt chart segments of that period once
+    per skipped period, each copy shifted by the period, and lowers the time limit of the engine so
+    it only simulates the rest. At the end it adds the growth of one period, times the number of
+    skipped periods, to the waiting time, CPU time, completions and virtual runtime of every process
+    still in the simulation, and moves their event times forward. A run extrapolated this way produces
+    the same Gantt chart and metrics as a full simulation, at the cost of the startup and three periods.
+
+    The cost is a fingerprint per event until the state repeats, and memory for one hash per event.
+    The detector gives up after max_states fingerprints, and the rest of the schedule is then
+    simulated in full, as without the detector.
+
+    Attributes:
+        - max_states (int): The number of fingerprints kept before giving up.
+        - states (dict): Maps the hash of each fingerprint seen to the time it was seen.
+        - recording (bool): True while the Gantt chart segments of the measured period are recorded in history.
+        - history (list): The (start, end, pid) Gantt chart segments of the measured period.
+        - target (GanttRecorder): The recorder of the engine, or None.
+        - candidate (tuple): The fingerprint and time of the state that repeated, and the process
+            fields at that time once the repeat is confirmed and the next period is measured, or None.
+        - done (bool): True once the run has been extrapolated or the detector has given up.
+        - period (int): The period of the schedule, once the state has repeated.
+        - skipped (int): The number of whole periods skipped.
+        - time_limit (int): The time limit of the engine, which is lowered while the last part of a period runs.
+        - growth (list): (process, accumulated field growths, changed time fields, time fields) for
+            every process in the simulation, once the run has been extrapolated.
+
+    Methods:
+        - __init__: Initializes a CycleDetector.
+        - attach: Records the Gantt chart segments of an engine from now on.
+        - record: Records the segment of a process leaving the CPU and forwards it to the recorder.
+        - observe: Fingerprints the state of an engine after an event and extrapolates on a repeat.
+        - fingerprint: Returns the fingerprint of the state of an engine and the processes it covers.
+        - fields: Returns the accumulated and time fields of processes.
+        - give_up: Stops fingerprinting, so the rest of the run is simulated in full.
+        - extrapolate: Skips the whole periods before the time limit.
+        - record_shifted: Records a segment of the last part of a period, shifted by the skipped periods.
+        - finish: Applies the growth of the skipped periods to the processes at the end of the run.
+    """
+
+    def __init__(self, max_states=100000):
+        """
+        Initializes a CycleDetector instance.
+
+        Parameters:
+            - max_states (int): The number of fingerprints kept before giving up.
+        """
+
+        self.max_states = max_states
+        self.states = {}
+        self.recording = False
+        self.history = []
+        self.target = None
+        self.candidate = None
+        self.done = False
+        self.period = None
+        self.skipped = 0
+        self.time_limit = None
+        self.growth = []
+
+    def attach(self, engine, gantt):
+        """
+        Records the Gantt chart segments of an engine from now on, forwarding them to its recorder.
+
+        Parameters:
+            - engine (EventEngine): The engine.
+            - gantt (GanttRecorder): The recorder of the engine, or None.
+        """
+
+        if gantt is not None and not hasattr(gantt, "repeat"):
+            raise ValueError("cycle detection needs a GanttRecorder to repeat the segments of a period")
+
+        self.target = gantt
+        self.time_limit = engine.time_limit
+        engine.gantt = self.record
+
+    def record(self, time, process):
+        """
+        Records the segment of a process leaving the CPU, and forwards it to the recorder.
+
+        Parameters:
+            - time (int): The time at which the process leaves the CPU.
+            - process (Process): The process, with its start_time set to the time it got the CPU.
+        """
+
+        if self.recording:
+            self.history.append((process.start_time, time, process.number))
+        if self.target is not None:
+            self.target.record(time, process)
+
+    def observe(self, engine):
+        """
+        Fingerprints the state of an engine after an event, once every process has arrived, and
+        extrapolates the run once the state has repeated three times with the same period.
+
+        Parameters:
+            - engine (EventEngine): The engine, between two events.
+        """
+
+        if self.done or not engine.arrivals.is_empty():
+            return
+
+        if self.candidate is not None:
+            # wait for the end of the period, where the state must repeat again
+            fingerprint, earlier, fields = self.candidate
+            end = earlier + self.period
+            if engine.time < end:
+                return
+            current, live = self.fingerprint(engine)
+            if engine.time != end or current != fingerprint:
+                self.give_up()
+                return
+            if fields is None:
+                # the state has repeated: measure the growth of the processes over the next period
+                self.candidate = (current, engine.time, self.fields(live))
+                self.recording = True
+                return
+            self.extrapolate(engine, live)
+            return
+
+        fingerprint, live = self.fingerprint(engine)
+        key = hash(fingerprint)
+        earlier = self.states.get(key)
+        if earlier is not None:
+            # the hashes match: the fingerprints themselves are compared one period later
+            self.period = engine.time - earlier
+            self.candidate = (fingerprint, engine.time, None)
+            self.states.clear()
+            return
+
+        if len(self.states) >= self.max_states:
+            # the schedule does not repeat soon enough
+            self.give_up()
+            return
+        self.states[key] = engine.time
+
+    def fingerprint(self, engine):
+        """
+        Returns the fingerprint of the state of an engine, relative to its clock.
+
+        Parameters:
+            - engine (EventEngine): The engine, between two events.
+
+        Returns:
+            - tuple: The fingerprint, and the list of processes it covers (the running process, then the
+                ready processes in the order they were added, then the waiting processes in the order
+                they come back).
+        """
+
+        time = engine.time
+        queue = engine.ready_queue
+        running = engine.running_process
+
+        # the ready processes in the order they were added, which with their keys (and levels) decides
+        # the order in which the queue hands them out
+        if isinstance(queue, deque):
+            ready = list(queue)
+        elif isinstance(queue, MultilevelQueue):
+            ready = [process for level in queue.queues for process in level]
+        elif isinstance(queue, FairQueue):
+            ready = [handle[1] for handle in sorted(queue.queue.heap, key=lambda handle: handle[0][-1])]
+        elif isinstance(queue, AgingQueue):
+            # write the current priorities back, and list the processes in the order they were added
+            queue.sync_priorities()
+            entries = [entry for heaps in (queue.heaps, queue.aged_heaps) for heap in heaps for entry in heap]
+            ready = [entry[-1] for entry in sorted(entries, key=lambda entry: entry[-2])]
+        else:
+            # BurstTimeQueue, RemainingTimeQueue and PriorityQueue entries end with (sequence, process)
+            ready = [entry[-1] for entry in sorted(queue.heap, key=lambda entry: entry[-2])]
+
+        waiting = sorted(engine.waiting_queue.heap, key=lambda entry: entry[:2])
+
+        if running is not None:
+            state = [(running, running.remaining_time, running.priority, time - running.start_time)]
+            live = [running]
+        else:
+            state = [None]
+            live = []
+        if isinstance(queue, AgingQueue):
+            # a queued process ages every aging_period time units after it entered the queue
+            state.extend((process, process.remaining_time, process.priority,
+                          (time - process.ready_queue_time) % queue.aging_period) for process in ready)
+        else:
+            state.extend((process, process.remaining_time, process.priority) for process in ready)
+        state.extend((process, process.priority, comeback - time) for comeback, _, process in waiting)
+        live.extend(ready)
+        live.extend(process for _, _, process in waiting)
+
+        # the levels, the boost phase and the slice of the running process, or the virtual runtimes
+        if isinstance(queue, MultilevelQueue):
+            slice_time = time - queue.slice_start(running) if running is not None else None
+            extra = (time % queue.boost_period, slice_time, tuple(queue.level(process) for process in live))
+        elif isinstance(queue, FairQueue):
+            # min_vruntime never decreases, so a waiting process behind it comes back at min_vruntime
+            base = queue.min_vruntime
+            extra = (tuple(process.vruntime - base for process in live[:len(live) - len(waiting)]),
+                     tuple(max(process.vruntime - base, 0) for _, _, process in waiting))
+        else:
+            extra = None
+
+        return (tuple(state), extra), live
+
+    @staticmethod
+    def fields(live):
+        """
+        Static method to return the accumulated and time fields of processes.
+
+        Parameters:
+            - live (list): The processes.
+
+        Returns:
+            - list: One tuple of the values of ACCUMULATED_FIELDS and TIME_FIELDS per process.
+        """
+        return [tuple(getattr(process, name) for name in ACCUMULATED_FIELDS + TIME_FIELDS) for process in live]
+
+    def give_up(self):
+        """
+        Stops fingerprinting, so the rest of the run is simulated in full.
+        """
+
+        self.done = True
+        self.recording = False
+        self.states.clear()
+        self.candidate = None
+        self.history = []
+
+    def extrapolate(self, engine, live):
+        """
+        Skips the whole periods that fit before the time limit: records their Gantt chart segments,
+        keeps the growth of one period to apply at the end, and lowers the time limit of the engine
+        so it only simulates the last part of a period.
+
+        Parameters:
+            - engine (EventEngine): The engine, at the end of the measured period, in the same state as at its start.
+            - live (list): The processes covered by the fingerprint.
+        """
+
+        _, _, earlier_fields = self.candidate
+        segments = self.history
+        fields = self.fields(live)
+        period = self.period
+        self.give_up()
+
+        # the last event before the time limit must still be simulated, so it stays after the skipped periods
+        skipped = (engine.time_limit - 1 - engine.time) // period
+        if skipped <= 0:
+            return
+        self.skipped = skipped
+
+        count = len(ACCUMULATED_FIELDS)
+        for process, before, after in zip(live, earlier_fields, fields):
+            accumulated = [later - sooner for sooner, later in zip(before[:count], after[:count])]
+            changed = [later != sooner for sooner, later in zip(before[count:], after[count:])]
+            self.growth.append((process, accumulated, changed, after[count:]))
+
+        if self.target is not None:
+            self.target.repeat(segments, period, skipped)
+        engine.gantt = self.record_shifted
+        engine.time_limit = engine.time_limit - skipped * period
+
+    def record_shifted(self, time, process):
+        """
+        Records a segment of the last part of a period, shifted by the skipped periods.
+
+        Parameters:
+            - time (int): The time at which the process leaves the CPU.
+            - process (Process): The process, with its start_time set to the time it got the CPU.
+        """
+
+        if self.target is not None:
+            shift = self.skipped * self.period
+            self.target.replay(((process.start_time + shift, time + shift, process.number),))
+
+    def finish(self, engine):
+        """
+        Restores the time limit of the engine and applies the growth of the skipped periods to the
+        processes, once the last part of a period has been simulated.
+
+        Parameters:
+            - engine (EventEngine): The engine, at the end of the run.
+        """
+
+        engine.time_limit = self.time_limit
+        if self.skipped == 0:
+            return
+
+        shift = self.skipped * self.period
+        for process, accumulated, changed, times in self.growth:
+            for name, growth in zip(ACCUMULATED_FIELDS, accumulated):
+                if growth:
+                    setattr(process, name, getattr(process, name) + self.skipped * growth)
+
+            # a time field moves with the schedule if it changes every period, or changed in the last part
+            for name, moves, before in zip(TIME_FIELDS, changed, times):
+                if moves or getattr(process, name) != before:
+                    setattr(process, name, getattr(process, name) + shift)
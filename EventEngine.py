@@ -0,0 +1,420 @@
+from AgingQueue import *
+from ArrivalIndex import *
+from ArrivalStream import *
+from CycleDetector import *
+from FairQueue import *
+from MultilevelQueue import *
+from PriorityQueue import *
+from WaitingQueue import *
+from collections import deque
+
+
+class EventEngine:
+    """
+    A discrete-event engine that simulates the scheduling algorithms without ticking every time unit.
+
+    The tick loops in Scheduler.py advance the clock by one and call decrease_remaining() on every
+    iteration, so their cost grows with the time limit. The engine instead jumps straight to the next
+    time at which the schedule can change: a completion, an arrival, a comeback, a quantum expiry (RR
+    and MLFQ), an aging boundary (PP), a boost (MLFQ) or the time the running process overtakes the
+    virtual runtime of the next one (CFS). At each of those times it applies the same steps, in the same order,
+    as one iteration of the tick loop, so it produces the same Gantt chart and Process metrics.
+
+    Attributes:
+        - quantum (int): The Round Robin time quantum.
+        - aging_period (int): The time a process spends in the ready queue before its priority is decreased (PP).
+        - processes (list): List of processes to be scheduled.
+        - algorithm (str): One of "FCFS", "SJF", "SRTF", "RR", "PP", "MLFQ" or "CFS".
+        - time_limit (int): The time limit for the simulation.
+        - is_preemptive (bool): Indicates whether the PP algorithm is preemptive or non-preemptive.
+        - quanta (tuple): The time quantum of each MLFQ level, from the highest level to the lowest.
+        - boost_period (int): The time between two boosts of every process to the highest MLFQ level.
+        - granularity (int): The time a process runs before another one may preempt it (CFS).
+        - gantt (function): Called with (time, process) whenever a Gantt chart segment ends.
+        - instruments (Instrumentation): Collects counters and timers for the phases of each event, or None.
+        - checkpoint (Checkpointer): Periodically saves the state of the run, or None.
+        - cycles (CycleDetector): Extrapolates the run to the time limit once its schedule repeats, or None.
+        - time (int): The time up to which the simulation has been advanced.
+        - running_process (Process): The process currently running, or None if the CPU is idle.
+        - ready_queue (deque, BurstTimeQueue, RemainingTimeQueue, AgingQueue, MultilevelQueue or FairQueue): The processes ready for execution.
+        - waiting_queue (WaitingQueue): The finished processes, ordered by comeback time.
+        - arrivals (ArrivalIndex, ArrivalStream or OnlineArrivals): The processes of the workload, sorted by arrival time.
+
+    Methods:
+        - __init__: Initializes an EventEngine for one run of an algorithm over a list of processes.
+        - create_ready_queue: Static method to create an empty ready queue for an algorithm.
+        - run: Runs the simulation up to the time limit.
+        - end: Ends the simulation at the time limit, once every event before it has been handled.
+        - next_event_time: Returns the next time at which the schedule can change.
+        - step: Advances the simulation to a given event time and handles everything that happens then.
+    """
+
+    quantum = 5
+    aging_period = 5
+
+    def __init__(self, processes, algorithm, time_limit, is_preemptive=True, gantt=None, instruments=None,
+                 quanta=(5, 10, 20), boost_period=100, granularity=5, checkpoint=None,
+                 arrivals=None, cycles=None):
+        """
+        Initializes an EventEngine instance.
+
+        Parameters:
+            - processes (list): List of processes to be scheduled, or an iterable of processes sorted by
+                arrival time, which is read lazily (see ArrivalStream).
+            - algorithm (str): One of "FCFS", "SJF", "SRTF", "RR", "PP", "MLFQ" or "CFS".
+            - time_limit (int): The time limit for the simulation.
+            - is_preemptive (bool): Indicates whether the PP algorithm is preemptive or non-preemptive.
+            - gantt (function): Called with (time, process) whenever a Gantt chart segment ends.
+            - instruments (Instrumentation): Collects counters and timers for the phases of each event, if provided.
+            - quanta (tuple): The time quantum of each MLFQ level, from the highest level to the lowest.
+            - boost_period (int): The time between two boosts of every process to the highest MLFQ level.
+            - granularity (int): The time a process runs before another one may preempt it (CFS).
+            - checkpoint (Checkpointer): Periodically saves the state of the run so it can be resumed, if provided.
+                The processes must be a list or a ProcessTable, not a stream.
+            - arrivals: A source of arrivals with the methods of ArrivalIndex, read instead of processes
+                (which may then be None), for an online simulation fed while it runs. In every case the
+                CPU starts idle and processes arriving at time 0 are handled like any other arrival.
+            - cycles (CycleDetector): Detects when the schedule repeats and extrapolates the run to the
+                time limit, if provided. The gantt callback must then be a GanttRecorder or None.
+        """
+
+        self.processes = processes
+        self.algorithm = algorithm
+        self.time_limit = time_limit
+        self.is_preemptive = is_preemptive
+        self.gantt = gantt if gantt is not None else lambda time, process: None
+        self.instruments = instruments
+        self.quanta = quanta
+        self.boost_period = boost_period
+        self.granularity = granularity
+        self.checkpoint = checkpoint
+        self.cycles = cycles
+
+        if algorithm == "MLFQ":
+            self.ready_queue = MultilevelQueue(quanta, boost_period)
+        elif algorithm == "CFS":
+            self.ready_queue = FairQueue(granularity)
+        else:
+            self.ready_queue = EventEngine.create_ready_queue(algorithm)
+
+        self.waiting_queue = WaitingQueue()
+        self.time = 0
+
+        # the CPU starts idle, and the processes arriving at time 0 are dispatched by the first step
+        self.running_process = None
+        if arrivals is not None:
+            self.arrivals = arrivals
+        else:
+            self.arrivals = open_arrivals(processes)
+            if checkpoint is not None and isinstance(self.arrivals, ArrivalStream):
+                raise ValueError("a simulation reading a stream of processes cannot be checkpointed")
+
+        if cycles is not None:
+            if checkpoint is not None:
+                raise ValueError("a simulation extrapolated by cycle detection cannot be checkpointed")
+            cycles.attach(self, gantt)
+
+        # replace the phases of step() by timed versions when instrumented
+        if instruments is not None:
+            self.handle_priority = instruments.wrap("aging", self.handle_priority)
+            self.handle_arrival = instruments.wrap("arrivals", self.handle_arrival, lambda args, arrived: arrived)
+            self.handle_comeback = instruments.wrap("comebacks", self.handle_comeback, lambda args, comebacks: comebacks)
+            self.finish = instruments.wrap("completions", self.finish)
+            self.preempt = instruments.wrap("preemption_checks", self.preempt, lambda args, replaced: replaced)
+            self.dispatch = instruments.wrap("dispatches", self.dispatch)
+
+    @staticmethod
+    def create_ready_queue(algorithm):
+        """
+        Static method to create an empty ready queue ordered the way an algorithm needs,
+        with the same orderings as the tick loops in Scheduler.py.
+
+        Parameters:
+            - algorithm (str): One of "FCFS", "SJF", "SRTF", "RR" or "PP".
+
+        Returns:
+            - deque, BurstTimeQueue, RemainingTimeQueue or AgingQueue: The ready queue.
+        """
+
+        if algorithm in ("FCFS", "RR"):
+            return deque()
+        if algorithm == "SJF":
+            return BurstTimeQueue()
+        if algorithm == "SRTF":
+            return RemainingTimeQueue()
+        if algorithm == "PP":
+            return AgingQueue(EventEngine.aging_period)
+        raise ValueError("unknown scheduling algorithm: " + str(algorithm))
+
+    def run(self):
+        """
+        Runs the simulation up to the time limit.
+        """
+
+        if self.instruments is not None:
+            self.instruments.begin()
+
+        time = self.next_event_time()
+        while time < self.time_limit:
+            self.step(time)
+            if self.instruments is not None:
+                self.instruments.sample(self.ready_queue, self.waiting_queue)
+            if self.checkpoint is not None and self.checkpoint.due():
+                self.checkpoint.save(self)
+            if self.cycles is not None:
+                self.cycles.observe(self)
+            time = self.next_event_time()
+
+        self.end()
+        if self.instruments is not None:
+            self.instruments.end()
+
+    def end(self):
+        """
+        Ends the simulation at the time limit, once every event before it has been handled.
+        """
+
+        # the tick loop decreases the remaining time of the running process and ages
+        # the ready queue up to time_limit - 1
+        self.advance(self.time_limit - 1)
+        if self.algorithm == "PP":
+            self.ready_queue.age(max(self.time_limit - 1, self.time))
+            self.ready_queue.sync_priorities()
+
+        if self.running_process is not None:
+            self.leave_cpu(self.time_limit)
+        if self.cycles is not None:
+            self.cycles.finish(self)
+
+    def next_event_time(self):
+        """
+        Returns the next time at which the schedule can change.
+
+        Returns:
+            - int: The time of the next event, or time_limit if nothing happens before it.
+        """
+
+        time = self.time_limit
+
+        if not self.arrivals.is_empty():
+            time = min(time, self.arrivals.next_time())
+
+        if not self.waiting_queue.is_empty():
+            time = min(time, self.waiting_queue.next_time())
+
+        running = self.running_process
+        if running is not None:
+            # decrease_remaining() never goes below zero, so a process takes at least one unit to finish
+            time = min(time, self.time + max(running.remaining_time, 1))
+
+            # the quantum only matters if there is another process to hand the CPU to
+            if self.algorithm == "RR" and self.ready_queue:
+                elapsed = self.time - running.start_time
+                time = min(time, running.start_time + self.quantum * (elapsed // self.quantum + 1))
+
+            # aging can only change the schedule by letting a waiting process preempt the running one
+            if self.algorithm == "PP" and self.is_preemptive:
+                aging_time = self.ready_queue.next_time_below(running.priority)
+                if aging_time is not None:
+                    time = min(time, aging_time)
+
+            # the running process is demoted at the end of its quantum, if another process is ready
+            if self.algorithm == "MLFQ" and self.ready_queue:
+                start = self.ready_queue.slice_start(running)
+                quantum = self.ready_queue.quantum(running)
+                time = min(time, start + quantum * ((self.time - start) // quantum + 1))
+
+            # the running process can be preempted once it has run for the granularity and its
+            # virtual runtime has passed the smallest one in the ready queue
+            if self.algorithm == "CFS" and self.ready_queue:
+                time = min(time, self.ready_queue.next_expire_time(self.time, running))
+
+        # a boost moves every process back to the highest level, which can let a queued process preempt
+        if self.algorithm == "MLFQ":
+            boost_time = self.ready_queue.next_boost_time(self.time)
+            if boost_time is not None:
+                time = min(time, boost_time)
+
+        return time
+
+    def step(self, time):
+        """
+        Advances the simulation to a given event time and handles everything that happens then,
+        in the same order as one iteration of the tick loop.
+
+        Parameters:
+            - time (int): The time of the event.
+        """
+
+        self.advance(time)
+
+        if self.algorithm in ("PP", "MLFQ"):
+            self.handle_priority(time)
+        self.handle_arrival(time)
+        self.handle_comeback(time)
+
+        running = self.running_process
+        if running is not None:
+            if running.remaining_time == 0:
+                self.finish(time)
+            elif self.ready_queue:
+                self.preempt(time)
+
+        if self.running_process is None and self.ready_queue:
+            self.dispatch(time)
+
+    def advance(self, time):
+        """
+        Moves the clock forward, running the current process for the elapsed time.
+
+        Parameters:
+            - time (int): The new time.
+        """
+
+        if time <= self.time:
+            return
+
+        if self.running_process is not None:
+            self.running_process.remaining_time = max(self.running_process.remaining_time - (time - self.time), 0)
+            if self.algorithm == "CFS":
+                self.ready_queue.charge(self.running_process, time - self.time)
+        self.time = time
+
+    def handle_priority(self, time):
+        """
+        Moves the aging ready queue to a given time, decreasing the priority of the processes
+        that have spent a multiple of aging_period in it (PP), or boosting every process back to
+        the highest level at a multiple of boost_period (MLFQ).
+
+        Parameters:
+            - time (int): The current time.
+        """
+        self.ready_queue.age(time)
+
+    def handle_arrival(self, time):
+        """
+        Moves the processes arriving at a given time to the ready queue.
+
+        Parameters:
+            - time (int): The current time.
+
+        Returns:
+            - int: The number of processes that arrived.
+        """
+
+        arrived = self.arrivals.pop_arrivals(time)
+        for process in arrived:
+            process.ready_queue_time = time
+            self.ready_queue.append(process)
+        return len(arrived)
+
+    def handle_comeback(self, time):
+        """
+        Moves the processes coming back at a given time from the waiting queue to the ready queue.
+
+        Parameters:
+            - time (int): The current time.
+
+        Returns:
+            - int: The number of processes that came back.
+        """
+
+        comebacks = self.waiting_queue.pop_comebacks(time)
+        for process in comebacks:
+            process.remaining_time = process.burst_time
+            process.ready_queue_time = time
+            self.ready_queue.append(process)
+        return len(comebacks)
+
+    def finish(self, time):
+        """
+        Moves the running process, which has just finished its burst, to the waiting queue.
+
+        Parameters:
+            - time (int): The current time.
+        """
+
+        process = self.running_process
+        process.finish_time = time
+        process.completions = process.completions + 1
+        self.leave_cpu(time)
+        self.waiting_queue.append(process)
+        self.running_process = None
+
+    def preempt(self, time):
+        """
+        Replaces the running process with the next one in the ready queue if the algorithm says so.
+
+        Parameters:
+            - time (int): The current time.
+
+        Returns:
+            - bool: True if the running process was replaced.
+        """
+
+        running = self.running_process
+
+        if self.algorithm == "SRTF":
+            replace = self.ready_queue.peek().remaining_time < running.remaining_time
+        elif self.algorithm == "RR":
+            replace = (time - running.start_time) % self.quantum == 0
+        elif self.algorithm == "PP":
+            replace = self.is_preemptive and self.ready_queue.peek().priority < running.priority
+        elif self.algorithm in ("MLFQ", "CFS"):
+            replace = self.ready_queue.expire(time, running)
+        else:
+            replace = False
+
+        if replace:
+            self.leave_cpu(time)
+            running.ready_queue_time = time
+            self.start(time, self.pop_ready())
+            self.ready_queue.append(running)
+        return replace
+
+    def dispatch(self, time):
+        """
+        Moves the next process in the ready queue onto the idle CPU.
+
+        Parameters:
+            - time (int): The current time.
+        """
+        self.start(time, self.pop_ready())
+
+    def pop_ready(self):
+        """
+        Removes and returns the next process in the ready queue.
+        """
+
+        if isinstance(self.ready_queue, deque):
+            return self.ready_queue.popleft()
+        return self.ready_queue.pop()
+
+    def start(self, time, process):
+        """
+        Runs a process on the CPU from a given time.
+
+        Parameters:
+            - time (int): The current time.
+            - process (Process): The process, taken from the ready queue.
+        """
+
+        process.waiting_time = process.waiting_time + (time - process.ready_queue_time)
+        if not process.has_executed:
+            process.first_start_time = time
+        process.has_executed = True
+        process.start_time = time
+        self.running_process = process
+
+    def leave_cpu(self, time):
+        """
+        Takes the running process off the CPU, closing its Gantt chart segment.
+
+        Parameters:
+            - time (int): The current time.
+        """
+
+        process = self.running_process
+        process.cpu_turn_time = time
+        process.cpu_time = process.cpu_time + (time - process.start_time)
+        self.gantt(time, process)
@@ -0,0 +1,181 @@
+from PriorityQueue import *
+from operator import attrgetter
+
+# The cost of one time unit on the CPU in virtual runtime, by priority level, from the highest
+# priority (0) to the lowest (19): the inverse load weights of the Linux CFS scheduler (2^32 / weight)
+# for nice levels 0 to 19. Each level costs about 1.25 times the previous one, so a process gets
+# about 1.25 times the CPU share of a process one level below it. Integer costs keep the virtual
+# runtime exact, so charging one unit at a time or many at once gives the same result.
+VRUNTIME_COSTS = (4194304, 5237765, 6557202, 8165337, 10153587, 12820798, 15790321, 19976592, 24970740,
+                  31350126, 39045157, 49367440, 61356676, 76695844, 95443717, 119304647, 148102320,
+                  186737708, 238609294, 286331153)
+
+
+class FairQueue:
+    """
+    The ready queue of the completely fair scheduling (CFS) algorithm: the ready processes ordered
+    by virtual runtime, the CPU time each one has received weighted by its priority.
+
+    The processes are kept in an IndexedPriorityQueue keyed on their virtual runtime, so adding a
+    process, removing one and finding the one with the smallest virtual runtime all cost O(log n).
+    Processes with equal virtual runtimes come out in the order they were added.
+
+    The queue also keeps min_vruntime, which follows the smallest virtual runtime among the running
+    process and the ready ones and never decreases. A process that arrives or comes back starts from
+    min_vruntime if its own virtual runtime is behind, so time spent away from the CPU does not turn
+    into a long monopoly of it.
+
+    Attributes:
+        - granularity (int): The time a process runs before another one may preempt it.
+        - queue (IndexedPriorityQueue): The ready processes, ordered by virtual runtime.
+        - handles (dict): Maps each queued process to its handle in queue.
+        - min_vruntime (int): The smallest virtual runtime in the queue or on the CPU, as last seen.
+
+    Methods:
+        - __init__: Initializes an empty FairQueue.
+        - cost: Returns the virtual runtime one time unit on the CPU costs a process.
+        - charge: Adds the virtual runtime of a period on the CPU to the running process.
+        - append: Adds a process, moving its virtual runtime up to min_vruntime.
+        - pop: Removes and returns the process with the smallest virtual runtime.
+        - peek: Returns the process with the smallest virtual runtime without removing it.
+        - remove: Removes a process from the queue.
+        - expire: Tells whether the running process must leave the CPU.
+        - next_expire_time: Returns the first time at which the running process can be preempted.
+        - is_empty: Checks if the queue is empty.
+        - __len__: Returns the number of processes in the queue.
+    """
+
+    def __init__(self, granularity=5):
+        """
+        Initializes a FairQueue instance.
+
+        Parameters:
+            - granularity (int): The time a process runs before another one may preempt it.
+        """
+
+        if granularity < 1:
+            raise ValueError("the granularity must be at least 1")
+
+        self.granularity = granularity
+        self.queue = IndexedPriorityQueue(attrgetter("vruntime"))
+        self.handles = {}
+        self.min_vruntime = 0
+
+    @staticmethod
+    def cost(process):
+        """
+        Static method to return the virtual runtime one time unit on the CPU costs a process.
+
+        Parameters:
+            - process (Process): The process. Priorities beyond the last level cost as much as the last level.
+        """
+        return VRUNTIME_COSTS[min(max(process.priority, 0), len(VRUNTIME_COSTS) - 1)]
+
+    def charge(self, process, elapsed):
+        """
+        Adds the virtual runtime of a period on the CPU to the running process, and moves min_vruntime up.
+
+        Parameters:
+            - process (Process): The running process.
+            - elapsed (int): The length of the period.
+        """
+
+        process.vruntime = process.vruntime + elapsed * FairQueue.cost(process)
+
+        # min_vruntime follows the smallest virtual runtime on the CPU or in the queue, but never decreases
+        smallest = process.vruntime
+        if self.queue:
+            smallest = min(smallest, self.queue.peek().vruntime)
+        if smallest > self.min_vruntime:
+            self.min_vruntime = smallest
+
+    def append(self, process):
+        """
+        Adds a process to the queue, moving its virtual runtime up to min_vruntime if it is behind.
+
+        Parameters:
+            - process (Process): The process.
+        """
+
+        if process.vruntime < self.min_vruntime:
+            process.vruntime = self.min_vruntime
+        self.handles[process] = self.queue.append(process)
+
+    def pop(self):
+        """
+        Removes and returns the process with the smallest virtual runtime.
+
+        Returns:
+            The process.
+        """
+
+        process = self.queue.pop()
+        del self.handles[process]
+        return process
+
+    def peek(self):
+        """
+        Returns the process with the smallest virtual runtime without removing it.
+
+        Returns:
+            The process.
+        """
+        return self.queue.peek()
+
+    def remove(self, process):
+        """
+        Removes a process from the queue.
+
+        Parameters:
+            - process (Process): The process.
+        """
+        self.queue.remove(self.handles.pop(process))
+
+    def expire(self, time, process):
+        """
+        Tells whether the running process must leave the CPU: once it has run for the granularity,
+        it gives way to any ready process with a smaller virtual runtime.
+
+        Parameters:
+            - time (int): The current time.
+            - process (Process): The running process, with its start_time set to the time it got the CPU.
+
+        Returns:
+            - bool: True if the process must leave the CPU for the head of the queue.
+        """
+        return time - process.start_time >= self.granularity and process.vruntime > self.queue.peek().vruntime
+
+    def next_expire_time(self, time, process):
+        """
+        Returns the first time after a given time at which the running process can be preempted,
+        as long as nothing is added to the queue in between.
+
+        Parameters:
+            - time (int): The current time, up to which the process has been charged.
+            - process (Process): The running process.
+
+        Returns:
+            - int: The time, or None if the queue is empty.
+        """
+
+        if not self.queue:
+            return None
+
+        # the virtual runtime grows by cost per time unit, so it passes the head's after that many units
+        overtake = time + (self.queue.peek().vruntime - process.vruntime) // FairQueue.cost(process) + 1
+        return max(overtake, process.start_time + self.granularity, time + 1)
+
+    def is_empty(self):
+        """
+        Checks if the queue is empty.
+
+        Returns:
+            True if the queue is empty, False otherwise.
+        """
+        return self.queue.is_empty()
+
+    def __len__(self):
+        """
+        Returns the number of processes in the queue.
+        """
+        return len(self.queue)
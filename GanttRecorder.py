@@ -0,0 +1,424 @@
+import sys
+from array import array
+
+
+class GanttRecorder:
+    """
+    Records the segments of a Gantt chart in compact arrays and hands them to a sink in batches.
+
+    A recorder is called with (time, process) whenever a process leaves the CPU, like the gantt
+    callback of EventEngine, and stores the segment (process.start_time, time, process.number) in
+    three arrays. Without a sink it keeps every segment; with a sink it writes the buffered segments
+    to the sink once buffer_size of them have been recorded, and on flush(), so output costs one
+    write per batch instead of one print per segment. Each simulation gets its own recorder, so
+    several simulations can run side by side.
+
+    Attributes:
+        - sink: The sink receiving the segments (TextSink, CsvSink, BinarySink, NullSink or the ColumnarSink
+            of GanttTrace.py), or None.
+        - buffer_size (int): The number of segments buffered before they are written to the sink.
+        - start (array): The start times of the buffered segments.
+        - end (array): The end times of the buffered segments.
+        - pid (array): The process numbers of the buffered segments.
+        - count (int): The total number of segments recorded.
+
+    Methods:
+        - __init__: Initializes a GanttRecorder with an optional sink.
+        - record: Records the segment of a process leaving the CPU.
+        - __call__: Same as record, so the recorder can be passed as a gantt callback.
+        - replay: Records segments of a run that was recorded earlier.
+        - repeat: Records copies of a run of segments, each shifted by a period.
+        - flush: Writes the buffered segments to the sink.
+        - close: Flushes the recorder and closes its sink.
+        - checkpoint: Flushes the recorder and returns its state and the state of its sink.
+        - restore: Restores the recorder and its sink to a state returned by checkpoint.
+        - segments: Returns the buffered segments as (start, end, pid) tuples.
+        - __len__: Returns the number of buffered segments.
+    """
+
+    def __init__(self, sink=None, buffer_size=4096):
+        """
+        Initializes a GanttRecorder instance.
+
+        Parameters:
+            - sink: The sink receiving the segments, or None to keep every segment in the recorder.
+            - buffer_size (int): The number of segments buffered before they are written to the sink.
+        """
+
+        self.sink = sink
+        self.buffer_size = buffer_size
+        self.start = array("q")
+        self.end = array("q")
+        self.pid = array("q")
+        self.count = 0
+
+    def record(self, time, process):
+        """
+        Records the segment of a process leaving the CPU.
+
+        Parameters:
+            - time (int): The time at which the process leaves the CPU.
+            - process (Process): The process, with its start_time set to the time it got the CPU.
+        """
+
+        self.start.append(process.start_time)
+        self.end.append(time)
+        self.pid.append(process.number)
+        self.count = self.count + 1
+
+        if self.sink is not None and len(self.pid) >= self.buffer_size:
+            self.flush()
+
+    __call__ = record
+
+    def replay(self, segments):
+        """
+        Records the segments of a run that was recorded earlier, such as a result from a ResultCache,
+        as if the run had just recorded them.
+
+        Parameters:
+            - segments (list): The (start, end, pid) segments, in order.
+        """
+
+        for start, end, pid in segments:
+            self.start.append(start)
+            self.end.append(end)
+            self.pid.append(pid)
+            self.count = self.count + 1
+
+            if self.sink is not None and len(self.pid) >= self.buffer_size:
+                self.flush()
+
+    def repeat(self, segments, period, count):
+        """
+        Records count copies of a run of segments, the first one shifted by period and each of the
+        others by period after the previous one, as when a periodic schedule is extrapolated. With a
+        NullSink, which discards the segments anyway, only the segment count is updated.
+
+        Parameters:
+            - segments (list): The (start, end, pid) segments of one period, in order.
+            - period (int): The period.
+            - count (int): The number of copies.
+        """
+
+        if isinstance(self.sink, NullSink):
+            self.flush()
+            self.count = self.count + len(segments) * count
+            return
+
+        self.replay((start + shift, end + shift, pid) for shift in range(period, period * (count + 1), period)
+                    for start, end, pid in segments)
+
+    def flush(self):
+        """
+        Writes the buffered segments to the sink and empties the buffer. Does nothing without a sink.
+        """
+
+        if self.sink is None or len(self.pid) == 0:
+            return
+
+        self.sink.write(self.start, self.end, self.pid)
+        self.start = array("q")
+        self.end = array("q")
+        self.pid = array("q")
+
+    def close(self):
+        """
+        Flushes the recorder and closes its sink.
+        """
+
+        self.flush()
+        if self.sink is not None:
+            self.sink.close()
+
+    def checkpoint(self):
+        """
+        Flushes the recorder and returns its state and the state of its sink, for a checkpoint of the run.
+
+        Returns:
+            - dict: The segment count, the buffered segments (only kept without a sink) and the sink state.
+        """
+
+        self.flush()
+        return {"count": self.count, "start": self.start, "end": self.end, "pid": self.pid,
+                "sink": self.sink.checkpoint() if self.sink is not None else None}
+
+    def restore(self, state):
+        """
+        Restores the recorder and its sink to a state returned by checkpoint, discarding
+        anything recorded since.
+
+        Parameters:
+            - state (dict): The state.
+        """
+
+        self.count = state["count"]
+        self.start = array("q", state["start"])
+        self.end = array("q", state["end"])
+        self.pid = array("q", state["pid"])
+        if self.sink is not None and state["sink"] is not None:
+            self.sink.restore(state["sink"])
+
+    def segments(self):
+        """
+        Returns the buffered segments.
+
+        Returns:
+            A list of (start, end, pid) tuples.
+        """
+        return list(zip(self.start, self.end, self.pid))
+
+    def __len__(self):
+        """
+        Returns the number of buffered segments.
+        """
+        return len(self.pid)
+
+
+class TextSink:
+    """
+    Renders Gantt chart segments as text, five segments per line, the way the menu prints them.
+
+    Attributes:
+        - stream: The text stream to write to.
+        - line (int): The number of segments rendered so far.
+
+    Methods:
+        - __init__: Initializes a TextSink writing to a stream.
+        - write: Renders a batch of segments with a single write.
+        - checkpoint: Returns the position of the stream and the number of segments rendered.
+        - restore: Moves the stream back to a checkpoint and discards what was written since.
+        - close: Flushes the stream.
+    """
+
+    def __init__(self, stream=None):
+        """
+        Initializes a TextSink instance.
+
+        Parameters:
+            - stream: The text stream to write to (standard output by default).
+        """
+
+        self.stream = stream if stream is not None else sys.stdout
+        self.line = 0
+
+    def write(self, start, end, pid):
+        """
+        Renders a batch of segments with a single write.
+
+        Parameters:
+            - start, end, pid (array): The start times, end times and process numbers of the segments.
+        """
+
+        parts = []
+        for segment_start, segment_end, segment_pid in zip(start, end, pid):
+            self.line = self.line + 1
+            parts.append("%-3s ||%-2s|| %-3s\t  " % (segment_start, "P" + str(segment_pid), segment_end))
+            if self.line % 5 == 0:
+                parts.append("\n\n")
+        self.stream.write("".join(parts))
+
+    def checkpoint(self):
+        """
+        Returns the position of the stream and the number of segments rendered, for a checkpoint of the run.
+        """
+        return {"position": stream_position(self.stream), "line": self.line}
+
+    def restore(self, state):
+        """
+        Moves the stream back to a checkpoint and discards what was written since, if the stream is seekable.
+
+        Parameters:
+            - state (dict): The state returned by checkpoint.
+        """
+
+        truncate_stream(self.stream, state["position"])
+        self.line = state["line"]
+
+    def close(self):
+        """
+        Flushes the stream.
+        """
+        self.stream.flush()
+
+
+class CsvSink:
+    """
+    Writes Gantt chart segments as CSV rows of start, end and pid, after a header row.
+
+    Attributes:
+        - stream: The text stream to write to.
+
+    Methods:
+        - __init__: Initializes a CsvSink writing to a stream.
+        - write: Writes a batch of segments with a single write.
+        - checkpoint: Returns the position of the stream.
+        - restore: Moves the stream back to a checkpoint and discards what was written since.
+        - close: Flushes the stream.
+    """
+
+    def __init__(self, stream):
+        """
+        Initializes a CsvSink instance and writes the header row.
+
+        Parameters:
+            - stream: The text stream to write to.
+        """
+
+        self.stream = stream
+        self.stream.write("start,end,pid\n")
+
+    def write(self, start, end, pid):
+        """
+        Writes a batch of segments with a single write.
+
+        Parameters:
+            - start, end, pid (array): The start times, end times and process numbers of the segments.
+        """
+        self.stream.write("".join("%d,%d,%d\n" % segment for segment in zip(start, end, pid)))
+
+    def checkpoint(self):
+        """
+        Returns the position of the stream, for a checkpoint of the run.
+        """
+        return {"position": stream_position(self.stream)}
+
+    def restore(self, state):
+        """
+        Moves the stream back to a checkpoint and discards what was written since, if the stream is seekable.
+
+        Parameters:
+            - state (dict): The state returned by checkpoint.
+        """
+        truncate_stream(self.stream, state["position"])
+
+    def close(self):
+        """
+        Flushes the stream.
+        """
+        self.stream.flush()
+
+
+class BinarySink:
+    """
+    Writes Gantt chart segments as fixed-size binary records of three little-endian 64-bit
+    integers (start, end, pid), which can be read back with array("q").frombytes.
+
+    Attributes:
+        - stream: The binary stream to write to.
+
+    Methods:
+        - __init__: Initializes a BinarySink writing to a stream.
+        - write: Writes a batch of segments with a single write.
+        - checkpoint: Returns the position of the stream.
+        - restore: Moves the stream back to a checkpoint and discards what was written since.
+        - close: Flushes the stream.
+    """
+
+    def __init__(self, stream):
+        """
+        Initializes a BinarySink instance.
+
+        Parameters:
+            - stream: The binary stream to write to.
+        """
+        self.stream = stream
+
+    def write(self, start, end, pid):
+        """
+        Writes a batch of segments with a single write.
+
+        Parameters:
+            - start, end, pid (array): The start times, end times and process numbers of the segments.
+        """
+
+        records = array("q", bytes(8 * 3 * len(pid)))
+        records[0::3] = start
+        records[1::3] = end
+        records[2::3] = pid
+        if sys.byteorder == "big":
+            records.byteswap()
+        self.stream.write(records.tobytes())
+
+    def checkpoint(self):
+        """
+        Returns the position of the stream, for a checkpoint of the run.
+        """
+        return {"position": stream_position(self.stream)}
+
+    def restore(self, state):
+        """
+        Moves the stream back to a checkpoint and discards what was written since, if the stream is seekable.
+
+        Parameters:
+            - state (dict): The state returned by checkpoint.
+        """
+        truncate_stream(self.stream, state["position"])
+
+    def close(self):
+        """
+        Flushes the stream.
+        """
+        self.stream.flush()
+
+
+class NullSink:
+    """
+    Discards Gantt chart segments, for benchmark runs where output would only add cost.
+
+    Methods:
+        - write: Discards a batch of segments.
+        - checkpoint: Returns an empty state.
+        - restore: Does nothing.
+        - close: Does nothing.
+    """
+
+    def write(self, start, end, pid):
+        """
+        Discards a batch of segments.
+        """
+
+    def checkpoint(self):
+        """
+        Returns an empty state.
+        """
+        return {}
+
+    def restore(self, state):
+        """
+        Does nothing.
+        """
+
+    def close(self):
+        """
+        Does nothing.
+        """
+
+
+def stream_position(stream):
+    """
+    Flushes a stream and returns its position, or None if the stream is not seekable.
+
+    Parameters:
+        - stream: The stream.
+    """
+
+    stream.flush()
+    if not stream.seekable():
+        return None
+    return stream.tell()
+
+
+def truncate_stream(stream, position):
+    """
+    Moves a stream back to a position and discards everything after it. Does nothing without a position.
+
+    Parameters:
+        - stream: The stream, opened for reading and writing (mode "r+" or "r+b").
+        - position: The position returned by stream_position, or None.
+    """
+
+    if position is None:
+        return
+    stream.seek(position)
+    stream.truncate()
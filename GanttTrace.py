@@ -0,0 +1,852 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# The first bytes of a columnar Gantt chart file
+MAGIC = b"GANTCOL1"
+
+# The header of a block of segments: a tag, the number of segments and the core of the segments
+BLOCK = struct.Struct("<3q")
+BLOCK_TAG = 1
+
+# The header of the footer: a tag, the base window of the summaries and the number of summarised cores
+FOOTER = struct.Struct("<3q")
+FOOTER_TAG = 2
+
+# The end of a complete file: the offset of the footer and a marker
+TRAILER = struct.Struct("<q8s")
+TRAILER_MAGIC = b"GANTEND1"
+
+# Each summary level has windows this many times longer than the level below it
+FANOUT = 16
+
+# The smallest and largest pid of a window that no segment overlaps
+NO_LOW = 2 ** 63 - 1
+NO_HIGH = -2 ** 63
+
+# The characters shading a text chart cell shared by several processes, from least to most busy
+SHADES = ".:+*#"
+
+
+class GanttWriter:
+    """
+    Writes the Gantt chart segments of a run to a compact columnar binary file, with precomputed
+    summaries for downsampled rendering.
+
+    The file starts with MAGIC and holds one block per batch of segments written by a sink: a
+    header (BLOCK_TAG, number of segments, core) followed by three columns of little-endian 64-bit
+    integers, the start times, the end times and the pids. The core is stored once per block, since
+    every lane of a chart has its own sink. Each block is appended as it arrives, so the file grows
+    with the run and a run that stops early leaves every complete block readable.
+
+    While the blocks are written, the writer keeps a WindowSummary of each core: the busy time,
+    number of segments and smallest and largest pid of every window of `window` time units. On
+    close() it appends a footer with these summaries at every level (each level FANOUT times coarser
+    than the one below it, up to a single window) and an index of the blocks, so a reader can render
+    any part of the timeline, and find the segments of any time range, without reading every segment.
+
+    Attributes:
+        - path (str): The path of the file.
+        - window (int): The length of the windows of the finest summary level.
+        - stream: The binary stream of the file.
+        - summaries (dict): Maps each core to its WindowSummary.
+        - index (list): One (offset, count, core, first start, last end) tuple per block.
+
+    Methods:
+        - __init__: Creates a columnar Gantt chart file, or reopens one to append to it.
+        - sink: Returns a sink writing the segments of one core to the file.
+        - write: Appends a block of segments of one core.
+        - position: Returns the size of the file, for a checkpoint of the run.
+        - truncate: Discards every block after a position returned by position.
+        - scan: Rebuilds the index and summaries from the blocks of the file.
+        - close: Appends the footer and closes the file.
+        - __enter__, __exit__: Close the file at the end of a with statement.
+    """
+
+    def __init__(self, path, window=1024, append=False):
+        """
+        Initializes a GanttWriter instance.
+
+        Parameters:
+            - path (str): The path of the file.
+            - window (int): The length of the windows of the finest summary level.
+            - append (bool): Reopen an existing file and add to its blocks (dropping its footer),
+                for example to resume a checkpointed run. A missing or empty file is created.
+        """
+
+        if window < 1:
+            raise ValueError("the summary window must be at least one time unit")
+
+        self.path = path
+        self.window = window
+        self.summaries = {}
+        self.index = []
+
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            self.stream = open(path, "r+b")
+            self.scan(os.path.getsize(path))
+        else:
+            self.stream = open(path, "w+b")
+            self.stream.write(MAGIC)
+
+    def sink(self, core=0):
+        """
+        Returns a sink writing the segments of one core to the file.
+
+        Parameters:
+            - core (int): The core of the segments.
+
+        Returns:
+            - ColumnarSink: The sink, to pass to a GanttRecorder.
+        """
+        return ColumnarSink(self, core)
+
+    def write(self, start, end, pid, core=0):
+        """
+        Appends a block of segments of one core, and adds them to the summaries.
+
+        Parameters:
+            - start, end, pid (array): The start times, end times and process numbers of the segments.
+            - core (int): The core of the segments.
+        """
+
+        count = len(pid)
+        if count == 0:
+            return
+
+        offset = self.stream.tell()
+        columns = [array("q", column) for column in (start, end, pid)]
+        if sys.byteorder == "big":
+            for column in columns:
+                column.byteswap()
+        self.stream.write(BLOCK.pack(BLOCK_TAG, count, core) + b"".join(column.tobytes() for column in columns))
+
+        self.index.append((offset, count, core, start[0], end[-1]))
+        if core not in self.summaries:
+            self.summaries[core] = WindowSummary(self.window)
+        self.summaries[core].add(start, end, pid)
+
+    def position(self):
+        """
+        Flushes the file and returns its size, for a checkpoint of the run.
+
+        Returns:
+            - int: The position after the last block.
+        """
+
+        self.stream.flush()
+        return self.stream.tell()
+
+    def truncate(self, position):
+        """
+        Discards every block after a position returned by position, and rebuilds the summaries.
+
+        Parameters:
+            - position (int): The position.
+        """
+
+        self.stream.flush()
+        self.scan(position)
+
+    def scan(self, size):
+        """
+        Rebuilds the index and summaries from the blocks of the file up to a given size, then moves
+        to the end of the last complete block and truncates the file there, dropping any footer.
+
+        Parameters:
+            - size (int): The number of bytes of the file to read.
+        """
+
+        self.stream.seek(0)
+        if self.stream.read(len(MAGIC)) != MAGIC:
+            raise ValueError(self.path + " is not a columnar Gantt chart file")
+
+        self.index = []
+        self.summaries = {}
+        blocks = []
+        with mmap.mmap(self.stream.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            size = min(size, len(mapping))
+            if size >= len(MAGIC) + TRAILER.size:
+                # a complete file keeps the window of its summaries
+                footer, marker = TRAILER.unpack_from(mapping, size - TRAILER.size)
+                if marker == TRAILER_MAGIC:
+                    self.window = FOOTER.unpack_from(mapping, footer)[1]
+
+            for offset, count, core, *columns in read_blocks(mapping, size):
+                # copy the columns, so no view of the mapping outlives it
+                start, end, pid = (column.tolist() for column in columns)
+                del columns
+                blocks.append(offset + BLOCK.size + 24 * count)
+                self.index.append((offset, count, core, start[0], end[-1]))
+                if core not in self.summaries:
+                    self.summaries[core] = WindowSummary(self.window)
+                self.summaries[core].add(start, end, pid)
+
+        self.stream.seek(blocks[-1] if blocks else len(MAGIC))
+        self.stream.truncate()
+
+    def close(self):
+        """
+        Appends the footer (the summaries of every core at every level and the block index) and
+        the trailer, and closes the file.
+        """
+
+        if self.stream.closed:
+            return
+
+        footer = self.stream.tell()
+        parts = [FOOTER.pack(FOOTER_TAG, self.window, len(self.summaries))]
+        for core in sorted(self.summaries):
+            levels = self.summaries[core].levels()
+            parts.append(struct.pack("<2q", core, len(levels)))
+            for window, busy, count, low, high in levels:
+                parts.append(struct.pack("<2q", window, len(busy)))
+                parts.extend(little_endian(column) for column in (busy, count, low, high))
+
+        parts.append(struct.pack("<q", len(self.index)))
+        for field in range(5):
+            parts.append(little_endian(array("q", (block[field] for block in self.index))))
+        parts.append(TRAILER.pack(footer, TRAILER_MAGIC))
+
+        self.stream.write(b"".join(parts))
+        self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+class ColumnarSink:
+    """
+    A Gantt chart sink writing the segments of one core to a GanttWriter.
+
+    Attributes:
+        - writer (GanttWriter): The writer of the file.
+        - core (int): The core of the segments.
+
+    Methods:
+        - __init__: Initializes a ColumnarSink.
+        - write: Writes a batch of segments as one block.
+        - checkpoint: Returns the position of the file.
+        - restore: Discards the blocks written since a checkpoint.
+        - close: Does nothing; the file is closed by its writer.
+    """
+
+    def __init__(self, writer, core=0):
+        """
+        Initializes a ColumnarSink instance.
+
+        Parameters:
+            - writer (GanttWriter): The writer of the file.
+            - core (int): The core of the segments.
+        """
+
+        self.writer = writer
+        self.core = core
+
+    def write(self, start, end, pid):
+        """
+        Writes a batch of segments as one block.
+
+        Parameters:
+            - start, end, pid (array): The start times, end times and process numbers of the segments.
+        """
+        self.writer.write(start, end, pid, self.core)
+
+    def checkpoint(self):
+        """
+        Returns the position of the file, for a checkpoint of the run.
+        """
+        return {"position": self.writer.position()}
+
+    def restore(self, state):
+        """
+        Discards the blocks written since a checkpoint.
+
+        Parameters:
+            - state (dict): The state returned by checkpoint.
+        """
+        self.writer.truncate(state["position"])
+
+    def close(self):
+        """
+        Does nothing; the file is closed by its writer, once every lane is done.
+        """
+
+
+class WindowSummary:
+    """
+    The busy time, number of segments and smallest and largest pid of every window of a timeline.
+
+    Attributes:
+        - window (int): The length of a window.
+        - busy (array): The time of each window covered by segments.
+        - count (array): The number of segments starting in each window.
+        - low (array): The smallest pid of the segments overlapping each window, or NO_LOW.
+        - high (array): The largest pid of the segments overlapping each window, or NO_HIGH.
+
+    Methods:
+        - __init__: Initializes an empty WindowSummary.
+        - add: Adds segments to the summary.
+        - add_spanning: Adds segments to the summary one at a time.
+        - grow: Adds empty windows to the summary.
+        - levels: Returns the summary at every level, from the finest to a single window.
+    """
+
+    def __init__(self, window):
+        """
+        Initializes a WindowSummary instance.
+
+        Parameters:
+            - window (int): The length of a window.
+        """
+
+        self.window = window
+        self.busy = array("q")
+        self.count = array("q")
+        self.low = array("q")
+        self.high = array("q")
+
+    def add(self, start, end, pid):
+        """
+        Adds segments to the summary. A segment costs one step per window it overlaps; with NumPy,
+        the steps of a batch are taken together. The segments of a lane never overlap, so a batch
+        takes at most one step per segment and one per window of its time range.
+
+        Parameters:
+            - start, end, pid (sequence): The start times, end times and process numbers of the segments.
+        """
+
+        if len(pid) == 0:
+            return
+        if numpy is None:
+            self.add_spanning(start, end, pid)
+            return
+
+        window = self.window
+        start = numpy.asarray(start, dtype=numpy.int64)
+        end = numpy.asarray(end, dtype=numpy.int64)
+        pid = numpy.asarray(pid, dtype=numpy.int64)
+        first = start // window
+        spans = numpy.maximum(end - 1, start) // window - first + 1
+        self.grow(int((first + spans).max()))
+
+        # one step per window of each segment: the window and the part of the segment inside it
+        steps = numpy.repeat(numpy.arange(len(pid)), spans)
+        index = first[steps] + numpy.arange(len(steps)) - numpy.repeat(numpy.cumsum(spans) - spans, spans)
+        covered = numpy.minimum(end[steps], (index + 1) * window) - numpy.maximum(start[steps], index * window)
+
+        # views of the arrays, released before they can grow again
+        busy, count, low, high = (numpy.frombuffer(column, dtype=numpy.int64)
+                                  for column in (self.busy, self.count, self.low, self.high))
+        numpy.add.at(busy, index, numpy.maximum(covered, 0))
+        numpy.add.at(count, first, 1)
+        numpy.minimum.at(low, index, pid[steps])
+        numpy.maximum.at(high, index, pid[steps])
+        del busy, count, low, high
+
+    def add_spanning(self, start, end, pid):
+        """
+        Adds segments to the summary one at a time, window by window.
+
+        Parameters:
+            - start, end, pid (iterable): The start times, end times and process numbers of the segments.
+        """
+
+        window = self.window
+        busy, count, low, high = self.busy, self.count, self.low, self.high
+        for segment_start, segment_end, segment_pid in zip(start, end, pid):
+            first = segment_start // window
+            last = max(segment_end - 1, segment_start) // window
+            if last >= len(busy):
+                self.grow(last + 1)
+
+            count[first] = count[first] + 1
+            for index in range(first, last + 1):
+                # the part of the segment inside the window
+                covered = min(segment_end, (index + 1) * window) - max(segment_start, index * window)
+                busy[index] = busy[index] + max(covered, 0)
+                if segment_pid < low[index]:
+                    low[index] = segment_pid
+                if segment_pid > high[index]:
+                    high[index] = segment_pid
+
+    def grow(self, size):
+        """
+        Adds empty windows to the summary, up to a given number of windows.
+
+        Parameters:
+            - size (int): The number of windows.
+        """
+
+        grow = size - len(self.busy)
+        if grow > 0:
+            self.busy.extend(array("q", bytes(8 * grow)))
+            self.count.extend(array("q", bytes(8 * grow)))
+            self.low.extend(array("q", (NO_LOW,)) * grow)
+            self.high.extend(array("q", (NO_HIGH,)) * grow)
+
+    def levels(self):
+        """
+        Returns the summary at every level, each FANOUT times coarser than the one below it,
+        from the finest level to a level with a single window.
+
+        Returns:
+            - list: One (window, busy, count, low, high) tuple per level.
+        """
+
+        window, busy, count, low, high = self.window, self.busy, self.count, self.low, self.high
+        levels = [(window, busy, count, low, high)]
+        while len(busy) > 1:
+            groups = range(0, len(busy), FANOUT)
+            window = window * FANOUT
+            busy = array("q", (sum(busy[first:first + FANOUT]) for first in groups))
+            count = array("q", (sum(count[first:first + FANOUT]) for first in groups))
+            low = array("q", (min(low[first:first + FANOUT]) for first in groups))
+            high = array("q", (max(high[first:first + FANOUT]) for first in groups))
+            levels.append((window, busy, count, low, high))
+        return levels
+
+
+class GanttTrace:
+    """
+    A columnar Gantt chart file written by a GanttWriter, memory-mapped for analysis and rendering.
+
+    The columns of every block are read straight from the mapping, so only the pages of the blocks
+    being read are loaded. The footer gives the summaries of every core at every level and the block
+    index, so summarise() and segments() only touch the summary windows and blocks of the time range
+    they are asked for. A file without a footer (a run that stopped early) is scanned once when it
+    is opened, to rebuild them.
+
+    Attributes:
+        - path (str): The path of the file.
+        - window (int): The length of the windows of the finest summary level.
+        - mapping (mmap): The memory mapping of the file.
+        - levels (dict): Maps each core to its summary levels, one (window, busy, count, low, high)
+            tuple per level from the finest, with the columns as sequences of integers.
+        - blocks (dict): Maps each core to its blocks, as (offset, count, first start, last end) tuples in time order.
+        - count (int): The number of segments in the file.
+
+    Methods:
+        - __init__: Opens and memory-maps a columnar Gantt chart file.
+        - cores: Returns the cores of the chart.
+        - time_range: Returns the start of the first segment and the end of the last one.
+        - block_columns: Returns the start, end and pid columns of a block.
+        - columns: Returns every segment as columns.
+        - segments: Returns the segments overlapping a time range.
+        - summarise: Returns the busy time, segment count and pid range of equal slices of a time range.
+        - close: Closes the mapping.
+        - __enter__, __exit__: Close the mapping at the end of a with statement.
+        - __len__: Returns the number of segments.
+    """
+
+    def __init__(self, path):
+        """
+        Initializes a GanttTrace instance.
+
+        Parameters:
+            - path (str): The path of the file.
+        """
+
+        self.path = path
+        with open(path, "rb") as stream:
+            if stream.read(len(MAGIC)) != MAGIC:
+                raise ValueError(path + " is not a columnar Gantt chart file")
+            self.mapping = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.levels = {}
+        self.blocks = {}
+        size = len(self.mapping)
+        footer, marker = TRAILER.unpack_from(self.mapping, size - TRAILER.size) if size >= len(MAGIC) + TRAILER.size \
+            else (None, None)
+        if marker == TRAILER_MAGIC:
+            self.read_footer(footer)
+        else:
+            self.recover(size)
+        self.count = sum(block[1] for blocks in self.blocks.values() for block in blocks)
+
+    def read_footer(self, offset):
+        """
+        Reads the summaries and the block index from the footer of the file.
+
+        Parameters:
+            - offset (int): The offset of the footer.
+        """
+
+        tag, self.window, cores = FOOTER.unpack_from(self.mapping, offset)
+        if tag != FOOTER_TAG:
+            raise ValueError(self.path + " has a damaged footer")
+        offset = offset + FOOTER.size
+
+        for _ in range(cores):
+            core, count = struct.unpack_from("<2q", self.mapping, offset)
+            offset = offset + 16
+            levels = []
+            for _ in range(count):
+                window, size = struct.unpack_from("<2q", self.mapping, offset)
+                offset = offset + 16
+                columns = []
+                for _ in range(4):
+                    columns.append(column_view(self.mapping, offset, size))
+                    offset = offset + 8 * size
+                levels.append((window, *columns))
+            self.levels[core] = levels
+
+        (count,) = struct.unpack_from("<q", self.mapping, offset)
+        offset = offset + 8
+        fields = []
+        for _ in range(5):
+            fields.append(column_view(self.mapping, offset, count))
+            offset = offset + 8 * count
+        for block_offset, block_count, core, first, last in zip(*fields):
+            self.blocks.setdefault(int(core), []).append((int(block_offset), int(block_count), int(first), int(last)))
+
+    def recover(self, size):
+        """
+        Rebuilds the summaries and the block index of a file without a footer by scanning its blocks.
+
+        Parameters:
+            - size (int): The size of the file.
+        """
+
+        # the window of the writer is only stored in the footer, so use the default one
+        self.window = 1024
+        summaries = {}
+        for offset, count, core, *columns in read_blocks(self.mapping, size):
+            start, end, pid = (column.tolist() for column in columns)
+            self.blocks.setdefault(core, []).append((offset, count, start[0], end[-1]))
+            if core not in summaries:
+                summaries[core] = WindowSummary(self.window)
+            summaries[core].add(start, end, pid)
+        self.levels = {core: summary.levels() for core, summary in summaries.items()}
+
+    def cores(self):
+        """
+        Returns the cores of the chart.
+
+        Returns:
+            - list: The cores, in increasing order.
+        """
+        return sorted(self.blocks)
+
+    def time_range(self):
+        """
+        Returns the start of the first segment and the end of the last one.
+
+        Returns:
+            - tuple: (start, end), or (0, 0) for an empty chart.
+        """
+
+        if not self.blocks:
+            return 0, 0
+        return (min(blocks[0][2] for blocks in self.blocks.values()),
+                max(blocks[-1][3] for blocks in self.blocks.values()))
+
+    def block_columns(self, offset, count):
+        """
+        Returns the start, end and pid columns of a block, read from the mapping without copying
+        (as NumPy arrays when NumPy is installed).
+
+        Parameters:
+            - offset (int): The offset of the block.
+            - count (int): The number of segments of the block.
+
+        Returns:
+            - tuple: The start, end and pid columns.
+        """
+
+        offset = offset + BLOCK.size
+        return tuple(column_view(self.mapping, offset + 8 * count * index, count) for index in range(3))
+
+    def columns(self, core=None):
+        """
+        Returns every segment as columns, for analysis. This reads the whole file.
+
+        Parameters:
+            - core (int): Only return the segments of this core, if given.
+
+        Returns:
+            - dict: The columns "pid", "start", "end" and "core", as NumPy arrays when NumPy is
+                installed and as arrays of 64-bit integers otherwise, in block order.
+        """
+
+        cores = self.cores() if core is None else [core]
+        parts = {"pid": [], "start": [], "end": [], "core": []}
+        for lane in cores:
+            for offset, count, _, _ in self.blocks.get(lane, []):
+                start, end, pid = self.block_columns(offset, count)
+                parts["start"].append(start)
+                parts["end"].append(end)
+                parts["pid"].append(pid)
+                parts["core"].append(array("q", (lane,)) * count)
+
+        if numpy is not None:
+            return {name: numpy.concatenate([numpy.asarray(part, dtype=numpy.int64) for part in columns])
+                    if columns else numpy.zeros(0, dtype=numpy.int64) for name, columns in parts.items()}
+        return {name: array("q", (value for part in columns for value in part)) for name, columns in parts.items()}
+
+    def segments(self, begin, end, core=0):
+        """
+        Returns the segments of a core overlapping a time range, reading only the blocks that overlap it.
+
+        Parameters:
+            - begin (int): The start of the range.
+            - end (int): The end of the range (excluded).
+            - core (int): The core.
+
+        Returns:
+            - list: The (start, end, pid) segments, in time order.
+        """
+
+        blocks = self.blocks.get(core, [])
+        # the blocks of a core are in time order, so both their first starts and last ends increase
+        first = bisect_right([block[3] for block in blocks], begin)
+        last = bisect_left([block[2] for block in blocks], end)
+
+        segments = []
+        for offset, count, _, _ in blocks[first:last]:
+            for segment in zip(*self.block_columns(offset, count)):
+                segment_start, segment_end, _ = segment
+                if segment_start < end and (segment_end > begin or segment_start >= begin):
+                    segments.append(tuple(int(value) for value in segment))
+        return segments
+
+    def summarise(self, begin, end, slices, core=0):
+        """
+        Splits a time range into equal slices and returns the busy time, number of segments and
+        smallest and largest pid of each one.
+
+        When a slice is at least as long as a window of the finest summary level, the slices are
+        computed from the coarsest level whose windows fit in a slice, so the cost depends on the
+        number of slices and not on the number of segments. Each window then goes to the slice where
+        it starts, and the bounds of each slice are moved to the bounds of its windows, so the busy
+        time always matches the bounds returned. Shorter slices are computed exactly from the segments
+        of the range.
+
+        Parameters:
+            - begin (int): The start of the range.
+            - end (int): The end of the range (excluded).
+            - slices (int): The number of slices.
+            - core (int): The core.
+
+        Returns:
+            - list: One (start, end, busy, count, low, high) tuple per slice, where low and high
+                are None if no segment overlaps the slice.
+        """
+
+        if end <= begin or slices < 1:
+            raise ValueError("a summary needs a non-empty time range and at least one slice")
+
+        edges = [begin + (end - begin) * index // slices for index in range(slices + 1)]
+        busy = [0] * slices
+        count = [0] * slices
+        low = [NO_LOW] * slices
+        high = [NO_HIGH] * slices
+
+        levels = self.levels.get(core, [])
+        usable = [level for level in levels if level[0] * slices <= end - begin]
+        if usable:
+            window, level_busy, level_count, level_low, level_high = usable[-1]
+
+            # the first window of each slice is the first one starting in it (the one holding begin for
+            # the first slice), and the last slice ends with the window holding end - 1
+            edges = [begin // window * window] + [-(-edge // window) * window for edge in edges[1:-1]] + \
+                    [((end - 1) // window + 1) * window]
+            last = min((end - 1) // window, len(level_busy) - 1)
+            for index in range(max(begin // window, 0), last + 1):
+                bucket = bisect_right(edges, index * window) - 1
+                busy[bucket] = busy[bucket] + int(level_busy[index])
+                count[bucket] = count[bucket] + int(level_count[index])
+                low[bucket] = min(low[bucket], int(level_low[index]))
+                high[bucket] = max(high[bucket], int(level_high[index]))
+        else:
+            for segment_start, segment_end, pid in self.segments(begin, end, core):
+                first = max(bisect_right(edges, segment_start) - 1, 0)
+                last = min(bisect_left(edges, segment_end) - 1, slices - 1)
+                if segment_start >= begin:
+                    count[first] = count[first] + 1
+                for bucket in range(first, max(last, first) + 1):
+                    covered = min(segment_end, edges[bucket + 1]) - max(segment_start, edges[bucket])
+                    busy[bucket] = busy[bucket] + max(covered, 0)
+                    low[bucket] = min(low[bucket], pid)
+                    high[bucket] = max(high[bucket], pid)
+
+        return [(edges[index], edges[index + 1], busy[index], count[index],
+                 None if low[index] == NO_LOW else low[index], None if high[index] == NO_HIGH else high[index])
+                for index in range(slices)]
+
+    def close(self):
+        """
+        Closes the mapping. Columns returned by block_columns still read from the mapping, so while
+        any of them is alive the mapping is only released, and it closes once the last one is gone.
+        """
+
+        levels, self.levels, self.blocks = self.levels, {}, {}
+        del levels
+        try:
+            self.mapping.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def __len__(self):
+        """
+        Returns the number of segments.
+        """
+        return self.count
+
+
+def render_text(trace, begin=None, end=None, width=100):
+    """
+    Renders a time range of a columnar Gantt chart as text, one line per core and one character per
+    slice of the range (at least one time unit long): the last base-36 digit of the pid when a single process ran in the slice, a
+    shade of SHADES by busy fraction when several did, and a space when the core was idle.
+
+    Parameters:
+        - trace (GanttTrace): The chart.
+        - begin (int): The start of the range (the start of the chart by default).
+        - end (int): The end of the range (the end of the chart by default).
+        - width (int): The number of characters per line.
+
+    Returns:
+        - str: The chart, with a line giving the range.
+    """
+
+    first, last = trace.time_range()
+    begin = first if begin is None else begin
+    end = max(last, begin + 1) if end is None else end
+
+    slices = min(width, end - begin)
+    lines = ["%d .. %d (%d per character)" % (begin, end, (end - begin) // slices)]
+    for core in trace.cores():
+        cells = []
+        for start, stop, busy, _, low, high in trace.summarise(begin, end, slices, core):
+            if busy == 0 and low is None:
+                cells.append(" ")
+            elif low == high:
+                cells.append("0123456789abcdefghijklmnopqrstuvwxyz"[low % 36])
+            else:
+                shade = min(busy * len(SHADES) // max(stop - start, 1), len(SHADES) - 1)
+                cells.append(SHADES[shade])
+        lines.append("core %-3d |%s|" % (core, "".join(cells)))
+    return "\n".join(lines) + "\n"
+
+
+def render_svg(trace, begin=None, end=None, width=1000, lane_height=24):
+    """
+    Renders a time range of a columnar Gantt chart as an SVG image, one lane per core and one
+    rectangle per pixel column (or per time unit, when the range is shorter than the width): its colour is the colour of the pid when a single process ran in
+    the column and grey when several did, and its opacity is the busy fraction. Each rectangle has
+    a tooltip with its time range, busy fraction, segment count and pid range.
+
+    Parameters:
+        - trace (GanttTrace): The chart.
+        - begin (int): The start of the range (the start of the chart by default).
+        - end (int): The end of the range (the end of the chart by default).
+        - width (int): The width of the timeline, in pixels.
+        - lane_height (int): The height of a lane, in pixels.
+
+    Returns:
+        - str: The SVG document.
+    """
+
+    first, last = trace.time_range()
+    begin = first if begin is None else begin
+    end = max(last, begin + 1) if end is None else end
+
+    margin = 60
+    slices = min(width, end - begin)
+    scale = width / slices
+    cores = trace.cores()
+    height = lane_height * len(cores) + 20
+    parts = ['<svg xmlns="http://www.w3.org/2000/svg" width="%d" height="%d" font-family="monospace" '
+             'font-size="10">' % (width + margin, height)]
+    for lane, core in enumerate(cores):
+        y = lane * lane_height
+        parts.append('<text x="2" y="%d">core %d</text>' % (y + lane_height // 2 + 4, core))
+        for column, (start, stop, busy, count, low, high) in enumerate(trace.summarise(begin, end, slices, core)):
+            if busy == 0 and low is None:
+                continue
+            colour = "hsl(%d,70%%,45%%)" % (low * 137 % 360) if low == high else "#777"
+            fraction = busy / max(stop - start, 1)
+            parts.append('<rect x="%.2f" y="%d" width="%.2f" height="%d" fill="%s" fill-opacity="%.3f">'
+                         '<title>%d..%d: %.0f%% busy, %d segments, pids %d..%d</title></rect>'
+                         % (margin + column * scale, y + 2, scale, lane_height - 4, colour, max(fraction, 0.1),
+                            start, stop, 100 * fraction, count, low, high))
+    parts.append('<text x="%d" y="%d">%d</text>' % (margin, height - 4, begin))
+    parts.append('<text x="%d" y="%d" text-anchor="end">%d</text>' % (margin + width, height - 4, end))
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
+
+
+def read_blocks(mapping, size):
+    """
+    Reads the blocks of a columnar Gantt chart file, stopping at the footer, at the end of the given
+    size, or at a block cut short by the end of the file.
+
+    Parameters:
+        - mapping (mmap): The memory mapping of the file.
+        - size (int): The number of bytes to read.
+
+    Yields:
+        - tuple: (offset, count, core, start, end, pid) for each block, with the columns as sequences of integers.
+    """
+
+    offset = len(MAGIC)
+    while offset + BLOCK.size <= size:
+        tag, count, core = BLOCK.unpack_from(mapping, offset)
+        stop = offset + BLOCK.size + 24 * count
+        if tag != BLOCK_TAG or count <= 0 or stop > size:
+            return
+        columns = tuple(column_view(mapping, offset + BLOCK.size + 8 * count * index, count) for index in range(3))
+        yield (offset, count, core) + columns
+        offset = stop
+
+
+def column_view(mapping, offset, count):
+    """
+    Returns a column of little-endian 64-bit integers of a mapping, without copying it when the
+    machine is little-endian: a NumPy array when NumPy is installed, a memoryview otherwise.
+
+    Parameters:
+        - mapping (mmap): The memory mapping.
+        - offset (int): The offset of the column.
+        - count (int): The number of integers.
+    """
+
+    if numpy is not None:
+        return numpy.frombuffer(mapping, dtype="<i8", count=count, offset=offset)
+    if sys.byteorder == "big":
+        column = array("q", mapping[offset:offset + 8 * count])
+        column.byteswap()
+        return column
+    return memoryview(mapping)[offset:offset + 8 * count].cast("q")
+
+
+def little_endian(column):
+    """
+    Returns the bytes of an array of 64-bit integers in little-endian order.
+
+    Parameters:
+        - column (array): The integers.
+    """
+
+    if sys.byteorder == "big":
+        column = array("q", column)
+        column.byteswap()
+    return column.tobytes()
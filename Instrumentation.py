@@ -0,0 +1,145 @@
+from time import perf_counter
+
+
+class Instrumentation:
+    """
+    Opt-in counters and timers for the phases of a simulation loop.
+
+    A simulation given an Instrumentation replaces each of its phase functions (aging, arrivals,
+    comebacks, completions, preemption checks and dispatches) with a timed version made by wrap(), and
+    samples the sizes of its queues once per iteration of its loop (a tick or an event). A
+    simulation without one calls its phase functions directly and only checks that it has no
+    instrumentation once per iteration, so the hooks cost next to nothing when turned off.
+
+    Attributes:
+        - callback (function): Called with the report when the run ends, if provided.
+        - calls (dict): Maps each phase to the number of times it ran.
+        - seconds (dict): Maps each phase to the time spent in it.
+        - processes (dict): Maps each phase to the number of processes it handled: processes moved
+            for arrivals and comebacks, processes actually preempted for preemption checks (whose calls
+            count every check, including those that leave the running process on the CPU), one per
+            call otherwise.
+        - steps (int): The number of loop iterations sampled.
+        - ready_queue_total, waiting_queue_total (int): The sums of the sampled queue sizes.
+        - ready_queue_max, waiting_queue_max (int): The largest sampled queue sizes.
+        - started (float): The clock reading when the run began.
+        - elapsed (float): The duration of the run, once it has ended.
+
+    Methods:
+        - __init__: Initializes an Instrumentation with empty counters.
+        - wrap: Returns a timed version of a phase function.
+        - begin: Marks the beginning of the run.
+        - sample: Records the sizes of the queues after an iteration of the loop.
+        - end: Marks the end of the run and calls the callback with the report.
+        - report: Returns the counters and timers as a dictionary.
+    """
+
+    phases = ("aging", "arrivals", "comebacks", "completions", "preemption_checks", "dispatches")
+
+    def __init__(self, callback=None):
+        """
+        Initializes an Instrumentation instance.
+
+        Parameters:
+            - callback (function): Called with the report (see report()) when the run ends.
+        """
+
+        self.callback = callback
+        self.calls = dict.fromkeys(self.phases, 0)
+        self.seconds = dict.fromkeys(self.phases, 0.0)
+        self.processes = dict.fromkeys(self.phases, 0)
+        self.steps = 0
+        self.ready_queue_total = 0
+        self.ready_queue_max = 0
+        self.waiting_queue_total = 0
+        self.waiting_queue_max = 0
+        self.started = None
+        self.elapsed = None
+
+    def wrap(self, phase, function, count=None):
+        """
+        Returns a timed version of a phase function, which counts its calls and the time spent in it.
+
+        Parameters:
+            - phase (str): The phase, one of phases.
+            - function (function): The phase function.
+            - count (function): Called with (args, result) after each call; returns the number of
+                processes the call handled. Each call counts as one process if not provided.
+
+        Returns:
+            - function: The timed function, taking the same arguments and returning the same result.
+        """
+
+        calls, seconds, processes = self.calls, self.seconds, self.processes
+
+        def timed(*args):
+            start = perf_counter()
+            result = function(*args)
+            seconds[phase] = seconds[phase] + (perf_counter() - start)
+            calls[phase] = calls[phase] + 1
+            processes[phase] = processes[phase] + (1 if count is None else count(args, result))
+            return result
+
+        return timed
+
+    def begin(self):
+        """
+        Marks the beginning of the run.
+        """
+        self.started = perf_counter()
+
+    def sample(self, ready_queue, waiting_queue):
+        """
+        Records the sizes of the queues after an iteration of the loop.
+
+        Parameters:
+            - ready_queue: The ready queue of the simulation.
+            - waiting_queue (WaitingQueue): The waiting queue of the simulation.
+        """
+
+        ready = len(ready_queue)
+        waiting = len(waiting_queue)
+        self.steps = self.steps + 1
+        self.ready_queue_total = self.ready_queue_total + ready
+        self.waiting_queue_total = self.waiting_queue_total + waiting
+        if ready > self.ready_queue_max:
+            self.ready_queue_max = ready
+        if waiting > self.waiting_queue_max:
+            self.waiting_queue_max = waiting
+
+    def end(self):
+        """
+        Marks the end of the run and calls the callback, if any, with the report.
+        """
+
+        self.elapsed = perf_counter() - self.started
+        if self.callback is not None:
+            self.callback(self.report())
+
+    def report(self):
+        """
+        Returns the counters and timers as a dictionary.
+
+        Returns:
+            - dict: With the keys seconds (duration of the run), steps (loop iterations), phases
+                (maps each phase to its calls, seconds and processes), preemptions (the preemptions
+                that actually happened), queue_pushes, queue_pops and context_switches (derived from
+                the phase counts), and ready_queue and waiting_queue (the max and mean of their
+                sampled sizes).
+        """
+
+        moved = self.processes
+        preemptions = moved["preemption_checks"]
+        return {"seconds": self.elapsed,
+                "steps": self.steps,
+                "phases": {phase: {"calls": self.calls[phase], "seconds": self.seconds[phase],
+                                   "processes": moved[phase]} for phase in self.phases},
+                "preemptions": preemptions,
+                # a preemption pops the next process and pushes the preempted one back
+                "queue_pushes": moved["arrivals"] + moved["comebacks"] + preemptions,
+                "queue_pops": moved["dispatches"] + preemptions,
+                "context_switches": moved["dispatches"] + preemptions,
+                "ready_queue": {"max": self.ready_queue_max,
+                                "mean": self.ready_queue_total / self.steps if self.steps else 0.0},
+                "waiting_queue": {"max": self.waiting_queue_max,
+                                  "mean": self.waiting_queue_total / self.steps if self.steps else 0.0}}
@@ -0,0 +1,139 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ProcessTable import *
+
+
+def calculate_metrics(processes, time_limit=None, percentiles=(50, 90, 99)):
+    """
+    Computes the scheduling metrics of a simulation run.
+
+    The waiting, turnaround and response times are taken over the processes that have executed at
+    least once. The turnaround time of a process is its CPU exit time minus its arrival time, and its
+    response time is the time it first got the CPU minus its arrival time. With NumPy installed the
+    metrics are computed with vectorized operations, reading a ProcessTable's columns without copying
+    them, or reading a list of processes in a single pass; otherwise they are computed in Python.
+
+    Parameters:
+        - processes (list or ProcessTable): The processes of the run, after the simulation.
+        - time_limit (int): The time limit of the simulation, needed for the throughput and CPU utilisation.
+        - percentiles (tuple): The percentiles to compute for the waiting, turnaround and response times.
+
+    Returns:
+        - dict: The metrics, with the keys:
+            processes, executed, completions,
+            average_waiting_time, average_turnaround_time, average_response_time,
+            waiting_time_percentiles, turnaround_time_percentiles, response_time_percentiles
+            (dicts from percentile to value), throughput (completed bursts per time unit) and
+            cpu_utilisation (busy fraction of the time limit).
+            Averages and percentiles are None when no process has executed, and throughput and
+            cpu_utilisation are None without a time limit.
+    """
+
+    if numpy is not None:
+        columns = numpy_columns(processes)
+    else:
+        columns = python_columns(processes)
+    executed, waiting, turnaround, response, completions, cpu_time = columns
+    total = numpy.sum if numpy is not None else sum
+
+    count = len(waiting)
+    metrics = {"processes": len(processes),
+               "executed": count,
+               "completions": int(total(completions))}
+
+    for name, values in (("waiting_time", waiting), ("turnaround_time", turnaround), ("response_time", response)):
+        if count == 0:
+            metrics["average_" + name] = None
+            metrics[name + "_percentiles"] = {percentile: None for percentile in percentiles}
+        else:
+            # the sums are exact integers, so the averages match a plain Python division
+            metrics["average_" + name] = int(total(values)) / count
+            metrics[name + "_percentiles"] = calculate_percentiles(values, percentiles)
+
+    if time_limit:
+        metrics["throughput"] = metrics["completions"] / time_limit
+        metrics["cpu_utilisation"] = int(total(cpu_time)) / time_limit
+    else:
+        metrics["throughput"] = None
+        metrics["cpu_utilisation"] = None
+
+    return metrics
+
+
+def numpy_columns(processes):
+    """
+    Returns the columns needed by calculate_metrics as NumPy arrays.
+
+    Parameters:
+        - processes (list or ProcessTable): The processes of the run.
+
+    Returns:
+        - tuple: (executed, waiting, turnaround, response, completions, cpu_time), where the
+            waiting, turnaround and response times only cover the executed processes.
+    """
+
+    if isinstance(processes, ProcessTable):
+        executed = processes.as_numpy("has_executed").astype(bool)
+        arrival = processes.as_numpy("arrival_time")[executed]
+        waiting = processes.as_numpy("waiting_time")[executed]
+        turnaround = processes.as_numpy("cpu_turn_time")[executed] - arrival
+        response = processes.as_numpy("first_start_time")[executed] - arrival
+        return executed, waiting, turnaround, response, processes.as_numpy("completions"), processes.as_numpy("cpu_time")
+
+    rows = numpy.array([(process.has_executed, process.waiting_time,
+                         process.cpu_turn_time - process.arrival_time, process.first_start_time - process.arrival_time,
+                         process.completions, process.cpu_time) for process in processes], dtype=numpy.int64).reshape(-1, 6)
+    executed = rows[:, 0].astype(bool)
+    return executed, rows[executed, 1], rows[executed, 2], rows[executed, 3], rows[:, 4], rows[:, 5]
+
+
+def python_columns(processes):
+    """
+    Returns the columns needed by calculate_metrics as lists, for when NumPy is not installed.
+
+    Parameters:
+        - processes (list or ProcessTable): The processes of the run.
+
+    Returns:
+        - tuple: (executed, waiting, turnaround, response, completions, cpu_time), where the
+            waiting, turnaround and response times only cover the executed processes.
+    """
+
+    executed, waiting, turnaround, response, completions, cpu_time = [], [], [], [], [], []
+    for process in processes:
+        executed.append(process.has_executed)
+        completions.append(process.completions)
+        cpu_time.append(process.cpu_time)
+        if process.has_executed:
+            waiting.append(process.waiting_time)
+            turnaround.append(process.cpu_turn_time - process.arrival_time)
+            response.append(process.first_start_time - process.arrival_time)
+    return executed, waiting, turnaround, response, completions, cpu_time
+
+
+def calculate_percentiles(values, percentiles):
+    """
+    Computes percentiles of a non-empty list of values, interpolating linearly between the closest ranks.
+
+    Parameters:
+        - values (list or numpy.ndarray): The values.
+        - percentiles (tuple): The percentiles to compute, between 0 and 100.
+
+    Returns:
+        - dict: Maps each percentile to its value.
+    """
+
+    if numpy is not None:
+        return {percentile: float(value) for percentile, value in zip(percentiles, numpy.percentile(values, percentiles))}
+
+    ordered = sorted(values)
+    result = {}
+    for percentile in percentiles:
+        rank = (len(ordered) - 1) * percentile / 100
+        lower = int(rank)
+        upper = min(lower + 1, len(ordered) - 1)
+        result[percentile] = float(ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower))
+    return result
@@ -0,0 +1,231 @@
+from collections import deque
+
+
+class MultilevelQueue:
+    """
+    The ready queue of the multilevel feedback queue (MLFQ) algorithm: one FIFO queue per level,
+    level 0 being the highest, and an occupancy bitmap with one bit per non-empty level.
+
+    The next process is the head of the highest non-empty level, which is the lowest set bit of
+    the bitmap, so pop and peek cost O(1) however many processes are queued. The queue also keeps
+    the level of every process below level 0 (including the running and waiting ones), applies
+    the demotion rules of the algorithm, and boosts every process back to level 0 periodically.
+
+    The rules, applied to the running process while other processes are ready:
+        - A process of a higher level than the running process preempts it; the running process
+          keeps its level.
+        - A process that has run for a multiple of its level's quantum since its slice started (when
+          it got the CPU, or when it was last demoted) is demoted one level (down to the last one),
+          and leaves the CPU if a process of its new level or higher is ready.
+    Processes that finish their burst keep their level, and come back at it. Every boost_period
+    time units, every process goes back to level 0.
+
+    Attributes:
+        - quanta (tuple): The time quantum of each level, from the highest level to the lowest.
+        - boost_period (int): The time between two boosts.
+        - queues (list): One deque of processes per level.
+        - bitmap (int): Bit i is set when the queue of level i is not empty.
+        - levels (dict): Maps each process below level 0 to its level.
+        - slices (dict): Maps each process that used up a quantum to the time it last did.
+        - size (int): The number of processes in the queue.
+
+    Methods:
+        - __init__: Initializes an empty MultilevelQueue.
+        - age: Moves the queue to a given time, boosting every process if it is a boost time.
+        - append: Adds a process at the back of its level.
+        - pop: Removes and returns the head of the highest non-empty level.
+        - peek: Returns the head of the highest non-empty level without removing it.
+        - top_level: Returns the highest non-empty level.
+        - level: Returns the level of a process.
+        - quantum: Returns the time quantum of a process.
+        - slice_start: Returns the time the current slice of the running process started.
+        - expire: Applies the rules to the running process and tells whether it must leave the CPU.
+        - next_boost_time: Returns the next boost time that can change a level.
+        - boost: Moves every process back to level 0.
+        - is_empty: Checks if the queue is empty.
+        - __len__: Returns the number of processes in the queue.
+    """
+
+    def __init__(self, quanta=(5, 10, 20), boost_period=100):
+        """
+        Initializes a MultilevelQueue instance.
+
+        Parameters:
+            - quanta (tuple): The time quantum of each level, from the highest level to the lowest.
+            - boost_period (int): The time between two boosts.
+        """
+
+        if not quanta or min(quanta) < 1:
+            raise ValueError("every level needs a time quantum of at least 1")
+        if boost_period < 1:
+            raise ValueError("the boost period must be at least 1")
+
+        self.quanta = tuple(quanta)
+        self.boost_period = boost_period
+        self.queues = [deque() for _ in self.quanta]
+        self.bitmap = 0
+        self.levels = {}
+        self.slices = {}
+        self.size = 0
+
+    def age(self, time):
+        """
+        Moves the queue to a given time, boosting every process if the time is a multiple of boost_period.
+
+        Parameters:
+            - time (int): The current time.
+        """
+
+        if time % self.boost_period == 0:
+            self.boost()
+
+    def append(self, process):
+        """
+        Adds a process at the back of its level.
+
+        Parameters:
+            - process (Process): The process.
+        """
+
+        level = self.levels.get(process, 0)
+        self.queues[level].append(process)
+        self.bitmap = self.bitmap | (1 << level)
+        self.size = self.size + 1
+
+    def pop(self):
+        """
+        Removes and returns the head of the highest non-empty level.
+
+        Returns:
+            The process.
+        """
+
+        level = self.top_level()
+        queue = self.queues[level]
+        process = queue.popleft()
+        if not queue:
+            self.bitmap = self.bitmap & ~(1 << level)
+        self.size = self.size - 1
+        return process
+
+    def peek(self):
+        """
+        Returns the head of the highest non-empty level without removing it.
+
+        Returns:
+            The process.
+        """
+        return self.queues[self.top_level()][0]
+
+    def top_level(self):
+        """
+        Returns the highest non-empty level: the lowest set bit of the bitmap.
+
+        Returns:
+            - int: The level.
+        """
+
+        if self.bitmap == 0:
+            raise IndexError("pop from an empty multilevel queue")
+        return (self.bitmap & -self.bitmap).bit_length() - 1
+
+    def level(self, process):
+        """
+        Returns the level of a process.
+
+        Parameters:
+            - process (Process): The process, queued or not.
+        """
+        return self.levels.get(process, 0)
+
+    def quantum(self, process):
+        """
+        Returns the time quantum of a process, the quantum of its level.
+
+        Parameters:
+            - process (Process): The process, queued or not.
+        """
+        return self.quanta[self.levels.get(process, 0)]
+
+    def slice_start(self, process):
+        """
+        Returns the time the current slice of the running process started: the time it got the CPU,
+        or the time it last used up a quantum if that is later.
+
+        Parameters:
+            - process (Process): The running process, with its start_time set to the time it got the CPU.
+        """
+        return max(process.start_time, self.slices.get(process, process.start_time))
+
+    def expire(self, time, process):
+        """
+        Applies the rules of the algorithm to the running process while the queue is not empty:
+        demotes it if it has used up a quantum, and tells whether it must leave the CPU.
+
+        Parameters:
+            - time (int): The current time.
+            - process (Process): The running process, with its start_time set to the time it got the CPU.
+
+        Returns:
+            - bool: True if the process must leave the CPU for the head of the queue.
+        """
+
+        level = self.levels.get(process, 0)
+        top = self.top_level()
+
+        # a process of a higher level preempts the running process, which keeps its level
+        if top < level:
+            return True
+
+        if (time - self.slice_start(process)) % self.quanta[level] != 0:
+            return False
+
+        # the process has used up a quantum: demote it, start its next slice, and let it go if a
+        # process of its new level is ready
+        self.slices[process] = time
+        level = min(level + 1, len(self.quanta) - 1)
+        if level > 0:
+            self.levels[process] = level
+        return top <= level
+
+    def next_boost_time(self, time):
+        """
+        Returns the first boost time after a given time, or None if no process is below level 0,
+        in which case boosting changes nothing.
+
+        Parameters:
+            - time (int): The time.
+        """
+
+        if not self.levels:
+            return None
+        return (time // self.boost_period + 1) * self.boost_period
+
+    def boost(self):
+        """
+        Moves every process back to level 0: the queued processes keep their order, from the highest
+        level to the lowest, and the running and waiting processes will come back at level 0.
+        """
+
+        self.levels.clear()
+        if self.bitmap & ~1:
+            top = self.queues[0]
+            for queue in self.queues[1:]:
+                top.extend(queue)
+                queue.clear()
+            self.bitmap = 1 if top else 0
+
+    def is_empty(self):
+        """
+        Checks if the queue is empty.
+
+        Returns:
+            True if the queue is empty, False otherwise.
+        """
+        return self.size == 0
+
+    def __len__(self):
+        """
+        Returns the number of processes in the queue.
+        """
+        return self.size
@@ -0,0 +1,405 @@
+import asyncio
+import heapq
+import math
+from collections import deque
+
+from EventEngine import *
+
+# The ways an online simulation can pace its clock against the wall clock
+PACINGS = ("fast", "realtime", "scaled")
+
+
+class OnlineSimulation:
+    """
+    An online simulation driven by asyncio: processes are submitted while the simulation runs,
+    and the Gantt chart segments and metrics are emitted as an async iterator.
+
+    The simulation runs an EventEngine over an OnlineArrivals source. It only handles the events
+    that no later submission can change, and waits for more submissions (or for the wall clock)
+    before going further:
+        - "fast" runs as fast as possible. Processes must be submitted in order of arrival time,
+          so every event before the arrival time of the last submitted process is final; once the
+          simulation is closed, it runs to the end.
+        - "realtime" runs one time unit per second of wall clock, and "scaled" runs speed time
+          units per second. A process submitted at simulation time x arrives at the next whole
+          time unit (or later, if its arrival_time says so), so every event up to the current
+          time is final.
+
+    Iterating over the simulation yields a dict per event, with the key "type":
+        - "segment": a Gantt chart segment, with the keys start, end and pid, as soon as it ends.
+        - "metrics": a snapshot of the live metrics (see snapshot()), every report_interval time
+          units and once more, with final set to True, when the simulation ends.
+
+    The simulation ends at the time limit, or once it is closed and every process has finished
+    for good (nothing pending, ready, running or waiting to come back). Submitted processes are
+    not kept once they are done with, so the whole workload is never held in memory.
+
+    Attributes:
+        - pacing (str): One of PACINGS.
+        - speed (float): The time units simulated per second of wall clock when paced.
+        - time_limit (int or float): The time limit of the simulation (infinity if none).
+        - report_interval (int): The simulation time between two metrics snapshots, or None.
+        - engine (EventEngine): The engine running the algorithm.
+        - arrivals (OnlineArrivals): The submitted processes that have not arrived yet.
+        - closed (bool): True once no more processes will be submitted.
+        - segments (deque): The Gantt chart segments not emitted yet.
+        - wakeup (asyncio.Event): Set when a process is submitted or the simulation is closed.
+        - started_at (float): The event loop time at which the simulation started running.
+        - next_report (int): The time of the next metrics snapshot.
+        - submitted (int): The number of processes submitted.
+        - started (int): The number of processes that have got the CPU at least once.
+        - response_total (int): The sum of the response times of the started processes.
+        - response_max (int): The largest response time of a started process.
+        - completions (int): The number of bursts finished.
+        - busy_time (int): The total time the CPU has spent running processes.
+
+    Methods:
+        - __init__: Initializes an OnlineSimulation of an algorithm.
+        - submit: Submits a process.
+        - put: Submits a process and lets the simulation catch up if many are pending.
+        - feed: Submits every process of a stream, then closes the simulation.
+        - close: Tells the simulation that no more processes will be submitted.
+        - __aiter__: Runs the simulation, yielding its segments and metrics snapshots.
+        - events: The async generator behind __aiter__.
+        - snapshot: Returns the live metrics at a given time.
+        - now: Returns the current simulation time of the wall clock.
+        - safe_time: Returns the last time whose events no submission can change.
+        - is_drained: Checks if the simulation is closed and every process has finished for good.
+        - record: Records a Gantt chart segment, as the gantt callback of the engine.
+        - start: Runs a process on the CPU, counting its response time the first time.
+    """
+
+    high_water = 1024
+
+    def __init__(self, algorithm, time_limit=None, pacing="fast", speed=1.0, report_interval=100,
+                 quanta=(5, 10, 20), boost_period=100, granularity=5):
+        """
+        Initializes an OnlineSimulation instance.
+
+        Parameters:
+            - algorithm (str): One of "FCFS", "SJF", "SRTF", "RR", "PP", "NPP", "MLFQ" or "CFS" (case-insensitive).
+            - time_limit (int): The time limit of the simulation, or None to run until it is closed and drained.
+            - pacing (str): One of PACINGS.
+            - speed (float): The time units simulated per second of wall clock with the "scaled" pacing.
+            - report_interval (int): The simulation time between two metrics snapshots, or None for the final one only.
+            - quanta, boost_period, granularity: As in EventEngine.
+        """
+
+        name = algorithm.upper()
+        if pacing not in PACINGS:
+            raise ValueError("unknown pacing: " + str(pacing))
+        if speed <= 0:
+            raise ValueError("the speed must be positive")
+
+        self.pacing = pacing
+        self.speed = 1.0 if pacing == "realtime" else speed
+        self.time_limit = time_limit if time_limit is not None else math.inf
+        self.report_interval = report_interval
+        self.arrivals = OnlineArrivals()
+        self.engine = EventEngine(None, "PP" if name == "NPP" else name, self.time_limit, name != "NPP",
+                                  gantt=self.record, quanta=quanta, boost_period=boost_period,
+                                  granularity=granularity, arrivals=self.arrivals)
+        # count response times when processes first get the CPU, like the instrumentation wraps phases
+        self.engine.start = self.start
+
+        self.closed = False
+        self.segments = deque()
+        self.wakeup = asyncio.Event()
+        self.started_at = None
+        self.next_report = report_interval if report_interval else None
+
+        self.submitted = 0
+        self.started = 0
+        self.response_total = 0
+        self.response_max = 0
+        self.completions = 0
+        self.busy_time = 0
+
+    def submit(self, process):
+        """
+        Submits a process.
+
+        With the "fast" pacing, the processes must be submitted in order of arrival time. When paced,
+        a process arrives at the next whole time unit, or at its arrival_time if that is later; its
+        arrival_time is updated accordingly.
+
+        Parameters:
+            - process (Process): The process.
+        """
+
+        if self.closed:
+            raise ValueError("cannot submit a process to a closed simulation")
+
+        if self.pacing == "fast":
+            last = self.arrivals.last_time
+            if last is not None and process.arrival_time < last:
+                raise ValueError("processes must be submitted in order of arrival time")
+        else:
+            process.arrival_time = max(process.arrival_time, math.floor(self.now()) + 1)
+
+        self.arrivals.append(process)
+        self.submitted = self.submitted + 1
+        self.wakeup.set()
+
+    async def put(self, process):
+        """
+        Submits a process, and lets the simulation run first if many processes are pending,
+        so a fast producer does not hold the event loop.
+
+        Parameters:
+            - process (Process): The process.
+        """
+
+        self.submit(process)
+        if len(self.arrivals) >= self.high_water:
+            await asyncio.sleep(0)
+
+    async def feed(self, source):
+        """
+        Submits every process of a stream, then closes the simulation.
+
+        Parameters:
+            - source: An async iterable or an iterable of processes.
+        """
+
+        try:
+            if hasattr(source, "__aiter__"):
+                async for process in source:
+                    await self.put(process)
+            else:
+                for process in source:
+                    await self.put(process)
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Tells the simulation that no more processes will be submitted.
+        """
+
+        self.closed = True
+        self.wakeup.set()
+
+    def __aiter__(self):
+        """
+        Runs the simulation, yielding its segments and metrics snapshots.
+        """
+        return self.events()
+
+    async def events(self):
+        """
+        Runs the simulation, yielding its Gantt chart segments and metrics snapshots as they happen.
+        """
+
+        engine = self.engine
+        limit = self.time_limit
+        loop = asyncio.get_running_loop()
+        self.started_at = loop.time()
+
+        while True:
+            # clear before looking at the state, so a submission made while waiting wakes the loop up
+            self.wakeup.clear()
+            safe = self.safe_time()
+            time = engine.next_event_time()
+
+            if self.is_drained() or (time >= limit and safe >= limit - 1):
+                break
+
+            reached = min(time, safe, limit)
+            if self.next_report is not None and reached >= self.next_report:
+                yield self.snapshot(self.next_report)
+                self.next_report = (int(reached) // self.report_interval + 1) * self.report_interval
+
+            if time <= safe and time < limit:
+                engine.step(time)
+                while self.segments:
+                    yield self.segments.popleft()
+                continue
+
+            # wait for a submission, or when paced for the wall clock to reach the next event or snapshot
+            timeout = None
+            if self.pacing != "fast":
+                deadline = min(time, limit - 1)
+                if self.next_report is not None:
+                    deadline = min(deadline, self.next_report)
+                if deadline != math.inf:
+                    timeout = max(deadline - self.now(), 0) / self.speed
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        if limit != math.inf and not self.is_drained():
+            engine.end()
+        while self.segments:
+            yield self.segments.popleft()
+
+        snapshot = self.snapshot(min(limit, engine.time) if self.is_drained() else limit)
+        snapshot["final"] = True
+        yield snapshot
+
+    def snapshot(self, time):
+        """
+        Returns the live metrics at a given time.
+
+        Parameters:
+            - time (int): The simulation time of the snapshot.
+
+        Returns:
+            - dict: With the keys type ("metrics"), time, final (False), submitted, pending (not arrived yet),
+                ready, running (the number of the running process, or None), waiting (to come back),
+                backlog (ready plus running), started, completions, average_response_time and
+                max_response_time (over the started processes, None before any), throughput
+                (completions per time unit) and cpu_utilisation (busy fraction of the time so far).
+        """
+
+        engine = self.engine
+        running = engine.running_process
+        return {"type": "metrics",
+                "time": time,
+                "final": False,
+                "submitted": self.submitted,
+                "pending": len(self.arrivals),
+                "ready": len(engine.ready_queue),
+                "running": running.number if running is not None else None,
+                "waiting": len(engine.waiting_queue),
+                "backlog": len(engine.ready_queue) + (running is not None),
+                "started": self.started,
+                "completions": self.completions,
+                "average_response_time": self.response_total / self.started if self.started else None,
+                "max_response_time": self.response_max if self.started else None,
+                "throughput": self.completions / time if time else None,
+                "cpu_utilisation": self.busy_time / time if time else None}
+
+    def now(self):
+        """
+        Returns the current simulation time of the wall clock when paced (0 before the simulation starts).
+        """
+
+        if self.started_at is None:
+            return 0.0
+        return (asyncio.get_running_loop().time() - self.started_at) * self.speed
+
+    def safe_time(self):
+        """
+        Returns the last time whose events no submission can change.
+        """
+
+        if self.pacing != "fast":
+            return math.floor(self.now())
+        if self.closed:
+            return math.inf
+        if self.arrivals.last_time is None:
+            return -1
+        # more processes may still arrive at the time of the last one submitted
+        return self.arrivals.last_time - 1
+
+    def is_drained(self):
+        """
+        Checks if the simulation is closed and every process has finished for good.
+        """
+
+        engine = self.engine
+        return (self.closed and self.arrivals.is_empty() and engine.running_process is None
+                and not engine.ready_queue and engine.waiting_queue.is_empty())
+
+    def record(self, time, process):
+        """
+        Records a Gantt chart segment, as the gantt callback of the engine.
+
+        Parameters:
+            - time (int): The time at which the process leaves the CPU.
+            - process (Process): The process.
+        """
+
+        self.busy_time = self.busy_time + (time - process.start_time)
+        if process.remaining_time == 0:
+            self.completions = self.completions + 1
+        self.segments.append({"type": "segment", "start": process.start_time, "end": time, "pid": process.number})
+
+    def start(self, time, process):
+        """
+        Runs a process on the CPU, counting its response time the first time it gets the CPU.
+
+        Parameters:
+            - time (int): The current time.
+            - process (Process): The process.
+        """
+
+        if not process.has_executed:
+            response = time - process.arrival_time
+            self.started = self.started + 1
+            self.response_total = self.response_total + response
+            if response > self.response_max:
+                self.response_max = response
+        EventEngine.start(self.engine, time, process)
+
+
+class OnlineArrivals:
+    """
+    The submitted processes of an online simulation that have not arrived yet, with the same
+    methods as ArrivalIndex. Processes arriving at the same time arrive in the order they were submitted.
+
+    Attributes:
+        - heap (list): A heap of (arrival time, sequence, process).
+        - sequence (int): The sequence number given to the next process submitted.
+        - last_time (int): The arrival time of the last process submitted, or None.
+
+    Methods:
+        - append: Adds a submitted process.
+        - next_time: Returns the arrival time of the next process to arrive.
+        - pop_arrivals: Removes and returns the processes arriving at a given time.
+        - is_empty: Checks if every submitted process has arrived.
+        - __len__: Returns the number of processes that have not arrived yet.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.sequence = 0
+        self.last_time = None
+
+    def append(self, process):
+        """
+        Adds a submitted process.
+
+        Parameters:
+            - process (Process): The process.
+        """
+
+        heapq.heappush(self.heap, (process.arrival_time, self.sequence, process))
+        self.sequence = self.sequence + 1
+        self.last_time = process.arrival_time
+
+    def next_time(self):
+        """
+        Returns the arrival time of the next process to arrive, or None if every process has arrived.
+        """
+
+        if not self.heap:
+            return None
+        return self.heap[0][0]
+
+    def pop_arrivals(self, time):
+        """
+        Removes and returns the processes arriving at or before a given time.
+
+        Parameters:
+            - time (int): The current time.
+        """
+
+        arrived = []
+        while self.heap and self.heap[0][0] <= time:
+            arrived.append(heapq.heappop(self.heap)[2])
+        return arrived
+
+    def is_empty(self):
+        """
+        Checks if every submitted process has arrived.
+        """
+        return not self.heap
+
+    def __len__(self):
+        """
+        Returns the number of processes that have not arrived yet.
+        """
+        return len(self.heap)
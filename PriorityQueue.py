@@ -5,11 +5,17 @@ class PriorityQueue:
     """
     A priority queue implementation with support for custom ordering.
 
+    Each heap entry ends with a sequence number and the item, so items with equal priorities come
+    out in the order they were added and items themselves are never compared. For the orderings
+    of the SJF and SRTF ready queues, BurstTimeQueue and RemainingTimeQueue avoid the calls to the
+    priority functions.
+
     Attributes:
         - use_priority_func2 (bool): Indicates whether the priority queue uses two priority functions.
         - heap (list): The underlying heap data structure.
         - priority_func (function): The primary priority function used for ordering.
         - priority_func2 (function): The secondary priority function used for ordering if provided.
+        - sequence (int): The sequence number given to the next item added to the priority queue.
 
     Methods:
         - __init__: Initializes a PriorityQueue instance with specified priority functions.
@@ -20,6 +26,7 @@ class PriorityQueue:
         - heapify: Creates a heap from the provided list based on custom ordering.
         - copy_heap_to_list: Creates a copy of the priority queue's heap in the form of a list.
         - is_empty: Checks if the priority queue is empty.
+        - __len__: Returns the number of items in the priority queue.
         """
 
     use_priority_func2 = False
@@ -37,6 +44,7 @@ class PriorityQueue:
         self.priority_func = priority_func
         self.priority_func2 = priority_func2
         self.use_priority_func2 = priority_func2 is not None
+        self.sequence = 0
 
     def append(self, item):
         """
@@ -48,10 +56,11 @@ class PriorityQueue:
 
         # if 2 custom orderings are provided:
         if self.use_priority_func2:
-            heapq.heappush(self.heap, (self.priority_func(item), self.priority_func2(item), item))
+            heapq.heappush(self.heap, (self.priority_func(item), self.priority_func2(item), self.sequence, item))
         # if 1 custom ordering is provided
         else:
-            heapq.heappush(self.heap, (self.priority_func(item), item))
+            heapq.heappush(self.heap, (self.priority_func(item), self.sequence, item))
+        self.sequence = self.sequence + 1
 
     def pop(self):
         """
@@ -65,19 +74,9 @@ class PriorityQueue:
         if self.is_empty():
             raise IndexError("pop from an empty priority queue")
 
-        # if 2 custom orderings are used
-        if self.use_priority_func2:
-            # heappop returns a tuple that contains the custom ordering values and
-            # the item, so we ignore the custom ordering values and only take the item
-            _, _, item = heapq.heappop(self.heap)
-            return item
-
-        # if 1 custom ordering1 is used
-        else:
-            # heappop returns a tuple that contains the custom ordering values and
-            # the item, so we ignore the custom ordering values and only take the item
-            _, item = heapq.heappop(self.heap)
-            return item
+        # heappop returns a tuple that contains the custom ordering values, the sequence
+        # number and the item, so we ignore everything but the item
+        return heapq.heappop(self.heap)[-1]
 
     def peek(self):
         """
@@ -91,33 +90,20 @@ class PriorityQueue:
         if self.is_empty():
             raise IndexError("pop from an empty priority queue")
 
-        # if 2 custom orderings are used
-        if self.use_priority_func2:
-            # heappop returns a tuple that contains the custom ordering values and
-            # the item, so we ignore the custom ordering values and only take the item
-            _, _, item = self.heap[0]
-            return item
-        else:
-            # heappop returns a tuple that contains the custom ordering values and
-            # the item, so we ignore the custom ordering values and only take the item
-            _, item = self.heap[0]
-            return item
+        # the entry contains the custom ordering values, the sequence number and the item
+        return self.heap[0][-1]
 
     def remove(self, item):
         """
-        Removes a specific item from the priority queue.
+        Removes a specific item from the priority queue, in O(n) (see remove_entry).
 
         Parameters:
             - item: The item to be removed from the priority queue.
         """
 
-        # if 2 custom orderings are used
-        if self.use_priority_func2:
-            self.heap.remove((self.priority_func(item), self.priority_func2(item), item))
-
-        # if 1 custom ordering1 is used
-        else:
-            self.heap.remove((self.priority_func(item), item))
+        # look the item up by identity rather than by rebuilding its key tuple, since
+        # its priority may have changed since it was added
+        remove_entry(self.heap, item)
 
     def heapify(self, list1):
         """
@@ -132,10 +118,13 @@ class PriorityQueue:
 
         # if 2 custom orderings are used
         if self.use_priority_func2:
-            self.heap = [(self.priority_func(process), self.priority_func2(process), process) for process in list1]
+            self.heap = [(self.priority_func(process), self.priority_func2(process), self.sequence + index, process)
+                         for index, process in enumerate(list1)]
         # if 1 custom ordering1 is used
         else:
-            self.heap = [(self.priority_func(process), process) for process in list1]
+            self.heap = [(self.priority_func(process), self.sequence + index, process)
+                         for index, process in enumerate(list1)]
+        self.sequence = self.sequence + len(self.heap)
 
         # heapify the list created to be in the desired ordering
         heapq.heapify(self.heap)
@@ -147,12 +136,203 @@ class PriorityQueue:
         Returns:
             A list containing the items from the priority queue's heap.
         """
-        if self.use_priority_func2:
-            list_heap = [process[2] for process in self.heap]
-        else:
-            list_heap = [process[1] for process in self.heap]
+        return [entry[-1] for entry in self.heap]
+
+    def is_empty(self):
+        """
+        Checks if the priority queue is empty.
+
+        Returns:
+            True if the priority queue is empty, False otherwise.
+        """
+        return len(self.heap) == 0
+
+    def __len__(self):
+        """
+        Returns the number of items in the priority queue.
+        """
+        return len(self.heap)
+
+
+class IndexedPriorityQueue:
+    """
+    An addressable priority queue with support for custom ordering.
+
+    Every item added to the queue gets a handle that tracks its position in the heap, so a single
+    item can be removed or re-prioritised in O(log n) instead of searching the heap and rebuilding
+    it. Items with equal priorities come out in the order they were added, so items themselves are
+    never compared.
+
+    FairQueue (CFS) keeps its ready processes in one, for the handle-based remove, and is the only
+    scheduler with O(log n) removal: the remove of PriorityQueue, BurstTimeQueue and
+    RemainingTimeQueue stays O(n), and no scheduler calls it. No scheduler calls update or
+    decrease_key either: PP aging lowers every queued priority at once, which AgingQueue does
+    lazily, and SRTF never changes the key of a queued process.
+
+    Attributes:
+        - use_priority_func2 (bool): Indicates whether the priority queue uses two priority functions.
+        - heap (list): The underlying heap of handles. A handle is a list [key, item, position],
+            where key is the tuple of priority values followed by a sequence number.
+        - priority_func (function): The primary priority function used for ordering.
+        - priority_func2 (function): The secondary priority function used for ordering if provided.
+        - sequence (int): The sequence number given to the next item added to the queue.
+
+    Methods:
+        - __init__: Initializes an IndexedPriorityQueue instance with specified priority functions.
+        - append: Adds an item to the priority queue and returns its handle.
+        - pop: Removes and returns the item with the highest priority from the priority queue.
+        - peek: Returns the item with the highest priority without removing it from the priority queue.
+        - remove: Removes the item of a handle from the priority queue.
+        - update: Moves the item of a handle to its place after its priority has changed.
+        - decrease_key: Moves the item of a handle up after its priority has decreased.
+        - heapify: Creates a heap from the provided list based on custom ordering.
+        - copy_heap_to_list: Creates a copy of the priority queue's items in the form of a list.
+        - is_empty: Checks if the priority queue is empty.
+        - __len__: Returns the number of items in the priority queue.
+    """
+
+    use_priority_func2 = False
+
+    def __init__(self, priority_func, priority_func2=None):
+        """
+        Initializes an IndexedPriorityQueue instance.
+
+        Parameters:
+            - priority_func (function): The primary priority function used for ordering.
+            - priority_func2 (function): The secondary priority function used for ordering if provided.
+        """
+
+        self.heap = []
+        self.priority_func = priority_func
+        self.priority_func2 = priority_func2
+        self.use_priority_func2 = priority_func2 is not None
+        self.sequence = 0
+
+    def append(self, item):
+        """
+        Adds an item to the priority queue with its priority determined by the specified functions.
+
+        Parameters:
+            - item: The item to be added to the priority queue.
+
+        Returns:
+            The handle of the item, to be passed to remove, update or decrease_key.
+        """
+
+        handle = [self.key(item), item, len(self.heap)]
+        self.sequence = self.sequence + 1
+        self.heap.append(handle)
+        self.sift_up(handle[2])
+        return handle
+
+    def pop(self):
+        """
+        Removes and returns the item with the highest priority from the priority queue.
+
+        Returns:
+        The item with the highest priority.
+        """
+
+        # raise an exception if the heap is empty
+        if self.is_empty():
+            raise IndexError("pop from an empty priority queue")
+
+        handle = self.heap[0]
+        self.remove(handle)
+        return handle[1]
+
+    def peek(self):
+        """
+        Returns the item with the highest priority without removing it from the priority queue.
+
+        Returns:
+        The item with the highest priority.
+        """
+
+        # raise an exception if the heap is empty
+        if self.is_empty():
+            raise IndexError("pop from an empty priority queue")
+
+        return self.heap[0][1]
+
+    def remove(self, handle):
+        """
+        Removes the item of a handle from the priority queue.
+
+        Parameters:
+            - handle: The handle returned by append.
+        """
+
+        position = handle[2]
+        if position < 0 or position >= len(self.heap) or self.heap[position] is not handle:
+            raise ValueError("handle not in priority queue")
+
+        # replace the handle with the last one, then move that one up or down to its place
+        last = self.heap.pop()
+        if last is not handle:
+            self.heap[position] = last
+            last[2] = position
+            self.sift_down(position)
+            self.sift_up(last[2])
+        handle[2] = -1
+
+    def update(self, handle):
+        """
+        Moves the item of a handle to its place after its priority has changed.
+
+        Parameters:
+            - handle: The handle returned by append.
+        """
+
+        # keep the sequence number so the item keeps its place among equal priorities
+        handle[0] = self.key(handle[1], handle[0][-1])
+        self.sift_down(handle[2])
+        self.sift_up(handle[2])
+
+    def decrease_key(self, handle):
+        """
+        Moves the item of a handle up after its priority has decreased.
+
+        Parameters:
+            - handle: The handle returned by append.
+        """
+
+        key = self.key(handle[1], handle[0][-1])
+        if key > handle[0]:
+            raise ValueError("decrease_key cannot increase the priority values of an item")
+
+        handle[0] = key
+        self.sift_up(handle[2])
+
+    def heapify(self, list1):
+        """
+        Creates a heap from the provided list based on custom ordering.
+
+        Parameters:
+            - list1 (list): The list to be converted into a heap.
+
+        Returns:
+            A list of the handles of the items, in the order of list1.
+        """
 
-        return list_heap
+        handles = []
+        for position, item in enumerate(list1):
+            handles.append([self.key(item), item, position])
+            self.sequence = self.sequence + 1
+        self.heap = list(handles)
+
+        for position in reversed(range(len(self.heap) // 2)):
+            self.sift_down(position)
+        return handles
+
+    def copy_heap_to_list(self):
+        """
+        Creates a copy of the priority queue's items in the form of a list.
+
+        Returns:
+            A list containing the items from the priority queue's heap.
+        """
+        return [handle[1] for handle in self.heap]
 
     def is_empty(self):
         """
@@ -162,3 +342,261 @@ class PriorityQueue:
             True if the priority queue is empty, False otherwise.
         """
         return len(self.heap) == 0
+
+    def __len__(self):
+        """
+        Returns the number of items in the priority queue.
+        """
+        return len(self.heap)
+
+    def key(self, item, sequence=None):
+        """
+        Returns the sort key of an item: its priority values followed by a sequence number.
+
+        Parameters:
+            - item: The item.
+            - sequence (int): The sequence number to use, or None to use the next one.
+        """
+
+        if sequence is None:
+            sequence = self.sequence
+
+        if self.use_priority_func2:
+            return self.priority_func(item), self.priority_func2(item), sequence
+        return self.priority_func(item), sequence
+
+    def sift_up(self, position):
+        """
+        Moves the handle at a position up until its parent has a smaller key.
+
+        Parameters:
+            - position (int): The position of the handle in the heap.
+        """
+
+        heap = self.heap
+        handle = heap[position]
+        while position > 0:
+            parent_position = (position - 1) >> 1
+            parent = heap[parent_position]
+            if handle[0] >= parent[0]:
+                break
+            heap[position] = parent
+            parent[2] = position
+            position = parent_position
+        heap[position] = handle
+        handle[2] = position
+
+    def sift_down(self, position):
+        """
+        Moves the handle at a position down until its children have larger keys.
+
+        Parameters:
+            - position (int): The position of the handle in the heap.
+        """
+
+        heap = self.heap
+        size = len(heap)
+        handle = heap[position]
+        child_position = 2 * position + 1
+        while child_position < size:
+            right_position = child_position + 1
+            if right_position < size and heap[right_position][0] < heap[child_position][0]:
+                child_position = right_position
+            child = heap[child_position]
+            if handle[0] <= child[0]:
+                break
+            heap[position] = child
+            child[2] = position
+            position = child_position
+            child_position = 2 * position + 1
+        heap[position] = handle
+        handle[2] = position
+
+
+class KeyedQueue:
+    """
+    A min-heap of processes ordered by a key read from each process, and then by the order they
+    were added: the base of the SJF and SRTF ready queues, which only differ by their key.
+
+    Unlike PriorityQueue, the key is read from the process directly instead of through priority
+    functions, and each heap entry (key values..., sequence, process) carries a sequence number that
+    is never repeated, so full ties come out first in, first out and processes are never compared.
+    Each subclass builds its entries in its own append and heapify, so a push costs no call beyond
+    heappush; the base class holds the operations that do not depend on the key.
+
+    Attributes:
+        - heap (list): The heap of (key values..., sequence, process) entries.
+        - sequence (int): The sequence number given to the next process added to the queue.
+
+    Methods:
+        - __init__: Initializes an empty queue.
+        - pop: Removes and returns the process with the smallest key.
+        - peek: Returns the process with the smallest key without removing it.
+        - remove: Removes a specific process from the queue.
+        - copy_heap_to_list: Creates a copy of the queue's heap in the form of a list.
+        - is_empty: Checks if the queue is empty.
+        - __len__: Returns the number of processes in the queue.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty queue.
+        """
+
+        self.heap = []
+        self.sequence = 0
+
+    def pop(self):
+        """
+        Removes and returns the process with the smallest key.
+
+        Returns:
+            The process.
+        """
+
+        # raise an exception if the heap is empty
+        if not self.heap:
+            raise IndexError("pop from an empty priority queue")
+        return heapq.heappop(self.heap)[-1]
+
+    def peek(self):
+        """
+        Returns the process with the smallest key without removing it.
+
+        Returns:
+            The process.
+        """
+
+        # raise an exception if the heap is empty
+        if not self.heap:
+            raise IndexError("pop from an empty priority queue")
+        return self.heap[0][-1]
+
+    def remove(self, process):
+        """
+        Removes a specific process from the queue, in O(n) (see remove_entry).
+
+        Parameters:
+            - process (Process): The process.
+        """
+        remove_entry(self.heap, process)
+
+    def copy_heap_to_list(self):
+        """
+        Creates a copy of the queue's heap in the form of a list.
+
+        Returns:
+            A list containing the processes from the queue's heap.
+        """
+        return [entry[-1] for entry in self.heap]
+
+    def is_empty(self):
+        """
+        Checks if the queue is empty.
+
+        Returns:
+            True if the queue is empty, False otherwise.
+        """
+        return not self.heap
+
+    def __len__(self):
+        """
+        Returns the number of processes in the queue.
+        """
+        return len(self.heap)
+
+
+class BurstTimeQueue(KeyedQueue):
+    """
+    The ready queue of the shortest job first (SJF) algorithm: a KeyedQueue of processes ordered
+    by burst time, and then by the order they were added.
+
+    Methods:
+        - append: Adds a process to the queue.
+        - heapify: Creates a heap from the provided list of processes.
+    """
+
+    def append(self, process):
+        """
+        Adds a process to the queue.
+
+        Parameters:
+            - process (Process): The process.
+        """
+
+        heapq.heappush(self.heap, (process.burst_time, self.sequence, process))
+        self.sequence = self.sequence + 1
+
+    def heapify(self, list1):
+        """
+        Creates a heap from the provided list of processes, which keep their order among equal burst times.
+
+        Parameters:
+            - list1 (list): The list of processes.
+        """
+
+        self.heap = [(process.burst_time, self.sequence + index, process) for index, process in enumerate(list1)]
+        self.sequence = self.sequence + len(self.heap)
+        heapq.heapify(self.heap)
+
+
+class RemainingTimeQueue(KeyedQueue):
+    """
+    The ready queue of the shortest remaining time first (SRTF) algorithm: a KeyedQueue of
+    processes ordered by remaining time, then by the time they entered the ready queue, and then
+    by the order they were added.
+
+    Methods:
+        - append: Adds a process to the queue.
+        - heapify: Creates a heap from the provided list of processes.
+    """
+
+    def append(self, process):
+        """
+        Adds a process to the queue.
+
+        Parameters:
+            - process (Process): The process, with its ready_queue_time set.
+        """
+
+        heapq.heappush(self.heap, (process.remaining_time, process.ready_queue_time, self.sequence, process))
+        self.sequence = self.sequence + 1
+
+    def heapify(self, list1):
+        """
+        Creates a heap from the provided list of processes, which keep their order among full ties.
+
+        Parameters:
+            - list1 (list): The list of processes.
+        """
+
+        self.heap = [(process.remaining_time, process.ready_queue_time, self.sequence + index, process)
+                     for index, process in enumerate(list1)]
+        self.sequence = self.sequence + len(self.heap)
+        heapq.heapify(self.heap)
+
+
+def remove_entry(heap, item):
+    """
+    Removes the entry of an item from a heap of tuples ending with the item, and restores the heap ordering.
+
+    The item is found by a linear scan and the heap is rebuilt, so a removal costs O(n). No scheduler
+    removes a process from the middle of these queues; the O(log n) removal of IndexedPriorityQueue
+    only serves CFS, whose FairQueue removes processes by handle.
+
+    Parameters:
+        - heap (list): The heap.
+        - item: The item, looked up by identity.
+    """
+
+    for index, entry in enumerate(heap):
+        if entry[-1] is item:
+            break
+    else:
+        raise ValueError("item not in priority queue")
+
+    # replace the entry with the last one and restore the heap ordering
+    last = heap.pop()
+    if index < len(heap):
+        heap[index] = last
+        heapq.heapify(heap)
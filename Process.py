@@ -16,6 +16,10 @@ class Process:
         - start_time (int): The time at which the process starts execution.
         - cpu_turn_time (int): The time that that process exits the CPU. At the end of the loop, it
             would indicate the time at which it exits the CPU.
+        - first_start_time (int): The time at which the process first got the CPU.
+        - completions (int): The number of bursts the process has finished.
+        - cpu_time (int): The total time the process has spent on the CPU.
+        - vruntime (int): The virtual runtime of the process: its time on the CPU weighted by its priority (CFS).
 
     Methods:
         - __init__: Initializes a Process instance with specified attributes (Class constructor).
@@ -25,12 +29,11 @@ class Process:
         - print_calculations_time: Static method to print average waiting time and average turnaround time for a list of processes.
     """
 
-    finish_time = 0
-    waiting_time = 0
-    ready_queue_time = 0
-    has_executed = False
-    start_time = 0
-    cpu_turn_time = 0
+    # a fixed set of attributes keeps each instance free of a __dict__, which dominates
+    # the memory of a workload with millions of processes
+    __slots__ = ("number", "arrival_time", "burst_time", "come_back", "priority", "remaining_time",
+                 "finish_time", "waiting_time", "ready_queue_time", "has_executed", "start_time", "cpu_turn_time",
+                 "first_start_time", "completions", "cpu_time", "vruntime")
 
     def __init__(self, number, arrival_time, burst_time, come_back, priority):
         self.number = number
@@ -39,6 +42,16 @@ class Process:
         self.come_back = come_back
         self.priority = priority
         self.remaining_time = burst_time
+        self.finish_time = 0
+        self.waiting_time = 0
+        self.ready_queue_time = 0
+        self.has_executed = False
+        self.start_time = 0
+        self.cpu_turn_time = 0
+        self.first_start_time = 0
+        self.completions = 0
+        self.cpu_time = 0
+        self.vruntime = 0
 
     def decrease_remaining(self):
         """
@@ -69,21 +82,21 @@ class Process:
         """
         Static method to print average waiting
         time and average turnaround time for a list of processes.
+        Use Metrics.calculate_metrics to get these and other metrics as numbers.
 
         Parameters:
         - processes (list): A list of Process instances.
         """
 
-        # Shorthand for a loop that creates a list containing all processes that are executed
-        # then computing the number of such processes in the list
-        number_executed = len([process for process in processes if process.has_executed])
+        from Metrics import calculate_metrics
 
-        # compute the sum of the waiting time of all processes that are executed at least once
-        sum_waiting_time = sum(process.waiting_time for process in processes if process.has_executed)
+        metrics = calculate_metrics(processes)
 
-        # # compute the sum of the turnaround time of all processes that are executed at least once
-        sum_turnaroud_time = sum([(process.cpu_turn_time - process.arrival_time) for process in processes if process.has_executed])
+        # nothing to average if no process has executed
+        if metrics["executed"] == 0:
+            print("No process has executed.")
+            return
 
         # print the average waiting time and turnaround time
-        print("Average waiting time is: " + str(sum_waiting_time/number_executed))
-        print("Average turnaround time is: " + str(sum_turnaroud_time/number_executed))
+        print("Average waiting time is: " + str(metrics["average_waiting_time"]))
+        print("Average turnaround time is: " + str(metrics["average_turnaround_time"]))
@@ -0,0 +1,249 @@
+from array import array
+
+from Process import *
+
+
+class ProcessTable:
+    """
+    A compact, array-backed table of processes (one array per attribute).
+
+    Each attribute of every process is stored in a typed array, so a process costs 97 bytes instead of
+    a Python object holding one int object per attribute. The times are 64-bit, since they grow with
+    the time limit; the number, priority and completion count, and the burst, comeback and remaining
+    times (which never exceed a burst or a comeback) are 32-bit, and has_executed is 8-bit. The table behaves like a list of
+    processes: indexing it returns a ProcessView, which has the same attributes and methods as Process
+    but reads and writes the arrays, so the scheduling algorithms run on a table unchanged.
+
+    Attributes:
+        - columns (tuple): The names of the attributes stored by the table, one array each.
+        - typecodes (dict): Maps each column to the typecode of its array.
+        - number, arrival_time, burst_time, come_back, priority, remaining_time, finish_time,
+            waiting_time, ready_queue_time, has_executed, start_time, cpu_turn_time, first_start_time,
+            completions, cpu_time, vruntime (array):
+            The attributes of the processes, indexed by row.
+        - rows (dict): Maps a process number to its row, built on first use by process().
+
+    Methods:
+        - __init__: Initializes a ProcessTable from the workload attributes of the processes.
+        - zeros: Static method to return a column of zeros.
+        - from_processes: Static method to create a ProcessTable from a list of Process instances.
+        - process: Returns the view of the process with a given number.
+        - as_numpy: Returns a column as a NumPy array sharing the table's memory.
+        - __getitem__: Returns the view of the process at a given row.
+        - __len__: Returns the number of processes in the table.
+        - __iter__: Iterates over the views of the processes, in row order.
+    """
+
+    columns = ("number", "arrival_time", "burst_time", "come_back", "priority", "remaining_time",
+               "finish_time", "waiting_time", "ready_queue_time", "has_executed", "start_time", "cpu_turn_time",
+               "first_start_time", "completions", "cpu_time", "vruntime")
+
+    typecodes = {"number": "i", "arrival_time": "q", "burst_time": "i", "come_back": "i", "priority": "i",
+                 "remaining_time": "i", "finish_time": "q", "waiting_time": "q", "ready_queue_time": "q",
+                 "has_executed": "b", "start_time": "q", "cpu_turn_time": "q", "first_start_time": "q",
+                 "completions": "i", "cpu_time": "q", "vruntime": "q"}
+
+    def __init__(self, numbers, arrival_times, burst_times, come_backs, priorities):
+        """
+        Initializes a ProcessTable instance.
+
+        Parameters:
+            - numbers (iterable): The unique identifiers of the processes.
+            - arrival_times (iterable): The arrival times of the processes.
+            - burst_times (iterable): The CPU burst times of the processes.
+            - come_backs (iterable): The comeback times of the processes.
+            - priorities (iterable): The priority levels of the processes.
+        """
+
+        self.number = array("i", numbers)
+        self.arrival_time = array("q", arrival_times)
+        self.burst_time = array("i", burst_times)
+        self.come_back = array("i", come_backs)
+        self.priority = array("i", priorities)
+
+        size = len(self.number)
+        if not (len(self.arrival_time) == len(self.burst_time) == len(self.come_back) == len(self.priority) == size):
+            raise ValueError("all process attributes must have the same length")
+
+        # the simulation state starts out like a new Process
+        self.remaining_time = array("i", self.burst_time)
+        for name in ProcessTable.columns[6:]:
+            setattr(self, name, ProcessTable.zeros(name, size))
+        self.rows = None
+
+    @staticmethod
+    def zeros(name, size):
+        """
+        Static method to return a column of zeros.
+
+        Parameters:
+            - name (str): The name of the column, one of columns.
+            - size (int): The number of processes.
+
+        Returns:
+            - array: The column.
+        """
+
+        typecode = ProcessTable.typecodes[name]
+        return array(typecode, bytes(array(typecode).itemsize * size))
+
+    @staticmethod
+    def from_processes(processes):
+        """
+        Static method to create a ProcessTable from a list of Process instances,
+        copying their current state.
+
+        Parameters:
+            - processes (list): A list of Process instances.
+
+        Returns:
+            - ProcessTable: The table.
+        """
+
+        table = ProcessTable([process.number for process in processes],
+                             [process.arrival_time for process in processes],
+                             [process.burst_time for process in processes],
+                             [process.come_back for process in processes],
+                             [process.priority for process in processes])
+        for name in ProcessTable.columns[5:]:
+            setattr(table, name, array(getattr(table, name).typecode, (getattr(process, name) for process in processes)))
+        return table
+
+    def process(self, number):
+        """
+        Returns the view of the process with a given number.
+
+        Parameters:
+            - number (int): The unique identifier of the process.
+
+        Returns:
+            - ProcessView: The view of the process.
+        """
+
+        if self.rows is None:
+            self.rows = {number: row for row, number in enumerate(self.number)}
+        return ProcessView(self, self.rows[number])
+
+    def as_numpy(self, name):
+        """
+        Returns a column as a NumPy array sharing the table's memory, so writes go both ways.
+
+        Parameters:
+            - name (str): The name of the column, one of columns.
+
+        Returns:
+            - numpy.ndarray: The column.
+        """
+
+        import numpy
+
+        column = getattr(self, name)
+        return numpy.frombuffer(column, dtype=numpy.dtype(column.typecode))
+
+    def __getitem__(self, row):
+        """
+        Returns the view of the process at a given row.
+
+        Parameters:
+            - row (int): The row of the process (negative rows count from the end).
+        """
+
+        size = len(self.number)
+        if row < 0:
+            row = row + size
+        if row < 0 or row >= size:
+            raise IndexError("process table index out of range")
+        return ProcessView(self, row)
+
+    def __len__(self):
+        """
+        Returns the number of processes in the table.
+        """
+        return len(self.number)
+
+    def __iter__(self):
+        """
+        Iterates over the views of the processes, in row order.
+        """
+        for row in range(len(self.number)):
+            yield ProcessView(self, row)
+
+
+def column_property(name, to_value=None):
+    """
+    Creates a property that reads and writes one column of the table of a ProcessView.
+
+    Parameters:
+        - name (str): The name of the column.
+        - to_value (function): Converts the stored number to the attribute value, if provided.
+    """
+
+    def get_value(view):
+        if to_value is None:
+            return getattr(view.table, name)[view.index]
+        return to_value(getattr(view.table, name)[view.index])
+
+    def set_value(view, value):
+        getattr(view.table, name)[view.index] = value
+
+    return property(get_value, set_value)
+
+
+class ProcessView:
+    """
+    A view of one row of a ProcessTable with the attributes and methods of Process.
+
+    Attributes:
+        - table (ProcessTable): The table holding the process.
+        - index (int): The row of the process in the table.
+        - number, arrival_time, burst_time, come_back, priority, remaining_time, finish_time,
+            waiting_time, ready_queue_time, has_executed, start_time, cpu_turn_time, first_start_time,
+            completions, cpu_time, vruntime:
+            The attributes of Process, stored in the table.
+
+    Methods:
+        - __init__: Initializes a view of a row of a table.
+        - decrease_remaining, decrease_priority, __str__: As in Process.
+        - __eq__, __hash__: Views of the same row of the same table are equal.
+    """
+
+    __slots__ = ("table", "index")
+
+    number = column_property("number")
+    arrival_time = column_property("arrival_time")
+    burst_time = column_property("burst_time")
+    come_back = column_property("come_back")
+    priority = column_property("priority")
+    remaining_time = column_property("remaining_time")
+    finish_time = column_property("finish_time")
+    waiting_time = column_property("waiting_time")
+    ready_queue_time = column_property("ready_queue_time")
+    has_executed = column_property("has_executed", bool)
+    start_time = column_property("start_time")
+    cpu_turn_time = column_property("cpu_turn_time")
+    first_start_time = column_property("first_start_time")
+    completions = column_property("completions")
+    cpu_time = column_property("cpu_time")
+    vruntime = column_property("vruntime")
+
+    decrease_remaining = Process.decrease_remaining
+    decrease_priority = Process.decrease_priority
+    __str__ = Process.__str__
+
+    def __init__(self, table, index):
+        """
+        Initializes a ProcessView instance.
+
+        Parameters:
+            - table (ProcessTable): The table holding the process.
+            - index (int): The row of the process in the table.
+        """
+
+        self.table = table
+        self.index = index
+
+    def __eq__(self, other):
+        return isinstance(other, ProcessView) and self.table is other.table and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.table), self.index))
@@ -0,0 +1,239 @@
+import copy
+import hashlib
+import os
+import pickle
+import sys
+from array import array
+from collections import OrderedDict
+from operator import attrgetter
+
+from ProcessTable import *
+from Workload import *
+
+# Part of every key, so results stored by an older version of the simulation are never returned
+CACHE_VERSION = 3
+
+# The immutable fields of a process, which make up the workload part of a key
+KEY_FIELDS = ("number", "arrival_time", "burst_time", "come_back", "priority")
+
+
+class ResultCache:
+    """
+    A content-addressed cache of simulation results, keyed by a stable hash of the workload, the
+    algorithm, its parameters and the time limit.
+
+    The results of a run (its Gantt chart segments and metrics) are kept in an in-memory LRU of
+    capacity entries and, if a directory is given, in an on-disk store shared between processes
+    and sessions, one file per key. The files are written atomically, and the least recently used
+    ones are deleted once the store grows beyond max_bytes. A result whose file alone is larger
+    than max_bytes is only kept in memory, so it never empties the store.
+
+    The workload part of a key is the SHA-256 of the immutable fields of every process (number,
+    arrival time, burst time, comeback time and priority), hashed column by column as little-endian
+    64-bit integers, so a list of processes, a ProcessTable and a Workload with the same processes
+    have the same key. Only fresh processes can be cached, since the results of a run depend on the
+    state of the processes it starts from.
+
+    Attributes:
+        - capacity (int): The number of results kept in memory.
+        - directory (str): The directory of the on-disk store, or None.
+        - max_bytes (int): The size of the on-disk store above which old results are deleted.
+        - entries (OrderedDict): Maps a key to its stored result, from the least recently used.
+        - hits (int): The number of lookups that found a result.
+        - misses (int): The number of lookups that found nothing.
+
+    Methods:
+        - __init__: Initializes a ResultCache with an in-memory capacity and an optional directory.
+        - key: Returns the key of a run, or None if its processes cannot be cached.
+        - get: Returns the result stored for a key, or None.
+        - put: Stores the result of a run.
+        - clear: Removes every stored result.
+        - __len__: Returns the number of results kept in memory.
+        - path: Returns the path of the file of a key in the on-disk store.
+        - evict: Deletes the least recently used files of the on-disk store until it fits in max_bytes.
+    """
+
+    def __init__(self, capacity=128, directory=None, max_bytes=256 * 1024 * 1024):
+        """
+        Initializes a ResultCache instance.
+
+        Parameters:
+            - capacity (int): The number of results kept in memory.
+            - directory (str): The directory of the on-disk store (created if needed), or None to keep results in memory only.
+            - max_bytes (int): The size of the on-disk store above which old results are deleted. A result
+                larger than max_bytes is not written to disk.
+        """
+
+        self.capacity = capacity
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(processes, algorithm, time_limit, parameters=None):
+        """
+        Static method to return the key of a run.
+
+        Parameters:
+            - processes (list, ProcessTable or Workload): The processes of the run, before it starts.
+            - algorithm (str): The name of the algorithm.
+            - time_limit (int): The time limit of the run.
+            - parameters (dict): Any other setting the results depend on, such as the quantum.
+
+        Returns:
+            - str: The key as a hexadecimal string, or None if the processes are a stream or have already run.
+        """
+
+        if isinstance(processes, (ProcessTable, Workload)):
+            if isinstance(processes, ProcessTable) and any(processes.has_executed):
+                return None
+            columns = [getattr(processes, name) for name in KEY_FIELDS]
+        elif hasattr(processes, "__len__"):
+            if any(process.has_executed for process in processes):
+                return None
+            columns = [array("q", map(attrgetter(name), processes)) for name in KEY_FIELDS]
+        else:
+            return None
+
+        digest = hashlib.sha256()
+        digest.update(repr((CACHE_VERSION, algorithm, time_limit, sorted((parameters or {}).items()))).encode())
+        for column in columns:
+            # a ProcessTable narrows some columns, which are hashed as 64-bit integers like the others
+            if column.typecode != "q":
+                column = array("q", column)
+            if sys.byteorder == "big":
+                column = array("q", column)
+                column.byteswap()
+            digest.update(len(column).to_bytes(8, "little"))
+            digest.update(column)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Returns the result stored for a key, looking in memory first and then on disk.
+
+        Parameters:
+            - key (str): The key.
+
+        Returns:
+            - dict: A copy of the result, with the keys "segments" and "metrics", or None if nothing is stored.
+        """
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        elif self.directory is not None:
+            try:
+                with open(self.path(key), "rb") as stream:
+                    entry = pickle.load(stream)
+                # mark the file as recently used for the eviction
+                os.utime(self.path(key))
+            except (OSError, pickle.UnpicklingError, EOFError):
+                entry = None
+            if entry is not None:
+                self.remember(key, entry)
+
+        if entry is None:
+            self.misses = self.misses + 1
+            return None
+
+        self.hits = self.hits + 1
+        start, end, pid, metrics = entry
+        return {"segments": list(zip(start, end, pid)), "metrics": copy.deepcopy(metrics)}
+
+    def put(self, key, result):
+        """
+        Stores the result of a run in memory and, with a directory, on disk unless its file is larger than max_bytes.
+
+        Parameters:
+            - key (str): The key of the run.
+            - result (dict): The result, with the keys "segments" (every segment of the run) and "metrics".
+        """
+
+        segments = result["segments"]
+        entry = (array("q", (segment[0] for segment in segments)), array("q", (segment[1] for segment in segments)),
+                 array("q", (segment[2] for segment in segments)), copy.deepcopy(result["metrics"]))
+        self.remember(key, entry)
+
+        if self.directory is not None:
+            temporary = self.path(key) + ".%d.tmp" % os.getpid()
+            with open(temporary, "wb") as stream:
+                pickle.dump(entry, stream, pickle.HIGHEST_PROTOCOL)
+            # a file that cannot fit in the store would evict every other result and then itself
+            if os.path.getsize(temporary) > self.max_bytes:
+                os.remove(temporary)
+                return
+            os.replace(temporary, self.path(key))
+            self.evict(self.path(key))
+
+    def remember(self, key, entry):
+        """
+        Keeps an entry in the in-memory LRU, dropping the least recently used one if it is full.
+
+        Parameters:
+            - key (str): The key.
+            - entry (tuple): The start, end and pid arrays of the segments, and the metrics.
+        """
+
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes every stored result, in memory and on disk.
+        """
+
+        self.entries.clear()
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(".result"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def __len__(self):
+        """
+        Returns the number of results kept in memory.
+        """
+        return len(self.entries)
+
+    def path(self, key):
+        """
+        Returns the path of the file of a key in the on-disk store.
+
+        Parameters:
+            - key (str): The key.
+        """
+        return os.path.join(self.directory, key + ".result")
+
+    def evict(self, keep=None):
+        """
+        Deletes the least recently used files of the on-disk store until it fits in max_bytes.
+
+        Parameters:
+            - keep (str): The path of a file never to delete, such as the one just written.
+        """
+
+        files = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".result"):
+                status = entry.stat()
+                files.append((status.st_mtime, status.st_size, entry.path))
+                total = total + status.st_size
+
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total = total - size
@@ -1,12 +1,22 @@
-import copy
-
+from AgingQueue import *
+from ArrivalIndex import *
+from ArrivalStream import *
+from Checkpoint import *
+from CycleDetector import *
+from EventEngine import *
+from FairQueue import *
+from GanttRecorder import *
+from Instrumentation import *
+from Metrics import *
+from MultilevelQueue import *
 from PriorityQueue import *
 from Process import *
+from ResultCache import *
+from SmpEngine import *
+from WaitingQueue import *
+from Workload import *
 from collections import deque
 
-# Global variable to track the line number for Gantt chart output
-line = 0
-
 # Sample processes for scheduling algorithms
 processes = [Process(1, 0, 10, 2, 3),
              Process(2, 1, 8, 4, 2),
@@ -16,6 +26,16 @@ processes = [Process(1, 0, 10, 2, 3),
              Process(6, 7, 4, 6, 1),
              Process(7, 8, 6, 9, 2)]
 
+# The definition of the sample processes, from which every run gets processes in their initial state
+workload = Workload.from_processes(processes)
+
+
+# The scheduling algorithms by name, as accepted by run_simulation and the batch CLI
+ALGORITHMS = ("FCFS", "SJF", "SRTF", "RR", "PP", "NPP", "MLFQ", "CFS")
+
+# The algorithm run by each option of the menu
+MENU_OPTIONS = {"1": "FCFS", "2": "SJF", "3": "RR", "4": "SRTF", "5": "PP", "6": "NPP"}
+
 
 def main():
     """
@@ -26,33 +46,16 @@ def main():
         show_menu()
         print("\n")
         option = input("Enter a number for one of the algorithms\n")
-        global line
-        line = 0
 
-        # copy make a deep copy of all processes in the array to prevent
-        # issues relating to the continuity of the menu
+        # every run gets new processes created from the workload, since the
+        # algorithms update the processes they run in place
 
-        processes_copy = copy.deepcopy(processes)
+        processes_copy = workload.processes()
 
         print("Gantt Chart :\n\n")
 
-        if option == "1":
-            run_algorithm_FCFS(processes_copy, 200)
-
-        elif option == "2":
-            run_algorithm_SJF(processes_copy, 200)
-
-        elif option == "3":
-            run_algorithm_RR(processes_copy, 200)
-
-        elif option == "4":
-            run_algorithm_SRTF(processes_copy, 200)
-
-        elif option == "5":
-            run_algorithm_PP(processes_copy, True, 200)
-
-        elif option == "6":
-            run_algorithm_PP(processes_copy, False, 200)
+        if option in MENU_OPTIONS:
+            run_simulation(processes_copy, MENU_OPTIONS[option], 200, gantt=GanttRecorder(TextSink()))
 
         elif option == "7":
             print("Exiting program...")
@@ -64,6 +67,321 @@ def main():
         Process.print_calculations_time(processes_copy)
 
 
+def run_simulation(processes, algorithm, time_limit, event_driven=False, gantt=None, cores=1, affinity=None,
+                   instruments=None, checkpoint=None, cache=None, cycles=None):
+    """
+    Runs a scheduling algorithm by name without printing anything, and returns its results.
+
+    Parameters:
+        - processes (list): List of processes to be scheduled. They are updated in place. An iterable
+            of processes sorted by arrival time, such as stream_processes(path), is read lazily instead.
+        - algorithm (str): One of ALGORITHMS (case-insensitive). "PP" is preemptive priority
+            scheduling with aging, "NPP" its non-preemptive variant, "MLFQ" the multilevel
+            feedback queue (with the default quanta and boost period of run_algorithm_MLFQ) and
+            "CFS" completely fair scheduling (with the default granularity of run_algorithm_CFS).
+        - time_limit (int): The time limit for the simulation.
+        - event_driven (bool): Jump between scheduling events instead of ticking every time unit.
+        - gantt (GanttRecorder): Records the Gantt chart. By default the segments are kept in memory.
+            With several cores, a list of one recorder per core.
+        - cores (int): The number of cores. With more than one, the algorithm runs on an SmpEngine,
+            which is always event-driven.
+        - affinity (dict): With several cores, maps the number of a process to the index of the core it is pinned to.
+        - instruments (Instrumentation): Collects counters and timers for the phases of the loop (one core only).
+        - checkpoint (Checkpointer): Periodically saves the state of the run so it can be resumed with
+            resume_simulation (one core only, always event-driven).
+        - cache (ResultCache): Returns the stored result of an identical earlier run (same processes,
+            algorithm, parameters and time limit) instead of running it, and stores the result of a
+            new run (one core only, without instruments or checkpoints). On a hit the segments are
+            replayed into gantt, but the processes are left as they are: use the returned metrics.
+        - cycles (CycleDetector): Extrapolates the run to the time limit once its schedule repeats
+            (one core only, always event-driven, without checkpoints).
+
+    Returns:
+        - dict: With the keys "segments", the (start, end, pid) Gantt chart segments still held by
+            the recorder (all of them unless it has a sink), or a list of them per core with several cores,
+            and "metrics", as returned by calculate_metrics (None for a stream of processes, which is not kept).
+    """
+
+    name = algorithm.upper()
+    if cores > 1:
+        if instruments is not None:
+            raise ValueError("instrumentation is only available on one core")
+        if checkpoint is not None:
+            raise ValueError("checkpoints are only available on one core")
+        if cycles is not None:
+            raise ValueError("cycle detection is only available on one core")
+        if name not in ALGORITHMS:
+            raise ValueError("unknown scheduling algorithm: " + str(algorithm))
+        if name in ("MLFQ", "CFS"):
+            raise ValueError(name + " is only available on one core")
+
+        lanes = gantt if gantt is not None else [GanttRecorder() for _ in range(cores)]
+        SmpEngine(processes, "PP" if name == "NPP" else name, time_limit, cores, name != "NPP", lanes, affinity).run()
+        for lane in lanes:
+            lane.flush()
+        segments = [lane.segments() for lane in lanes]
+
+        if not hasattr(processes, "__len__"):
+            return {"segments": segments, "metrics": None}
+        return {"segments": segments, "metrics": calculate_metrics(processes, time_limit)}
+
+    if gantt is None:
+        gantt = GanttRecorder()
+
+    if cache is not None:
+        if cores > 1 or instruments is not None or checkpoint is not None:
+            raise ValueError("cached runs need one core, without instruments or checkpoints")
+
+        # the tick loops and the event engine produce the same results, so event_driven is not part of the key
+        key = ResultCache.key(processes, name, time_limit,
+                              {"quantum": EventEngine.quantum, "aging_period": EventEngine.aging_period})
+        if key is not None:
+            result = cache.get(key)
+            if result is None:
+                # run with a recorder that keeps every segment, whatever the sink of gantt
+                result = run_simulation(processes, name, time_limit, event_driven, cycles=cycles)
+                cache.put(key, result)
+            gantt.replay(result["segments"])
+            gantt.flush()
+            return {"segments": gantt.segments(), "metrics": result["metrics"]}
+
+    if name == "FCFS":
+        run_algorithm_FCFS(processes, time_limit, event_driven, gantt, instruments, checkpoint, cycles=cycles)
+    elif name == "SJF":
+        run_algorithm_SJF(processes, time_limit, event_driven, gantt, instruments, checkpoint, cycles=cycles)
+    elif name == "SRTF":
+        run_algorithm_SRTF(processes, time_limit, event_driven, gantt, instruments, checkpoint, cycles=cycles)
+    elif name == "RR":
+        run_algorithm_RR(processes, time_limit, event_driven, gantt, instruments, checkpoint, cycles=cycles)
+    elif name in ("PP", "NPP"):
+        run_algorithm_PP(processes, name == "PP", time_limit, event_driven, gantt, instruments, checkpoint,
+                         cycles=cycles)
+    elif name == "MLFQ":
+        run_algorithm_MLFQ(processes, time_limit, event_driven, gantt, instruments, checkpoint, cycles=cycles)
+    elif name == "CFS":
+        run_algorithm_CFS(processes, time_limit, event_driven, gantt, instruments, checkpoint, cycles=cycles)
+    else:
+        raise ValueError("unknown scheduling algorithm: " + str(algorithm))
+
+    if not hasattr(processes, "__len__"):
+        return {"segments": gantt.segments(), "metrics": None}
+    return {"segments": gantt.segments(), "metrics": calculate_metrics(processes, time_limit)}
+
+
+def resume_simulation(checkpoint, gantt=None):
+    """
+    Resumes a simulation from its last checkpoint and runs it to its time limit, producing the same
+    results as a run that was never interrupted. The run keeps saving checkpoints with the Checkpointer.
+
+    Parameters:
+        - checkpoint (Checkpointer): The Checkpointer of the interrupted run, or a new one with the same path.
+        - gantt (GanttRecorder): Records the Gantt chart, restored to its state at the checkpoint.
+            By default the segments are kept in memory.
+
+    Returns:
+        - dict: As returned by run_simulation, for the processes restored from the checkpoint.
+    """
+
+    if gantt is None:
+        gantt = GanttRecorder()
+
+    engine = checkpoint.resume(gantt)
+    engine.run()
+    gantt.flush()
+    return {"segments": gantt.segments(), "metrics": calculate_metrics(engine.processes, engine.time_limit)}
+
+
+def run_batch(argv=None):
+    """
+    The non-interactive command line: runs one algorithm over a workload and prints its metrics as JSON,
+    or runs a parameter sweep across a pool of processes and prints one JSON line per finished job,
+    or compares several algorithms over a workload in one run and prints their metrics as one JSON table,
+    or renders a columnar Gantt chart file (written by run --gantt chart.gantt) as text or SVG.
+
+    Usage:
+        python -m Scheduler run --algo srtf --workload trace.csv --horizon 1000000 [--tick] [--gantt chart.csv|chart.gantt]
+                                [--cores 64]
+                                [--instrument] [--checkpoint run.ckpt] [--checkpoint-interval 60] [--cache results/]
+                                [--cycles]
+        python -m Scheduler resume --checkpoint run.ckpt [--gantt chart.csv|chart.gantt] [--checkpoint-interval 60]
+        python -m Scheduler sweep [--workload a.csv --workload b.csv] [--algo rr --algo pp]
+                                  [--horizon 200 --horizon 1000] [--tick] [--jobs 8]
+        python -m Scheduler compare [--workload trace.csv] [--algo rr --algo pp] [--horizon 200]
+        python -m Scheduler chart chart.gantt [--begin 0] [--end 100000000] [--width 120] [--svg chart.svg]
+
+    Without a command (or with the command "menu") the interactive menu is started instead.
+
+    Parameters:
+        - argv (list): The command line arguments, sys.argv[1:] by default.
+    """
+
+    import argparse
+    import json
+    import sys
+
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv or argv[0] == "menu":
+        main()
+        return
+
+    parser = argparse.ArgumentParser(prog="python -m Scheduler", description="Process scheduling simulator.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="run one algorithm over a workload and print its metrics as JSON")
+    run.add_argument("--algo", required=True, type=str.upper, choices=ALGORITHMS,
+                     help="the scheduling algorithm (NPP is non-preemptive priority)")
+    run.add_argument("--workload", help="trace file (.csv, .jsonl or .bin) with the fields number, arrival_time, "
+                                        "burst_time, come_back and priority (the built-in sample by default)")
+    run.add_argument("--horizon", type=int, default=200, help="the time limit of the simulation")
+    run.add_argument("--tick", action="store_true", help="tick every time unit instead of jumping between events")
+    run.add_argument("--gantt", help="write the Gantt chart to this CSV file, or to this columnar file if its name "
+                                     "ends with .gantt (one lane per core)")
+    run.add_argument("--cores", type=int, default=1, help="the number of cores (several cores are simulated event-driven)")
+    run.add_argument("--instrument", action="store_true",
+                     help="print counters and timers for the phases of the loop to standard error as JSON")
+    run.add_argument("--checkpoint", help="save the state of the run to this file periodically, so it can be resumed")
+    run.add_argument("--checkpoint-interval", type=float, default=60.0, help="the seconds between two checkpoints")
+    run.add_argument("--cache", help="reuse the results of identical runs stored in this directory, and store new ones")
+    run.add_argument("--cycles", action="store_true",
+                     help="extrapolate the run to the horizon once its schedule repeats (event-driven)")
+    resume = commands.add_parser("resume", help="resume a checkpointed run and print its metrics as JSON")
+    resume.add_argument("--checkpoint", required=True, help="the checkpoint file of the run")
+    resume.add_argument("--gantt", help="the CSV or columnar file the run was writing its Gantt chart to")
+    resume.add_argument("--checkpoint-interval", type=float, default=60.0, help="the seconds between two checkpoints")
+    sweep = commands.add_parser("sweep", help="run every algorithm over every workload and horizon in parallel")
+    sweep.add_argument("--algo", action="append", type=str.upper, choices=ALGORITHMS,
+                       help="an algorithm to run (all of them by default)")
+    sweep.add_argument("--workload", action="append", help="a trace file (.csv, .jsonl or .bin; the built-in sample by default)")
+    sweep.add_argument("--horizon", action="append", type=int, help="a time limit to run with (200 by default)")
+    sweep.add_argument("--tick", action="store_true", help="tick every time unit instead of jumping between events")
+    sweep.add_argument("--jobs", type=int, help="the number of worker processes (the number of CPUs by default)")
+    compare = commands.add_parser("compare", help="run several algorithms over a workload in one driver loop "
+                                                  "and print their metrics as one JSON table")
+    compare.add_argument("--algo", action="append", type=str.upper, choices=ALGORITHMS,
+                         help="an algorithm to compare (the menu algorithms by default)")
+    compare.add_argument("--workload", help="a trace file (.csv, .jsonl or .bin; the built-in sample by default)")
+    compare.add_argument("--horizon", type=int, default=200, help="the time limit of the simulation")
+    chart = commands.add_parser("chart", help="render a columnar Gantt chart file, downsampled to a fixed width")
+    chart.add_argument("path", help="the columnar Gantt chart file (.gantt)")
+    chart.add_argument("--begin", type=int, help="the start of the time range (the start of the chart by default)")
+    chart.add_argument("--end", type=int, help="the end of the time range (the end of the chart by default)")
+    chart.add_argument("--width", type=int, help="the number of characters (120) or pixels (1000) of the timeline")
+    chart.add_argument("--svg", help="write the chart to this SVG file instead of printing it as text")
+    args = parser.parse_args(argv)
+
+    if args.command == "chart":
+        from GanttTrace import GanttTrace, render_svg, render_text
+
+        try:
+            trace = GanttTrace(args.path)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+        if args.begin is not None and args.end is not None and args.end <= args.begin:
+            parser.error("--end must be after --begin")
+        with trace:
+            if args.svg:
+                with open(args.svg, "w") as stream:
+                    stream.write(render_svg(trace, args.begin, args.end, args.width or 1000))
+            else:
+                sys.stdout.write(render_text(trace, args.begin, args.end, args.width or 120))
+        return
+
+    if args.command == "compare":
+        from Comparison import compare_policies
+
+        if args.algo and len(set(args.algo)) != len(args.algo):
+            parser.error("every --algo of a comparison may appear only once")
+        compared = load_workload(args.workload) if args.workload else workload
+        table = compare_policies(compared, args.algo or tuple(MENU_OPTIONS.values()), args.horizon)
+        json.dump(table, sys.stdout, indent=2)
+        print()
+        return
+
+    if args.command == "sweep":
+        from Sweep import run_sweep
+
+        workloads = [load_workload(path) for path in args.workload] if args.workload else [workload]
+        for result in run_sweep(workloads, args.algo or ALGORITHMS, args.horizon or (200,), not args.tick, args.jobs):
+            print(json.dumps(result), flush=True)
+        return
+
+    if args.command == "resume":
+        checkpoint = Checkpointer(args.checkpoint, args.checkpoint_interval)
+        if args.gantt and args.gantt.endswith(".gantt"):
+            from GanttTrace import GanttWriter
+
+            # reopen the chart to append to it, so it can be cut back to the checkpoint
+            with GanttWriter(args.gantt, append=True) as writer:
+                result = resume_simulation(checkpoint, GanttRecorder(writer.sink()))
+        elif args.gantt:
+            # reopen the chart without truncating it, so it can be cut back to the checkpoint
+            with open(args.gantt, "r+") as stream:
+                result = resume_simulation(checkpoint, GanttRecorder(CsvSink(stream)))
+        else:
+            result = resume_simulation(checkpoint, GanttRecorder(NullSink()))
+        json.dump(result["metrics"], sys.stdout, indent=2)
+        print()
+        return
+
+    run_processes = load_workload(args.workload) if args.workload else workload.processes()
+    instruments = None
+    if args.instrument:
+        instruments = Instrumentation(lambda report: print(json.dumps(report, indent=2), file=sys.stderr))
+
+    checkpoint = None
+    if args.checkpoint:
+        if args.tick:
+            parser.error("--checkpoint runs event-driven, so it cannot be combined with --tick")
+        checkpoint = Checkpointer(args.checkpoint, args.checkpoint_interval)
+
+    cache = None
+    if args.cache:
+        if args.cores > 1 or args.instrument or args.checkpoint:
+            parser.error("--cache needs --cores 1, without --instrument or --checkpoint")
+        cache = ResultCache(directory=args.cache)
+
+    cycles = None
+    if args.cycles:
+        if args.tick or args.cores > 1 or args.checkpoint:
+            parser.error("--cycles runs event-driven on one core without checkpoints, so it needs --cores 1 "
+                         "and cannot be combined with --tick or --checkpoint")
+        cycles = CycleDetector()
+
+    if args.cores > 1:
+        if args.checkpoint:
+            parser.error("--checkpoint needs --cores 1")
+        if args.gantt and not args.gantt.endswith(".gantt"):
+            parser.error("a CSV --gantt writes a single lane, so it needs --cores 1 (a .gantt file holds every core)")
+        if args.instrument:
+            parser.error("--instrument needs --cores 1")
+        if args.gantt:
+            from GanttTrace import GanttWriter
+
+            with GanttWriter(args.gantt) as writer:
+                lanes = [GanttRecorder(writer.sink(core)) for core in range(args.cores)]
+                result = run_simulation(run_processes, args.algo, args.horizon, gantt=lanes, cores=args.cores)
+        else:
+            lanes = [GanttRecorder(NullSink()) for _ in range(args.cores)]
+            result = run_simulation(run_processes, args.algo, args.horizon, gantt=lanes, cores=args.cores)
+    elif args.gantt and args.gantt.endswith(".gantt"):
+        from GanttTrace import GanttWriter
+
+        with GanttWriter(args.gantt) as writer:
+            result = run_simulation(run_processes, args.algo, args.horizon, not args.tick, GanttRecorder(writer.sink()),
+                                    instruments=instruments, checkpoint=checkpoint, cache=cache, cycles=cycles)
+    elif args.gantt:
+        with open(args.gantt, "w") as stream:
+            gantt = GanttRecorder(CsvSink(stream))
+            result = run_simulation(run_processes, args.algo, args.horizon, not args.tick, gantt, instruments=instruments,
+                                    checkpoint=checkpoint, cache=cache, cycles=cycles)
+    else:
+        result = run_simulation(run_processes, args.algo, args.horizon, not args.tick, GanttRecorder(NullSink()),
+                                instruments=instruments, checkpoint=checkpoint, cache=cache, cycles=cycles)
+
+    json.dump(result["metrics"], sys.stdout, indent=2)
+    print()
+
+
 def show_menu():
     """
     Displays the menu of available scheduling algorithms.
@@ -81,290 +399,593 @@ def show_menu():
           "7) Exit")
 
 
-def run_algorithm_FCFS(processes, time_limit):
+def run_algorithm_FCFS(processes, time_limit, event_driven=False, gantt=None, instruments=None, checkpoint=None,
+                       cycles=None):
     """
     Runs the First Come, First Served (FCFS) scheduling algorithm.
 
     Parameters:
-        - processes (list): List of processes to be scheduled.
+        - processes (list): List of processes to be scheduled, or an iterable of processes sorted by
+            arrival time, which is read lazily (see ArrivalStream).
         - time_limit (int): The time limit for the simulation.
+        - event_driven (bool): Jump between scheduling events instead of ticking every time unit.
+        - gantt (GanttRecorder): Records the Gantt chart. By default it is printed to standard output.
+        - instruments (Instrumentation): Collects counters and timers for the phases of the loop, if provided.
+        - checkpoint (Checkpointer): Periodically saves the state of the run so it can be resumed
+            (see resume_simulation), if provided. A checkpointed run is always event-driven.
+        - cycles (CycleDetector): Extrapolates the run to the time limit once its schedule repeats,
+            if provided. An extrapolated run is always event-driven.
     """
 
+    if gantt is None:
+        gantt = GanttRecorder(TextSink())
+
+    if event_driven or checkpoint is not None or cycles is not None:
+        EventEngine(processes, "FCFS", time_limit, gantt=gantt, instruments=instruments, checkpoint=checkpoint,
+                    cycles=cycles).run()
+        gantt.flush()
+        return
+
     # set up the ready queue and the waiting queue for algorithm
     # simulation
     ready_queue = deque()
-    waiting_queue = deque()
+    waiting_queue = WaitingQueue()
+    arrivals = open_arrivals(processes)
+
+    # the CPU starts idle, and the processes arriving at time 0 are dispatched by the first iteration
+    running_process = None
 
-    # run the first process at time 0
-    running_process = processes[0]
-    running_process.has_executed = True
-    running_process.start_time = 0
+    # the phases of the loop, replaced by timed versions when instrumented
+    arrive, come_back, finish, dispatch = handle_arrival, handle_comeback, finish_process, dispatch_process
+    if instruments is not None:
+        _, arrive, come_back, finish, _, dispatch = instrument_phases(instruments, None)
+        instruments.begin()
 
-    # loop that simulates the algorithm from 1 to 200s
-    for time in range(1, time_limit):
+    # loop that simulates the algorithm from 0 to 200s
+    for time in range(0, time_limit):
 
         # handle the debut of new processes
-        handle_arrival(processes, time, ready_queue)
+        arrive(arrivals, time, ready_queue)
         # handle the return of processes from the waiting queue
-        handle_comeback(time, waiting_queue, ready_queue)
-        running_process.decrease_remaining()
+        come_back(time, waiting_queue, ready_queue)
 
-        # a process has finished its job
-        if running_process.remaining_time == 0:
-            running_process.finish_time = time
-            running_process.cpu_turn_time = time
-            print_gantt_chart(time, running_process)
+        # the CPU is idle (running_process is None) if the ready queue was drained
+        if running_process is not None:
+            running_process.decrease_remaining()
 
-            # the process has finished, it goes to the waiting queue
-            waiting_queue.append(running_process)
+            # a process has finished its job
+            if running_process.remaining_time == 0:
+                finish(time, running_process, waiting_queue, gantt)
+                running_process = None
 
-            # fetch the next process from the ready queue
-            running_process = ready_queue.popleft()
+        # fetch the next process from the ready queue
+        if running_process is None and ready_queue:
+            running_process = dispatch(time, ready_queue.popleft())
 
-            # update the waiting time by (currentTime - last time the process entered the ready queue)
-            running_process.waiting_time = running_process.waiting_time + (time - running_process.ready_queue_time)
-            running_process.has_executed = True
-
-            # update the last time the process has entered the CPU
-            running_process.start_time = time
+        if instruments is not None:
+            instruments.sample(ready_queue, waiting_queue)
 
     # update the CPU exit time of the last process to 200 (the loop does not handle that case)
-    running_process.cpu_turn_time = time_limit
-    print_gantt_chart(time_limit, running_process)
+    finish_simulation(time_limit, running_process, gantt)
+    if instruments is not None:
+        instruments.end()
 
 
-def run_algorithm_SJF(processes, time_limit):
+def run_algorithm_SJF(processes, time_limit, event_driven=False, gantt=None, instruments=None, checkpoint=None,
+                      cycles=None):
     """
     Runs the Shortest Job First (SJF) scheduling algorithm.
 
     Parameters:
-        - processes (list): List of processes to be scheduled.
+        - processes (list): List of processes to be scheduled, or an iterable of processes sorted by
+            arrival time, which is read lazily (see ArrivalStream).
         - time_limit (int): The time limit for the simulation.
+        - event_driven (bool): Jump between scheduling events instead of ticking every time unit.
+        - gantt (GanttRecorder): Records the Gantt chart. By default it is printed to standard output.
+        - instruments (Instrumentation): Collects counters and timers for the phases of the loop, if provided.
+        - checkpoint (Checkpointer): Periodically saves the state of the run so it can be resumed
+            (see resume_simulation), if provided. A checkpointed run is always event-driven.
+        - cycles (CycleDetector): Extrapolates the run to the time limit once its schedule repeats,
+            if provided. An extrapolated run is always event-driven.
     """
 
+    if gantt is None:
+        gantt = GanttRecorder(TextSink())
+
+    if event_driven or checkpoint is not None or cycles is not None:
+        EventEngine(processes, "SJF", time_limit, gantt=gantt, instruments=instruments, checkpoint=checkpoint,
+                    cycles=cycles).run()
+        gantt.flush()
+        return
+
     # set up the ready queue and the waiting queue for algorithm
     # simulation
-    ready_queue = PriorityQueue(lambda item: item.burst_time)  # order by burst time (shortest job first)
-    waiting_queue = deque()
+    ready_queue = BurstTimeQueue()  # order by burst time (shortest job first)
+    waiting_queue = WaitingQueue()
+    arrivals = open_arrivals(processes)
 
-    # run the first process at time 0
-    running_process = processes[0]
-    running_process.has_executed = True
-    running_process.start_time = 0
+    # the CPU starts idle, and the processes arriving at time 0 are dispatched by the first iteration
+    running_process = None
 
-    # loop that simulates the algorithm from 1 to 200s
-    for time in range(1, time_limit):
+    # the phases of the loop, replaced by timed versions when instrumented
+    arrive, come_back, finish, dispatch = handle_arrival, handle_comeback, finish_process, dispatch_process
+    if instruments is not None:
+        _, arrive, come_back, finish, _, dispatch = instrument_phases(instruments, None)
+        instruments.begin()
+
+    # loop that simulates the algorithm from 0 to 200s
+    for time in range(0, time_limit):
 
         # handle the debut of new processes
-        handle_arrival(processes, time, ready_queue)
+        arrive(arrivals, time, ready_queue)
 
         # handle the return of processes from the waiting queue
-        handle_comeback(time, waiting_queue, ready_queue)
-        running_process.decrease_remaining()
-
-        # a process has finished its job
-        if running_process.remaining_time == 0:
-            running_process.finish_time = time
-            running_process.cpu_turn_time = time
-            print_gantt_chart(time, running_process)
-
-            # the process has finished, it goes to the waiting queue
-            waiting_queue.append(running_process)
+        come_back(time, waiting_queue, ready_queue)
 
-            # reset the remaining time of the process
-            running_process.remainingTime = running_process.burst_time
+        if running_process is not None:
+            running_process.decrease_remaining()
 
-            # fetch the next process from the ready queue
-            running_process = ready_queue.pop()
+            # a process has finished its job
+            if running_process.remaining_time == 0:
+                finish(time, running_process, waiting_queue, gantt)
+                running_process = None
 
-            # update the waiting time by (currentTime - last time the process entered the ready queue)
-            running_process.waiting_time = running_process.waiting_time + (time - running_process.ready_queue_time)
+        # fetch the next process from the ready queue
+        if running_process is None and not ready_queue.is_empty():
+            running_process = dispatch(time, ready_queue.pop())
 
-            running_process.has_executed = True
-            running_process.start_time = time
+        if instruments is not None:
+            instruments.sample(ready_queue, waiting_queue)
 
     # update the CPU exit time of the last process to 200 (the loop does not handle that case)
-    running_process.cpu_turn_time = time_limit
-    print_gantt_chart(time_limit, running_process)
+    finish_simulation(time_limit, running_process, gantt)
+    if instruments is not None:
+        instruments.end()
 
 
-def run_algorithm_SRTF(processes, time_limit):
+def run_algorithm_SRTF(processes, time_limit, event_driven=False, gantt=None, instruments=None, checkpoint=None,
+                       cycles=None):
     """
         Runs the Shortest Remaining Time First (SRTF) scheduling algorithm.
 
         Parameters:
-            - processes (list): List of processes to be scheduled.
+            - processes (list): List of processes to be scheduled, or an iterable of processes sorted by
+            arrival time, which is read lazily (see ArrivalStream).
             - time_limit (int): The time limit for the simulation.
+            - event_driven (bool): Jump between scheduling events instead of ticking every time unit.
+            - gantt (GanttRecorder): Records the Gantt chart. By default it is printed to standard output.
+            - instruments (Instrumentation): Collects counters and timers for the phases of the loop, if provided.
+            - checkpoint (Checkpointer): Periodically saves the state of the run so it can be resumed
+                (see resume_simulation), if provided. A checkpointed run is always event-driven.
+            - cycles (CycleDetector): Extrapolates the run to the time limit once its schedule repeats,
+                if provided. An extrapolated run is always event-driven.
     """
 
+    if gantt is None:
+        gantt = GanttRecorder(TextSink())
+
+    if event_driven or checkpoint is not None or cycles is not None:
+        EventEngine(processes, "SRTF", time_limit, gantt=gantt, instruments=instruments, checkpoint=checkpoint,
+                    cycles=cycles).run()
+        gantt.flush()
+        return
+
     # Set up the ready queue as a priority queue with a custom ordering
     # based on the remaining time, and then on ready queue time
     # so the peek is always the process having the least remaining time
     # and the one that arrived first to the ready queue.
 
-    ready_queue = PriorityQueue(lambda item: item.remaining_time, lambda item: item.ready_queue_time)
-    waiting_queue = deque()
+    ready_queue = RemainingTimeQueue()  # order by remaining time, then by ready queue time
+    waiting_queue = WaitingQueue()
+    arrivals = open_arrivals(processes)
 
-    # run the first process at time 0
-    running_process = processes[0]
-    running_process.has_executed = True
-    running_process.start_time = 0
+    # the CPU starts idle, and the processes arriving at time 0 are dispatched by the first iteration
+    running_process = None
 
-    # loop that simulates the algorithm from 1 to 200s
-    for time in range(1, time_limit):
+    # the phases of the loop, replaced by timed versions when instrumented
+    arrive, come_back, finish, replace, dispatch = (handle_arrival, handle_comeback, finish_process,
+                                                    replace_process_SRTF, dispatch_process)
+    if instruments is not None:
+        _, arrive, come_back, finish, replace, dispatch = instrument_phases(instruments, replace)
+        instruments.begin()
 
-        handle_arrival(processes, time, ready_queue)
-        handle_comeback(time, waiting_queue, ready_queue)
-        running_process.decrease_remaining()
+    # loop that simulates the algorithm from 0 to 200s
+    for time in range(0, time_limit):
 
-        # a process has finished its job
-        if running_process.remaining_time == 0:
-            running_process.finish_time = time
-            running_process.cpu_turn_time = time
-            print_gantt_chart(time, running_process)
-            waiting_queue.append(running_process)
+        arrive(arrivals, time, ready_queue)
+        come_back(time, waiting_queue, ready_queue)
 
-            running_process = ready_queue.pop()
-            running_process.waiting_time = running_process.waiting_time + (time - running_process.ready_queue_time)
-            running_process.has_executed = True
-            running_process.start_time = time
+        if running_process is not None:
+            running_process.decrease_remaining()
 
-        # if the process has just started, then check if the other processes in the
-        # ready queue have a lower remaining time, so they can interrupt the flow of the program
-        else:
-            running_process = replace_process_SRTF(time, ready_queue, running_process)
+            # a process has finished its job
+            if running_process.remaining_time == 0:
+                finish(time, running_process, waiting_queue, gantt)
+                running_process = None
+
+            # if the process has just started, then check if the other processes in the
+            # ready queue have a lower remaining time, so they can interrupt the flow of the program
+            elif not ready_queue.is_empty():
+                running_process = replace(time, ready_queue, running_process, gantt)
+
+        if running_process is None and not ready_queue.is_empty():
+            running_process = dispatch(time, ready_queue.pop())
+
+        if instruments is not None:
+            instruments.sample(ready_queue, waiting_queue)
 
     # update the CPU exit time of the last process to 200 (the loop does not handle that case)
-    running_process.cpu_turn_time = time_limit
-    print_gantt_chart(time_limit, running_process)
+    finish_simulation(time_limit, running_process, gantt)
+    if instruments is not None:
+        instruments.end()
 
 
-def run_algorithm_RR(processes, time_limit):
+def run_algorithm_RR(processes, time_limit, event_driven=False, gantt=None, instruments=None, checkpoint=None,
+                     cycles=None):
     """
         Runs the Round Robin (RR) scheduling algorithm.
 
         Parameters:
-            - processes (list): List of processes to be scheduled.
+            - processes (list): List of processes to be scheduled, or an iterable of processes sorted by
+            arrival time, which is read lazily (see ArrivalStream).
             - time_limit (int): The time limit for the simulation.
+            - event_driven (bool): Jump between scheduling events instead of ticking every time unit.
+            - gantt (GanttRecorder): Records the Gantt chart. By default it is printed to standard output.
+            - instruments (Instrumentation): Collects counters and timers for the phases of the loop, if provided.
+            - checkpoint (Checkpointer): Periodically saves the state of the run so it can be resumed
+                (see resume_simulation), if provided. A checkpointed run is always event-driven.
+            - cycles (CycleDetector): Extrapolates the run to the time limit once its schedule repeats,
+                if provided. An extrapolated run is always event-driven.
         """
 
+    if gantt is None:
+        gantt = GanttRecorder(TextSink())
+
+    if event_driven or checkpoint is not None or cycles is not None:
+        EventEngine(processes, "RR", time_limit, gantt=gantt, instruments=instruments, checkpoint=checkpoint,
+                    cycles=cycles).run()
+        gantt.flush()
+        return
+
     ready_queue = deque()
-    waiting_queue = deque()
+    waiting_queue = WaitingQueue()
+    arrivals = open_arrivals(processes)
+
+    # the CPU starts idle, and the processes arriving at time 0 are dispatched by the first iteration
+    running_process = None
+
+    # the phases of the loop, replaced by timed versions when instrumented
+    arrive, come_back, finish, replace, dispatch = (handle_arrival, handle_comeback, finish_process,
+                                                    replace_process_RR, dispatch_process)
+    if instruments is not None:
+        _, arrive, come_back, finish, replace, dispatch = instrument_phases(instruments, replace)
+        instruments.begin()
 
-    # run the first process at time 0
-    running_process = processes[0]
-    running_process.has_executed = True
-    running_process.start_time = 0
+    # loop that simulates the algorithm from 0 to 200s
+    for time in range(0, time_limit):
 
-    # loop that simulates the algorithm from 1 to 200s
-    for time in range(1, time_limit):
+        arrive(arrivals, time, ready_queue)
+        come_back(time, waiting_queue, ready_queue)
 
-        flag = True
-        handle_arrival(processes, time, ready_queue)
-        handle_comeback(time, waiting_queue, ready_queue)
-        running_process.decrease_remaining()
+        if running_process is not None:
+            running_process.decrease_remaining()
 
-        if running_process.remaining_time == 0:
-            flag = False
-            running_process.finish_time = time
-            running_process.cpu_turn_time = time
-            print_gantt_chart(time, running_process)
-            waiting_queue.append(running_process)
+            if running_process.remaining_time == 0:
+                finish(time, running_process, waiting_queue, gantt)
+                running_process = None
 
-            running_process = ready_queue.popleft()
-            running_process.waiting_time = running_process.waiting_time + (time - running_process.ready_queue_time)
-            running_process.has_executed = True
-            running_process.start_time = time
+            # if the process has not just finished, then check if its quantum has expired,
+            # so the next process in the ready queue can interrupt the flow of the program
+            elif ready_queue:
+                running_process = replace(time, ready_queue, running_process, gantt)
 
-        # if the process has just started, then check if the other processes in the
-        # ready queue have a lower remaining time, so they can interrupt the flow of the program
-        if flag:
-            running_process = replace_process_RR(time, ready_queue, running_process)
+        if running_process is None and ready_queue:
+            running_process = dispatch(time, ready_queue.popleft())
 
-    running_process.cpu_turn_time = time_limit
-    print_gantt_chart(time_limit, running_process)
+        if instruments is not None:
+            instruments.sample(ready_queue, waiting_queue)
 
+    finish_simulation(time_limit, running_process, gantt)
+    if instruments is not None:
+        instruments.end()
 
-def run_algorithm_PP(processes, is_preemptive, time_limit):
+
+def run_algorithm_PP(processes, is_preemptive, time_limit, event_driven=False, gantt=None, instruments=None,
+                     checkpoint=None, cycles=None):
     """
         Runs the preemptive (or non) Priority with aging (PP) scheduling algorithm.
 
         Parameters:
-            - processes (list): List of processes to be scheduled.
+            - processes (list): List of processes to be scheduled, or an iterable of processes sorted by
+            arrival time, which is read lazily (see ArrivalStream).
             - is_preemptive (bool) : indicates whether the algorithm is preemptive or non-preemptive
             - time_limit (int): The time limit for the simulation.
+            - event_driven (bool): Jump between scheduling events instead of ticking every time unit.
+            - gantt (GanttRecorder): Records the Gantt chart. By default it is printed to standard output.
+            - instruments (Instrumentation): Collects counters and timers for the phases of the loop, if provided.
+            - checkpoint (Checkpointer): Periodically saves the state of the run so it can be resumed
+                (see resume_simulation), if provided. A checkpointed run is always event-driven.
+            - cycles (CycleDetector): Extrapolates the run to the time limit once its schedule repeats,
+                if provided. An extrapolated run is always event-driven.
         """
 
-    # Set up the ready queue as a priority queue with a custom ordering
-    # based on the priority data field, and then on ready queue time
-    # so the peek is always the process having the least priority
-    # and the one that arrived first to the ready queue.
+    if gantt is None:
+        gantt = GanttRecorder(TextSink())
+
+    if event_driven or checkpoint is not None or cycles is not None:
+        EventEngine(processes, "PP", time_limit, is_preemptive, gantt=gantt, instruments=instruments,
+                    checkpoint=checkpoint, cycles=cycles).run()
+        gantt.flush()
+        return
+
+    # Set up the ready queue as an aging queue ordered on the priority
+    # data field, and then on ready queue time, so the peek is always
+    # the process having the least priority and the one that arrived
+    # first to the ready queue. The queue ages its processes lazily.
+
+    ready_queue = AgingQueue(EventEngine.aging_period)
+    waiting_queue = WaitingQueue()
+    arrivals = open_arrivals(processes)
 
-    ready_queue = PriorityQueue(lambda item: item.priority, lambda item: item.ready_queue_time)
-    waiting_queue = deque()
+    # the CPU starts idle, and the processes arriving at time 0 are dispatched by the first iteration
+    running_process = None
 
-    # run the first process at time 0
-    running_process = processes[0]
-    running_process.has_executed = True
-    running_process.start_time = 0
+    # the phases of the loop, replaced by timed versions when instrumented
+    age, arrive, come_back, finish, replace, dispatch = (handle_priority, handle_arrival, handle_comeback,
+                                                         finish_process, replace_process_PP, dispatch_process)
+    if instruments is not None:
+        age, arrive, come_back, finish, replace, dispatch = instrument_phases(instruments, replace)
+        instruments.begin()
 
-    # loop that simulates the algorithm from 1 to 200s
-    for time in range(1, time_limit):
+    # loop that simulates the algorithm from 0 to 200s
+    for time in range(0, time_limit):
 
-        handle_priority(time, ready_queue)
-        handle_arrival(processes, time, ready_queue)
-        handle_comeback(time, waiting_queue, ready_queue)
+        age(time, ready_queue)
+        arrive(arrivals, time, ready_queue)
+        come_back(time, waiting_queue, ready_queue)
 
-        # handling the decrease of the priority for processes
-        # every 5 seconds
-        running_process.decrease_remaining()
+        if running_process is not None:
+            running_process.decrease_remaining()
 
-        # a process has finished its job
-        if running_process.remaining_time == 0:
-            running_process.finish_time = time
-            running_process.cpu_turn_time = time
-            print_gantt_chart(time, running_process)
-            waiting_queue.append(running_process)
+            # a process has finished its job
+            if running_process.remaining_time == 0:
+                finish(time, running_process, waiting_queue, gantt)
+                running_process = None
 
-            running_process.remainingTime = running_process.burst_time
+            # interrupt the flow of the running process if PP
+            elif is_preemptive and not ready_queue.is_empty():
+                running_process = replace(time, ready_queue, running_process, gantt)
 
-            running_process = ready_queue.pop()
-            running_process.waiting_time = running_process.waiting_time + (time - running_process.ready_queue_time)
-            running_process.has_executed = True
-            running_process.start_time = time
+        if running_process is None and not ready_queue.is_empty():
+            running_process = dispatch(time, ready_queue.pop())
 
-        # interrupt the flow of the running process if PP
-        elif is_preemptive:
-            temp = replace_process_PP(time, ready_queue, running_process)
-            if temp is not None:
-                print_gantt_chart(time, running_process)
-                running_process = temp
+        if instruments is not None:
+            instruments.sample(ready_queue, waiting_queue)
 
-    running_process.cpu_turn_time = time_limit
-    print_gantt_chart(time_limit, running_process)
+    # write the aged priorities back to the processes left in the ready queue
+    ready_queue.sync_priorities()
+    finish_simulation(time_limit, running_process, gantt)
+    if instruments is not None:
+        instruments.end()
 
 
-def handle_arrival(processes, time, ready_queue):
+def run_algorithm_MLFQ(processes, time_limit, event_driven=False, gantt=None, instruments=None, checkpoint=None,
+                       quanta=(5, 10, 20), boost_period=100, cycles=None):
+    """
+        Runs the multilevel feedback queue (MLFQ) scheduling algorithm.
+
+        Processes enter the highest level and are demoted one level each time they use up the
+        quantum of their level while other processes are ready; a process of a higher level
+        preempts a lower one, and every boost_period time units every process goes back to the
+        highest level (see MultilevelQueue).
+
+        Parameters:
+            - processes (list): List of processes to be scheduled, or an iterable of processes sorted by
+            arrival time, which is read lazily (see ArrivalStream).
+            - time_limit (int): The time limit for the simulation.
+            - event_driven (bool): Jump between scheduling events instead of ticking every time unit.
+            - gantt (GanttRecorder): Records the Gantt chart. By default it is printed to standard output.
+            - instruments (Instrumentation): Collects counters and timers for the phases of the loop, if provided.
+            - checkpoint (Checkpointer): Periodically saves the state of the run so it can be resumed
+                (see resume_simulation), if provided. A checkpointed run is always event-driven.
+            - quanta (tuple): The time quantum of each level, from the highest level to the lowest.
+            - boost_period (int): The time between two boosts of every process to the highest level.
+            - cycles (CycleDetector): Extrapolates the run to the time limit once its schedule repeats,
+                if provided. An extrapolated run is always event-driven.
+        """
+
+    if gantt is None:
+        gantt = GanttRecorder(TextSink())
+
+    if event_driven or checkpoint is not None or cycles is not None:
+        EventEngine(processes, "MLFQ", time_limit, gantt=gantt, instruments=instruments,
+                    quanta=quanta, boost_period=boost_period, checkpoint=checkpoint, cycles=cycles).run()
+        gantt.flush()
+        return
+
+    # Set up the ready queue as one FIFO queue per level with an occupancy bitmap,
+    # so the next process is always the head of the highest non-empty level.
+
+    ready_queue = MultilevelQueue(quanta, boost_period)
+    waiting_queue = WaitingQueue()
+    arrivals = open_arrivals(processes)
+
+    # the CPU starts idle, and the processes arriving at time 0 are dispatched by the first iteration
+    running_process = None
+
+    # the phases of the loop, replaced by timed versions when instrumented
+    age, arrive, come_back, finish, replace, dispatch = (handle_priority, handle_arrival, handle_comeback,
+                                                         finish_process, replace_process_MLFQ, dispatch_process)
+    if instruments is not None:
+        age, arrive, come_back, finish, replace, dispatch = instrument_phases(instruments, replace)
+        instruments.begin()
+
+    # loop that simulates the algorithm from 0 to 200s
+    for time in range(0, time_limit):
+
+        # boost every process to the highest level every boost_period
+        age(time, ready_queue)
+        arrive(arrivals, time, ready_queue)
+        come_back(time, waiting_queue, ready_queue)
+
+        if running_process is not None:
+            running_process.decrease_remaining()
+
+            # a process has finished its job, and keeps its level
+            if running_process.remaining_time == 0:
+                finish(time, running_process, waiting_queue, gantt)
+                running_process = None
+
+            # let a process of a higher level interrupt the running process, or
+            # demote the running process if it has used up its quantum
+            elif ready_queue:
+                running_process = replace(time, ready_queue, running_process, gantt)
+
+        if running_process is None and ready_queue:
+            running_process = dispatch(time, ready_queue.pop())
+
+        if instruments is not None:
+            instruments.sample(ready_queue, waiting_queue)
+
+    finish_simulation(time_limit, running_process, gantt)
+    if instruments is not None:
+        instruments.end()
+
+
+def run_algorithm_CFS(processes, time_limit, event_driven=False, gantt=None, instruments=None, checkpoint=None,
+                      granularity=5, cycles=None):
+    """
+        Runs the completely fair scheduling (CFS) algorithm.
+
+        Every process accumulates virtual runtime while it runs, at a rate that grows as its priority
+        falls (see FairQueue), and the process with the smallest virtual runtime runs next. A running
+        process keeps the CPU for at least the granularity, and after that gives way to any ready
+        process with a smaller virtual runtime.
+
+        Parameters:
+            - processes (list): List of processes to be scheduled, or an iterable of processes sorted by
+            arrival time, which is read lazily (see ArrivalStream).
+            - time_limit (int): The time limit for the simulation.
+            - event_driven (bool): Jump between scheduling events instead of ticking every time unit.
+            - gantt (GanttRecorder): Records the Gantt chart. By default it is printed to standard output.
+            - instruments (Instrumentation): Collects counters and timers for the phases of the loop, if provided.
+            - checkpoint (Checkpointer): Periodically saves the state of the run so it can be resumed
+                (see resume_simulation), if provided. A checkpointed run is always event-driven.
+            - granularity (int): The time a process runs before another one may preempt it.
+            - cycles (CycleDetector): Extrapolates the run to the time limit once its schedule repeats,
+                if provided. An extrapolated run is always event-driven.
+        """
+
+    if gantt is None:
+        gantt = GanttRecorder(TextSink())
+
+    if event_driven or checkpoint is not None or cycles is not None:
+        EventEngine(processes, "CFS", time_limit, gantt=gantt, instruments=instruments,
+                    granularity=granularity, checkpoint=checkpoint, cycles=cycles).run()
+        gantt.flush()
+        return
+
+    # Set up the ready queue ordered by virtual runtime, so the process that has received
+    # the least weighted CPU time is always at the front.
+
+    ready_queue = FairQueue(granularity)
+    waiting_queue = WaitingQueue()
+    arrivals = open_arrivals(processes)
+
+    # the CPU starts idle, and the processes arriving at time 0 are dispatched by the first iteration
+    running_process = None
+
+    # the phases of the loop, replaced by timed versions when instrumented
+    arrive, come_back, finish, replace, dispatch = (handle_arrival, handle_comeback, finish_process,
+                                                    replace_process_CFS, dispatch_process)
+    if instruments is not None:
+        _, arrive, come_back, finish, replace, dispatch = instrument_phases(instruments, replace)
+        instruments.begin()
+
+    # loop that simulates the algorithm from 0 to 200s
+    for time in range(0, time_limit):
+
+        # charge the running process for the time unit it has just run, before any process
+        # joins the ready queue, so arrivals and comebacks start from an up-to-date min_vruntime
+        if running_process is not None:
+            ready_queue.charge(running_process, 1)
+
+        arrive(arrivals, time, ready_queue)
+        come_back(time, waiting_queue, ready_queue)
+
+        if running_process is not None:
+            running_process.decrease_remaining()
+
+            # a process has finished its job, and keeps its virtual runtime
+            if running_process.remaining_time == 0:
+                finish(time, running_process, waiting_queue, gantt)
+                running_process = None
+
+            # let a process with a smaller virtual runtime take the CPU once the granularity has passed
+            elif ready_queue:
+                running_process = replace(time, ready_queue, running_process, gantt)
+
+        if running_process is None and ready_queue:
+            running_process = dispatch(time, ready_queue.pop())
+
+        if instruments is not None:
+            instruments.sample(ready_queue, waiting_queue)
+
+    finish_simulation(time_limit, running_process, gantt)
+    if instruments is not None:
+        instruments.end()
+
+
+def instrument_phases(instruments, replace_process):
+    """
+    Returns timed versions of the phase functions of a tick loop.
+
+    Parameters:
+        - instruments (Instrumentation): Collects the counters and timers.
+        - replace_process (function): The preemption function of the algorithm, or None.
+
+    Returns:
+        - tuple: The timed handle_priority, handle_arrival, handle_comeback, finish_process,
+            replace_process and dispatch_process functions.
+    """
+
+    replace = None
+    if replace_process is not None:
+        # every call checks for a preemption; a process was preempted if the running process has changed
+        replace = instruments.wrap("preemption_checks", replace_process,
+                                   lambda args, running: running is not args[2])
+
+    return (instruments.wrap("aging", handle_priority),
+            instruments.wrap("arrivals", handle_arrival, lambda args, arrived: arrived),
+            instruments.wrap("comebacks", handle_comeback, lambda args, comebacks: comebacks),
+            instruments.wrap("completions", finish_process),
+            replace,
+            instruments.wrap("dispatches", dispatch_process))
+
+
+def handle_arrival(arrivals, time, ready_queue):
     """
     Handle the arrival of processes at a specific time.
 
     Parameters:
-       - processes (list): List of process objects representing all processes.
+       - arrivals (ArrivalIndex): The processes of the workload, sorted by arrival time.
        - time (int): The current time at which arrival is being handled.
        - ready_queue (list): A queue to store processes that have arrived and are ready for execution.
+
+    Returns:
+        - int: The number of processes that arrived.
     """
 
-    # Iterate through each process in the processes list.
-    # Check if the arrival time of the process matches the current time.
-    # If a matching process is found, update its ready_queue_time attribute to the current time.
+    # Take every process whose arrival time matches the current time from the arrival index,
+    # which only touches the processes arriving now instead of scanning the whole workload.
+    # Update the ready_queue_time attribute of each process to the current time.
     # Append the process to the ready_queue to indicate it is ready for execution.
-    # Break the loop after the first matching process is handled.
 
-    for process in processes:
-        if process.arrival_time == time:
-            process.ready_queue_time = time
-            ready_queue.append(process)
-            break
+    arrived = arrivals.pop_arrivals(time)
+    for process in arrived:
+        process.ready_queue_time = time
+        ready_queue.append(process)
+    return len(arrived)
 
 
 def handle_comeback(time, waiting_queue, ready_queue):
@@ -373,73 +994,130 @@ def handle_comeback(time, waiting_queue, ready_queue):
 
     Parameters:
         - time (int): The current time at which comebacks are being handled.
-        - waiting_queue (deque): A queue containing processes that are waiting to come back.
+        - waiting_queue (WaitingQueue): A queue containing processes that are waiting to come back.
         - ready_queue (list): A queue to store processes that have come back and are ready for execution.
+
+    Returns:
+        - int: The number of processes that came back.
     """
 
-    # Iterate through each process in the 'waiting_queue'.
-    # Check if the finish time plus comeback time of the process matches the current time.
-    # If a matching process is found:
+    # Take every process whose finish time plus comeback time matches the current time
+    # from the waiting queue, which is ordered by comeback time, so only those processes are touched.
+    # For each of them:
     # Reset its 'remaining_time' to the original 'burst_time'.
     # Update 'ready_queue_time' to the current time.
     # Append the process to the 'ready_queue'.
-    # Add the process to the 'removed' list for later removal from 'waiting_queue'.
-    # Remove the processes in the 'removed' list from the 'waiting_queue'.
 
-    removed = []
-    for process in waiting_queue:
+    comebacks = waiting_queue.pop_comebacks(time)
+    for process in comebacks:
+        process.remaining_time = process.burst_time
+        process.ready_queue_time = time
+        ready_queue.append(process)
+    return len(comebacks)
 
-        if process.finish_time + process.come_back == time:
-            process.remaining_time = process.burst_time
-            removed.append(process)
-            process.ready_queue_time = time
-            ready_queue.append(process)
 
-    for process in removed:
-        waiting_queue.remove(process)
+def dispatch_process(time, process):
+    """
+    Move a process from the ready queue onto the CPU.
 
+    Parameters:
+        - time (int): The current time at which the process starts running.
+        - process (Process): The process taken from the ready queue.
 
-def print_gantt_chart(time, process):
-    global line
-    line = line + 1
-    print("%-3s ||%-2s|| %-3s\t  " % (process.start_time, process, time), end="")
-    if line % 5 == 0:
-        print("\n")
+    Returns:
+        - Process: The process, now running.
+    """
+
+    # update the waiting time by (currentTime - last time the process entered the ready queue)
+    process.waiting_time = process.waiting_time + (time - process.ready_queue_time)
+
+    # remember when the process first got the CPU, for its response time
+    if not process.has_executed:
+        process.first_start_time = time
+    process.has_executed = True
+
+    # update the last time the process has entered the CPU
+    process.start_time = time
+    return process
+
+
+def finish_process(time, process, waiting_queue, gantt):
+    """
+    Move a process that has finished its burst from the CPU to the waiting queue.
+
+    Parameters:
+        - time (int): The current time at which the process finishes.
+        - process (Process): The running process.
+        - waiting_queue (WaitingQueue): A queue containing processes that are waiting to come back.
+        - gantt (GanttRecorder): Records the Gantt chart.
+    """
+
+    process.finish_time = time
+    process.completions = process.completions + 1
+    leave_cpu(time, process, gantt)
+
+    # the process has finished, it goes to the waiting queue
+    waiting_queue.append(process)
+
+
+def leave_cpu(time, process, gantt):
+    """
+    Take a process off the CPU, closing its Gantt chart segment.
+
+    Parameters:
+        - time (int): The current time at which the process leaves the CPU.
+        - process (Process): The running process.
+        - gantt (GanttRecorder): Records the Gantt chart.
+    """
+
+    process.cpu_turn_time = time
+    process.cpu_time = process.cpu_time + (time - process.start_time)
+    gantt.record(time, process)
+
+
+def finish_simulation(time_limit, running_process, gantt):
+    """
+    Close the last Gantt chart segment when the simulation reaches its time limit,
+    and write the buffered segments out.
 
+    Parameters:
+        - time_limit (int): The time limit for the simulation.
+        - running_process (Process): The process running at the time limit, or None if the CPU is idle.
+        - gantt (GanttRecorder): Records the Gantt chart.
+    """
+
+    if running_process is not None:
+        leave_cpu(time_limit, running_process, gantt)
+    gantt.flush()
 
-def replace_process_SRTF(time, ready_queue, running_process):
+
+def replace_process_SRTF(time, ready_queue, running_process, gantt):
     """
     Replace the currently running process in Shortest Remaining Time First (SRTF) scheduling.
 
     Parameters: - time (int): The current time at which process replacement is being considered. - ready_queue (
-    PriorityQueue): A priority queue containing processes with custom ordering based on remaining time. -
-    running_process (Process): The process currently running.
+    RemainingTimeQueue): A priority queue containing processes ordered by remaining time. -
+    running_process (Process): The process currently running. - gantt (GanttRecorder): Records the Gantt chart.
 
     Returns:
        - Process: The updated running process after potential replacement.
     """
 
     if ready_queue.peek().remaining_time < running_process.remaining_time:
-        print_gantt_chart(time, running_process)
+        leave_cpu(time, running_process, gantt)
 
-        # Update ready_queue_time and cpu_turn_time for the currently running process
+        # Update ready_queue_time for the currently running process, which goes back to the ready queue
         running_process.ready_queue_time = time
-        running_process.cpu_turn_time = time
 
         # Swap the currently running process with the one at the front of the ready queue
         temp = running_process
-        running_process = ready_queue.pop()
-        running_process.waiting_time = running_process.waiting_time + (time - running_process.ready_queue_time)
+        running_process = dispatch_process(time, ready_queue.pop())
         ready_queue.append(temp)
 
-        # Update start time and mark the newly running process as executed
-        running_process.start_time = time
-        running_process.has_executed = True
-
     return running_process
 
 
-def replace_process_RR(time, ready_queue, running_process):
+def replace_process_RR(time, ready_queue, running_process, gantt):
     """
     Replace the currently running process in Round Robin (RR) scheduling.
 
@@ -447,57 +1125,110 @@ def replace_process_RR(time, ready_queue, running_process):
         - time (int): The current time at which process replacement is being considered.
         - ready_queue (deque): A queue containing processes scheduled for execution in a round-robin manner.
         - running_process (Process): The process currently running.
+        - gantt (GanttRecorder): Records the Gantt chart.
 
     Returns:
         - Process: The updated running process after potential replacement.
     """
 
-    if (time - running_process.start_time) % 5 == 0:
-
-        print_gantt_chart(time, running_process)
+    if (time - running_process.start_time) % EventEngine.quantum == 0:
+        leave_cpu(time, running_process, gantt)
 
-        # Update ready_queue_time and cpu_turn_time for the currently running process
+        # Update ready_queue_time for the currently running process, which goes back to the ready queue
         running_process.ready_queue_time = time
-        running_process.cpu_turn_time = time
 
         # Swap the currently running process with the one at the front of the ready queue
         temp = running_process
-        running_process = ready_queue.popleft()
-        running_process.waiting_time = running_process.waiting_time + (time - running_process.ready_queue_time)
+        running_process = dispatch_process(time, ready_queue.popleft())
         ready_queue.append(temp)
 
-        # Update start time and mark the newly running process as executed
-        running_process.start_time = time
-        running_process.has_executed = True
-
     return running_process
 
 
-def replace_process_PP(time, ready_queue, running_process):
+def replace_process_PP(time, ready_queue, running_process, gantt):
     """
     Replace the currently running process in Preemptive Priority (PP) scheduling.
 
     Parameters:
         - time (int): The current time at which process replacement is being considered.
-        - ready_queue (PriorityQueue): A priority queue containing processes scheduled based on priority.
+        - ready_queue (AgingQueue): A priority queue containing processes scheduled based on priority.
         - running_process (Process): The process currently running.
+        - gantt (GanttRecorder): Records the Gantt chart.
     Returns:
         - Process: The updated running process after potential replacement.
     """
 
-    temp = None
     if ready_queue.peek().priority < running_process.priority:
+        leave_cpu(time, running_process, gantt)
+
+        # Update ready_queue_time for the currently running process, which goes back to the ready queue
         running_process.ready_queue_time = time
-        running_process.cpu_turn_time = time
+
+        # Swap the currently running process with the one at the front of the ready queue
         temp = running_process
-        running_process = ready_queue.pop()
-        running_process.waiting_time = running_process.waiting_time + (time - running_process.ready_queue_time)
+        running_process = dispatch_process(time, ready_queue.pop())
         ready_queue.append(temp)
-        running_process.start_time = time
-        running_process.has_executed = True
+
+    return running_process
+
+
+def replace_process_MLFQ(time, ready_queue, running_process, gantt):
+    """
+    Replace the currently running process in multilevel feedback queue (MLFQ) scheduling.
+
+    Parameters:
+        - time (int): The current time at which process replacement is being considered.
+        - ready_queue (MultilevelQueue): The per-level queues of the processes ready for execution.
+        - running_process (Process): The process currently running.
+        - gantt (GanttRecorder): Records the Gantt chart.
+
+    Returns:
+        - Process: The updated running process after potential replacement.
+    """
+
+    # the queue demotes the running process if it has used up its quantum, and tells
+    # whether a ready process now comes before it
+    if ready_queue.expire(time, running_process):
+        leave_cpu(time, running_process, gantt)
+
+        # Update ready_queue_time for the currently running process, which goes back to the ready queue
+        running_process.ready_queue_time = time
+
+        # Swap the currently running process with the head of the highest non-empty level
+        temp = running_process
+        running_process = dispatch_process(time, ready_queue.pop())
+        ready_queue.append(temp)
+
+    return running_process
+
+
+def replace_process_CFS(time, ready_queue, running_process, gantt):
+    """
+    Replace the currently running process in completely fair scheduling (CFS).
+
+    Parameters:
+        - time (int): The current time at which process replacement is being considered.
+        - ready_queue (FairQueue): The processes ready for execution, ordered by virtual runtime.
+        - running_process (Process): The process currently running.
+        - gantt (GanttRecorder): Records the Gantt chart.
+
+    Returns:
+        - Process: The updated running process after potential replacement.
+    """
+
+    # Check if the running process has run for the granularity and a ready process has a smaller virtual runtime
+    if ready_queue.expire(time, running_process):
+        leave_cpu(time, running_process, gantt)
+
+        # Update ready_queue_time for the currently running process, which goes back to the ready queue
+        running_process.ready_queue_time = time
+
+        # Swap the currently running process with the one with the smallest virtual runtime
         temp = running_process
+        running_process = dispatch_process(time, ready_queue.pop())
+        ready_queue.append(temp)
 
-    return temp
+    return running_process
 
 
 def handle_priority(time, ready_queue):
@@ -506,19 +1237,17 @@ def handle_priority(time, ready_queue):
 
     Parameters:
     - time (int): The current time at which priority updates are being considered.
-    - ready_queue (PriorityQueue): A priority queue containing processes scheduled based on priority.
+    - ready_queue (AgingQueue or MultilevelQueue): A priority queue containing processes scheduled based on priority.
     """
 
-    # Create a copy of the processes in the ready queue.
-    # Iterate through the copied processes and check if the process has spent 5 seconds in the ready queue
-    # If yes, decrease the priority of the process.
-    # Heapify the ready queue using the updated priorities
+    # The priority of a process is decreased every time it has spent a multiple of 5 seconds
+    # in the ready queue. The aging queue keeps the processes of each phase (ready queue time
+    # modulo 5) in their own heap, so moving it to the current time ages them all at once
+    # without touching them or rebuilding the heap. The multilevel queue of MLFQ
+    # boosts every process back to its highest level instead.
 
-    list_copy = ready_queue.copy_heap_to_list()
-    for process in list_copy:
-        if (time - process.ready_queue_time) % 5 == 0:
-            process.decrease_priority()
-    ready_queue.heapify(list_copy)
+    ready_queue.age(time)
 
 
-main()
+if __name__ == "__main__":
+    run_batch()
@@ -0,0 +1,445 @@
+import heapq
+
+from EventEngine import *
+from GanttRecorder import *
+
+
+class SmpEngine:
+    """
+    A discrete-event engine that simulates the scheduling algorithms on several cores (SMP).
+
+    Every core has its own ready queue, ordered like the single-core ready queue of the algorithm,
+    and runs one process at a time. A process arriving or coming back is placed on the least loaded
+    core (the core with the fewest running and ready processes), or on its core if it is pinned by
+    the affinity map. A core left with nothing to run steals the next process of the most loaded
+    core, unless that process is pinned there. Each core records its own Gantt chart lane.
+
+    The engine does not visit every core at every event: each core's next event time (completion,
+    quantum expiry or aging boundary) is kept in a heap, and the least and most loaded cores are
+    found with two heaps of core loads, so an event costs O(log cores). Stale heap entries are
+    skipped when they reach the top. With a single core the engine produces the same schedule as
+    EventEngine.
+
+    Attributes:
+        - processes (list): List of processes to be scheduled.
+        - algorithm (str): One of "FCFS", "SJF", "SRTF", "RR" or "PP".
+        - time_limit (int): The time limit for the simulation.
+        - is_preemptive (bool): Indicates whether the PP algorithm is preemptive or non-preemptive.
+        - affinity (dict): Maps the number of a pinned process to the index of its core.
+        - lanes (list): The Gantt chart recorder (or function called with (time, process)) of each core.
+        - cores (list): The Core instances.
+        - events (list): Heap of (time, core index, version) entries, the next event time of each core.
+        - least_loaded (list): Heap of (load, core index) entries.
+        - most_loaded (list): Heap of (-load, core index) entries.
+        - waiting_queue (WaitingQueue): The finished processes, ordered by comeback time.
+        - arrivals (ArrivalIndex or ArrivalStream): The processes of the workload, sorted by arrival time.
+
+    Methods:
+        - __init__: Initializes an SmpEngine for one run of an algorithm on several cores.
+        - run: Runs the simulation up to the time limit.
+        - next_event_time: Returns the next time at which the schedule of any core can change.
+        - step: Advances the simulation to a given event time and handles everything that happens then.
+        - place: Puts a process that became ready on a core.
+        - steal: Lets idle cores take the next process of the most loaded cores.
+        - update: Records the new load and the next event time of a core.
+        - least_loaded_core, most_loaded_core: Return the core with the lowest or highest load.
+    """
+
+    def __init__(self, processes, algorithm, time_limit, cores, is_preemptive=True, lanes=None, affinity=None):
+        """
+        Initializes an SmpEngine instance.
+
+        Parameters:
+            - processes (list): List of processes to be scheduled, or an iterable of processes sorted by
+                arrival time, which is read lazily (see ArrivalStream).
+            - algorithm (str): One of "FCFS", "SJF", "SRTF", "RR" or "PP".
+            - time_limit (int): The time limit for the simulation.
+            - cores (int): The number of cores.
+            - is_preemptive (bool): Indicates whether the PP algorithm is preemptive or non-preemptive.
+            - lanes (list): One Gantt chart recorder per core (by default, GanttRecorders keeping every segment).
+            - affinity (dict): Maps the number of a process to the index of the core it is pinned to.
+        """
+
+        if cores < 1:
+            raise ValueError("an SMP simulation needs at least one core")
+
+        self.processes = processes
+        self.algorithm = algorithm
+        self.time_limit = time_limit
+        self.is_preemptive = is_preemptive
+        self.affinity = affinity if affinity is not None else {}
+        self.lanes = lanes if lanes is not None else [GanttRecorder() for _ in range(cores)]
+        if len(self.lanes) != cores:
+            raise ValueError("an SMP simulation needs one Gantt chart lane per core")
+
+        self.cores = [Core(self, index, self.lanes[index]) for index in range(cores)]
+        self.events = []
+        # every core starts with a load of zero, so both lists are already heaps
+        self.least_loaded = [(0, index) for index in range(cores)]
+        self.most_loaded = [(0, index) for index in range(cores)]
+        self.waiting_queue = WaitingQueue()
+
+        # every core starts idle, and the processes arriving at time 0 are placed by the first step
+        self.arrivals = open_arrivals(processes)
+
+    def run(self):
+        """
+        Runs the simulation up to the time limit.
+        """
+
+        time = self.next_event_time()
+        while time < self.time_limit:
+            self.step(time)
+            time = self.next_event_time()
+
+        # like the tick loop, run and age every core up to time_limit - 1
+        for core in self.cores:
+            core.advance(self.time_limit - 1)
+            if self.algorithm == "PP":
+                core.ready_queue.age(max(self.time_limit - 1, core.time))
+                core.ready_queue.sync_priorities()
+            if core.running_process is not None:
+                core.leave_cpu(self.time_limit)
+
+    def next_event_time(self):
+        """
+        Returns the next time at which the schedule of any core can change.
+
+        Returns:
+            - int: The time of the next event, or time_limit if nothing happens before it.
+        """
+
+        time = self.time_limit
+
+        if not self.arrivals.is_empty():
+            time = min(time, self.arrivals.next_time())
+
+        if not self.waiting_queue.is_empty():
+            time = min(time, self.waiting_queue.next_time())
+
+        events = self.events
+        while events and events[0][2] != self.cores[events[0][1]].version:
+            heapq.heappop(events)
+        if events:
+            time = min(time, events[0][0])
+
+        return time
+
+    def step(self, time):
+        """
+        Advances the simulation to a given event time and handles everything that happens then:
+        arrivals and comebacks are placed on cores, then every core with something to do handles
+        it in the same order as EventEngine.step, in core order, and finally idle cores steal work.
+
+        Parameters:
+            - time (int): The time of the event.
+        """
+
+        touched = set()
+
+        events = self.events
+        while events and events[0][0] <= time:
+            _, index, version = heapq.heappop(events)
+            if version == self.cores[index].version:
+                touched.add(index)
+
+        for process in self.arrivals.pop_arrivals(time):
+            process.ready_queue_time = time
+            touched.add(self.place(process))
+
+        for process in self.waiting_queue.pop_comebacks(time):
+            process.remaining_time = process.burst_time
+            process.ready_queue_time = time
+            touched.add(self.place(process))
+
+        for index in sorted(touched):
+            core = self.cores[index]
+            finished = core.step(time)
+            if finished is not None:
+                self.waiting_queue.append(finished)
+            self.update(core)
+
+        self.steal(time)
+
+    def place(self, process):
+        """
+        Puts a process that became ready on its pinned core, or on the least loaded core.
+
+        Parameters:
+            - process (Process): The process, with its ready_queue_time set to the current time.
+
+        Returns:
+            - int: The index of the core.
+        """
+
+        index = self.affinity.get(process.number)
+        core = self.cores[index] if index is not None else self.least_loaded_core()
+        core.ready_queue.append(process)
+        self.update(core)
+        return core.index
+
+    def steal(self, time):
+        """
+        Lets idle cores with empty ready queues take the next process of the most loaded cores.
+        Stealing stops at the first most loaded core whose next process is pinned to it.
+
+        Parameters:
+            - time (int): The current time.
+        """
+
+        while True:
+            thief = self.least_loaded_core()
+            if thief.load != 0:
+                return
+
+            victim = self.most_loaded_core()
+            if not victim.ready_queue:
+                return
+
+            victim.advance(time)
+            if self.algorithm == "PP":
+                victim.ready_queue.age(time)
+            process = victim.ready_queue[0] if isinstance(victim.ready_queue, deque) else victim.ready_queue.peek()
+            if process.number in self.affinity:
+                return
+
+            victim.dispatch_to(thief, time)
+            self.update(victim)
+            self.update(thief)
+
+    def update(self, core):
+        """
+        Records the new load and the next event time of a core after it has changed.
+
+        Parameters:
+            - core (Core): The core.
+        """
+
+        cores = len(self.cores)
+
+        load = len(core.ready_queue) + (core.running_process is not None)
+        if load != core.load:
+            core.load = load
+            heapq.heappush(self.least_loaded, (load, core.index))
+            heapq.heappush(self.most_loaded, (-load, core.index))
+            # rebuild the heaps once stale entries outnumber the live ones
+            if len(self.least_loaded) > 4 * cores + 16:
+                self.least_loaded = [(other.load, other.index) for other in self.cores]
+                self.most_loaded = [(-other.load, other.index) for other in self.cores]
+                heapq.heapify(self.least_loaded)
+                heapq.heapify(self.most_loaded)
+
+        core.version = core.version + 1
+        time = core.next_event_time()
+        if time is not None and time < self.time_limit:
+            heapq.heappush(self.events, (time, core.index, core.version))
+            if len(self.events) > 4 * cores + 16:
+                self.events = [entry for entry in self.events if entry[2] == self.cores[entry[1]].version]
+                heapq.heapify(self.events)
+
+    def least_loaded_core(self):
+        """
+        Returns the core with the lowest load (the one with the lowest index among equals).
+        """
+
+        heap = self.least_loaded
+        while heap[0][0] != self.cores[heap[0][1]].load:
+            heapq.heappop(heap)
+        return self.cores[heap[0][1]]
+
+    def most_loaded_core(self):
+        """
+        Returns the core with the highest load (the one with the lowest index among equals).
+        """
+
+        heap = self.most_loaded
+        while -heap[0][0] != self.cores[heap[0][1]].load:
+            heapq.heappop(heap)
+        return self.cores[heap[0][1]]
+
+
+class Core:
+    """
+    One core of an SmpEngine: a ready queue and the process running on it.
+
+    Attributes:
+        - engine (SmpEngine): The engine the core belongs to.
+        - index (int): The index of the core.
+        - gantt (function): Called with (time, process) whenever a segment of the core's Gantt chart lane ends.
+        - ready_queue (deque, BurstTimeQueue, RemainingTimeQueue or AgingQueue): The processes ready for execution on the core.
+        - running_process (Process): The process currently running, or None if the core is idle.
+        - time (int): The time up to which the core has been advanced.
+        - load (int): The number of running and ready processes on the core, as last recorded by the engine.
+        - version (int): Incremented whenever the next event time of the core is recomputed.
+
+    Methods:
+        - __init__: Initializes an idle core.
+        - next_event_time: Returns the next time at which the schedule of the core can change.
+        - step: Handles the completion, preemption or dispatch due on the core at a given time.
+        - advance, start, leave_cpu, dispatch: As in EventEngine, for this core.
+        - dispatch_to: Moves the next process of the ready queue onto another, idle core.
+    """
+
+    def __init__(self, engine, index, gantt):
+        """
+        Initializes a Core instance.
+
+        Parameters:
+            - engine (SmpEngine): The engine the core belongs to.
+            - index (int): The index of the core.
+            - gantt (function): Called with (time, process) whenever a Gantt chart segment ends.
+        """
+
+        self.engine = engine
+        self.index = index
+        self.gantt = gantt
+        self.ready_queue = EventEngine.create_ready_queue(engine.algorithm)
+        self.running_process = None
+        self.time = 0
+        self.load = 0
+        self.version = 0
+
+    def next_event_time(self):
+        """
+        Returns the next time at which the schedule of the core can change, leaving arrivals and comebacks to the engine.
+
+        Returns:
+            - int: The time of the next event, or None if the core is idle.
+        """
+
+        running = self.running_process
+        if running is None:
+            return None
+
+        # decrease_remaining() never goes below zero, so a process takes at least one unit to finish
+        time = self.time + max(running.remaining_time, 1)
+
+        # the quantum only matters if there is another process to hand the core to
+        if self.engine.algorithm == "RR" and self.ready_queue:
+            elapsed = self.time - running.start_time
+            time = min(time, running.start_time + EventEngine.quantum * (elapsed // EventEngine.quantum + 1))
+
+        # aging can only change the schedule by letting a waiting process preempt the running one
+        if self.engine.algorithm == "PP" and self.engine.is_preemptive:
+            aging_time = self.ready_queue.next_time_below(running.priority)
+            if aging_time is not None:
+                time = min(time, aging_time)
+
+        return time
+
+    def step(self, time):
+        """
+        Handles the completion, preemption or dispatch due on the core at a given time,
+        in the same order as EventEngine.step.
+
+        Parameters:
+            - time (int): The current time.
+
+        Returns:
+            - Process: The process that finished its burst, which the engine moves to the waiting queue, or None.
+        """
+
+        self.advance(time)
+
+        algorithm = self.engine.algorithm
+        if algorithm == "PP":
+            self.ready_queue.age(time)
+
+        finished = None
+        running = self.running_process
+        if running is not None:
+            if running.remaining_time == 0:
+                running.finish_time = time
+                running.completions = running.completions + 1
+                self.leave_cpu(time)
+                self.running_process = None
+                finished = running
+
+            elif self.ready_queue:
+                if algorithm == "SRTF":
+                    replace = self.ready_queue.peek().remaining_time < running.remaining_time
+                elif algorithm == "RR":
+                    replace = (time - running.start_time) % EventEngine.quantum == 0
+                elif algorithm == "PP":
+                    replace = self.engine.is_preemptive and self.ready_queue.peek().priority < running.priority
+                else:
+                    replace = False
+
+                if replace:
+                    self.leave_cpu(time)
+                    running.ready_queue_time = time
+                    self.dispatch(time)
+                    self.ready_queue.append(running)
+
+        if self.running_process is None and self.ready_queue:
+            self.dispatch(time)
+
+        return finished
+
+    def advance(self, time):
+        """
+        Moves the clock of the core forward, running the current process for the elapsed time.
+
+        Parameters:
+            - time (int): The new time.
+        """
+
+        if time <= self.time:
+            return
+
+        if self.running_process is not None:
+            self.running_process.remaining_time = max(self.running_process.remaining_time - (time - self.time), 0)
+        self.time = time
+
+    def start(self, time, process):
+        """
+        Runs a process on the core from a given time.
+
+        Parameters:
+            - time (int): The current time.
+            - process (Process): The process, taken from a ready queue.
+        """
+
+        self.time = max(self.time, time)
+        process.waiting_time = process.waiting_time + (time - process.ready_queue_time)
+        if not process.has_executed:
+            process.first_start_time = time
+        process.has_executed = True
+        process.start_time = time
+        self.running_process = process
+
+    def leave_cpu(self, time):
+        """
+        Takes the running process off the core, closing its Gantt chart segment.
+
+        Parameters:
+            - time (int): The current time.
+        """
+
+        process = self.running_process
+        process.cpu_turn_time = time
+        process.cpu_time = process.cpu_time + (time - process.start_time)
+        self.gantt(time, process)
+
+    def dispatch(self, time):
+        """
+        Moves the next process in the ready queue onto the core.
+
+        Parameters:
+            - time (int): The current time.
+        """
+        self.dispatch_to(self, time)
+
+    def dispatch_to(self, core, time):
+        """
+        Moves the next process in the ready queue onto a core, this one or an idle one stealing it.
+
+        Parameters:
+            - core (Core): The core to run the process on.
+            - time (int): The current time.
+        """
+
+        if isinstance(self.ready_queue, deque):
+            core.start(time, self.ready_queue.popleft())
+        else:
+            core.start(time, self.ready_queue.pop())
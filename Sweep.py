@@ -0,0 +1,111 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Scheduler import *
+
+# The workloads of the sweep, set once in every worker process by init_worker
+worker_workloads = None
+
+
+def run_sweep(workloads, algorithms=ALGORITHMS, horizons=(200,), event_driven=True, max_workers=None, chunk_size=None):
+    """
+    Runs every (workload, algorithm, horizon) job of a parameter sweep across a pool of processes,
+    yielding the results as the jobs finish.
+
+    The workloads are sent to each worker process once, when it starts; a job only carries the
+    index of its workload, the algorithm and the horizon. Jobs are grouped in chunks so that short
+    jobs do not spend more time in inter-process communication than in simulation. Every job runs
+    on processes created from its Workload, so the results are identical to running the jobs one
+    after the other, whatever the number of workers or the completion order.
+
+    Parameters:
+        - workloads (list): The workloads, as Workload instances or lists of processes that have not run yet.
+        - algorithms (iterable): The algorithms to run, as accepted by run_simulation.
+        - horizons (iterable): The time limits to run each algorithm with.
+        - event_driven (bool): Run the jobs with the event-driven engine instead of the tick loops.
+        - max_workers (int): The number of worker processes (the number of CPUs by default).
+            With 0 the jobs run one after the other in the calling process.
+        - chunk_size (int): The number of jobs sent to a worker at once (by default, enough for
+            about four chunks per worker).
+
+    Yields:
+        - dict: One result per job, with the keys job (the position of the job in workload,
+            algorithm, horizon order), workload (the index of the workload), algorithm, horizon
+            and metrics (as returned by calculate_metrics).
+    """
+
+    workloads = [workload if isinstance(workload, Workload) else Workload.from_processes(workload)
+                 for workload in workloads]
+    jobs = [(index, algorithm.upper(), horizon, event_driven)
+            for index in range(len(workloads)) for algorithm in algorithms for horizon in horizons]
+
+    if max_workers == 0:
+        for job, (index, algorithm, horizon, event_driven) in enumerate(jobs):
+            yield make_result(job, index, algorithm, horizon,
+                              run_job(workloads[index], algorithm, horizon, event_driven))
+        return
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, len(jobs) // (4 * max_workers))
+
+    with ProcessPoolExecutor(max_workers, initializer=init_worker, initargs=(workloads,)) as executor:
+        futures = {}
+        for first in range(0, len(jobs), chunk_size):
+            futures[executor.submit(run_chunk, jobs[first:first + chunk_size])] = first
+
+        for future in as_completed(futures):
+            first = futures[future]
+            for offset, metrics in enumerate(future.result()):
+                index, algorithm, horizon, _ = jobs[first + offset]
+                yield make_result(first + offset, index, algorithm, horizon, metrics)
+
+
+def init_worker(workloads):
+    """
+    Stores the workloads of the sweep in a worker process.
+
+    Parameters:
+        - workloads (list): The Workload instances of the sweep.
+    """
+
+    global worker_workloads
+    worker_workloads = workloads
+
+
+def run_chunk(jobs):
+    """
+    Runs a chunk of jobs in a worker process.
+
+    Parameters:
+        - jobs (list): The jobs, as (workload index, algorithm, horizon, event_driven) tuples.
+
+    Returns:
+        - list: The metrics of each job, in order.
+    """
+    return [run_job(worker_workloads[index], algorithm, horizon, event_driven)
+            for index, algorithm, horizon, event_driven in jobs]
+
+
+def run_job(workload, algorithm, horizon, event_driven):
+    """
+    Runs one algorithm over a workload, discarding the Gantt chart.
+
+    Parameters:
+        - workload (Workload): The workload.
+        - algorithm (str): The algorithm, as accepted by run_simulation.
+        - horizon (int): The time limit of the simulation.
+        - event_driven (bool): Use the event-driven engine instead of the tick loop.
+
+    Returns:
+        - dict: The metrics of the run.
+    """
+    return run_simulation(workload.processes(), algorithm, horizon, event_driven, GanttRecorder(NullSink()))["metrics"]
+
+
+def make_result(job, index, algorithm, horizon, metrics):
+    """
+    Creates the result of a job, as yielded by run_sweep.
+    """
+    return {"job": job, "workload": index, "algorithm": algorithm, "horizon": horizon, "metrics": metrics}
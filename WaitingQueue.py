@@ -0,0 +1,91 @@
+import heapq
+
+
+class WaitingQueue:
+    """
+    A queue of finished processes, ordered by the time at which they come back to the ready queue.
+
+    The processes are kept in a min-heap keyed on their comeback time (finish_time + come_back), so
+    handling the comebacks at a given time only touches the processes that are due. A sequence number
+    breaks ties, so processes coming back at the same time keep the order in which they finished.
+
+    Attributes:
+        - heap (list): The underlying heap of (comeback time, sequence number, process) tuples.
+        - sequence (int): The sequence number given to the next process added to the queue.
+
+    Methods:
+        - __init__: Initializes an empty WaitingQueue.
+        - append: Adds a finished process to the waiting queue.
+        - pop_comebacks: Removes and returns the processes coming back at a given time.
+        - next_time: Returns the time at which the next process comes back.
+        - is_empty: Checks if the waiting queue is empty.
+        - __len__: Returns the number of processes in the waiting queue.
+    """
+
+    def __init__(self):
+        """
+        Initializes a WaitingQueue instance.
+        """
+
+        self.heap = []
+        self.sequence = 0
+
+    def append(self, process):
+        """
+        Adds a finished process to the waiting queue.
+
+        Parameters:
+            - process (Process): The process, with its finish_time set to the current time.
+        """
+
+        # a process whose comeback time is not ahead of its finish time never comes back,
+        # since the comebacks at the current time have already been handled
+        if process.come_back <= 0:
+            return
+
+        heapq.heappush(self.heap, (process.finish_time + process.come_back, self.sequence, process))
+        self.sequence = self.sequence + 1
+
+    def pop_comebacks(self, time):
+        """
+        Removes and returns the processes coming back at a given time.
+
+        Parameters:
+            - time (int): The current time.
+
+        Returns:
+            A list of the processes coming back at that time, in the order they finished.
+        """
+
+        comebacks = []
+        while self.heap and self.heap[0][0] <= time:
+            _, _, process = heapq.heappop(self.heap)
+            comebacks.append(process)
+        return comebacks
+
+    def next_time(self):
+        """
+        Returns the time at which the next process comes back.
+
+        Returns:
+            The comeback time of the next process, or None if the waiting queue is empty.
+        """
+
+        if self.is_empty():
+            return None
+        return self.heap[0][0]
+
+    def is_empty(self):
+        """
+        Checks if the waiting queue is empty.
+
+        Returns:
+            True if the waiting queue is empty, False otherwise.
+        """
+        return len(self.heap) == 0
+
+    def __len__(self):
+        """
+        Returns the number of processes in the waiting queue.
+        """
+        return len(self.heap)
@@ -0,0 +1,273 @@
+import csv
+import json
+import mmap
+import os
+import struct
+from array import array
+
+from Process import *
+from ProcessTable import *
+
+# The fields of a process stored in a trace file, in record order
+TRACE_FIELDS = ("number", "arrival_time", "burst_time", "come_back", "priority")
+
+# A record of a binary trace file: the trace fields as little-endian 64-bit integers
+RECORD = struct.Struct("<5q")
+
+
+class Workload:
+    """
+    The immutable definition of a workload, kept apart from the simulation state.
+
+    The scheduling algorithms update the processes they run in place, so every run needs processes
+    in their initial state. Instead of deep-copying a list of processes before each run, a Workload
+    keeps only the attributes that define the processes, one array each, and creates fresh
+    simulation state from them: new Process objects, or a ProcessTable built (or reset) with flat
+    array copies. The same workload can then be replayed across many algorithms.
+
+    Attributes:
+        - number, arrival_time, burst_time, come_back, priority (array):
+            The attributes defining the processes, indexed by row.
+
+    Methods:
+        - __init__: Initializes a Workload from the attributes of the processes.
+        - from_processes: Static method to create a Workload from a list of processes.
+        - processes: Creates a list of new Process instances in their initial state.
+        - table: Creates a ProcessTable in its initial state.
+        - reset: Resets the simulation state of a ProcessTable created from the workload.
+        - __len__: Returns the number of processes in the workload.
+    """
+
+    def __init__(self, numbers, arrival_times, burst_times, come_backs, priorities):
+        """
+        Initializes a Workload instance.
+
+        Parameters:
+            - numbers (iterable): The unique identifiers of the processes.
+            - arrival_times (iterable): The arrival times of the processes.
+            - burst_times (iterable): The CPU burst times of the processes.
+            - come_backs (iterable): The comeback times of the processes.
+            - priorities (iterable): The initial priority levels of the processes.
+        """
+
+        self.number = array("q", numbers)
+        self.arrival_time = array("q", arrival_times)
+        self.burst_time = array("q", burst_times)
+        self.come_back = array("q", come_backs)
+        self.priority = array("q", priorities)
+
+        size = len(self.number)
+        if not (len(self.arrival_time) == len(self.burst_time) == len(self.come_back) == len(self.priority) == size):
+            raise ValueError("all process attributes must have the same length")
+
+    @staticmethod
+    def from_processes(processes):
+        """
+        Static method to create a Workload from a list of processes that have not run yet.
+
+        Parameters:
+            - processes (list or ProcessTable): The processes.
+
+        Returns:
+            - Workload: The workload.
+        """
+
+        return Workload([process.number for process in processes],
+                        [process.arrival_time for process in processes],
+                        [process.burst_time for process in processes],
+                        [process.come_back for process in processes],
+                        [process.priority for process in processes])
+
+    def processes(self):
+        """
+        Creates a list of new Process instances in their initial state.
+
+        Returns:
+            - list: The processes, in workload order.
+        """
+        return list(map(Process, self.number, self.arrival_time, self.burst_time, self.come_back, self.priority))
+
+    def table(self):
+        """
+        Creates a ProcessTable in its initial state. Its columns are flat copies of the workload's arrays.
+
+        Returns:
+            - ProcessTable: The table, in workload order.
+        """
+        return ProcessTable(self.number, self.arrival_time, self.burst_time, self.come_back, self.priority)
+
+    def reset(self, table):
+        """
+        Resets the simulation state of a ProcessTable created from the workload, in place,
+        so the table can be run again without creating anything per process.
+
+        Parameters:
+            - table (ProcessTable): A table created by table().
+        """
+
+        size = len(self.number)
+        if len(table) != size:
+            raise ValueError("the table does not belong to this workload")
+
+        # slice assignment between arrays of the same type is a single memory copy; the table's
+        # narrower columns need a converted copy of the workload's 64-bit ones first
+        table.priority[:] = array(table.priority.typecode, self.priority)
+        table.remaining_time[:] = array(table.remaining_time.typecode, self.burst_time)
+        for name in ProcessTable.columns[6:]:
+            getattr(table, name)[:] = ProcessTable.zeros(name, size)
+
+    def __len__(self):
+        """
+        Returns the number of processes in the workload.
+        """
+        return len(self.number)
+
+
+def read_csv(path):
+    """
+    Reads the processes of a CSV trace file one at a time.
+
+    The file starts with a header row naming the columns number, arrival_time, burst_time,
+    come_back and priority (in any order, other columns are ignored); every other row describes one process.
+
+    Parameters:
+        - path (str): The path of the file.
+
+    Yields:
+        - tuple: The fields (number, arrival_time, burst_time, come_back, priority) of each process, in file order.
+    """
+
+    with open(path, newline="") as stream:
+        rows = csv.reader(stream)
+        header = next(rows, None)
+        if header is None:
+            return
+        try:
+            columns = [header.index(name) for name in TRACE_FIELDS]
+        except ValueError:
+            raise ValueError("the header of " + path + " must name the columns " + ", ".join(TRACE_FIELDS))
+
+        for row in rows:
+            if row:
+                yield tuple(int(row[column]) for column in columns)
+
+
+def read_jsonl(path):
+    """
+    Reads the processes of a JSON Lines trace file one at a time.
+
+    Every non-empty line is a JSON object with the keys number, arrival_time, burst_time, come_back and priority.
+
+    Parameters:
+        - path (str): The path of the file.
+
+    Yields:
+        - tuple: The fields (number, arrival_time, burst_time, come_back, priority) of each process, in file order.
+    """
+
+    with open(path) as stream:
+        for line in stream:
+            if line.strip():
+                record = json.loads(line)
+                yield tuple(int(record[name]) for name in TRACE_FIELDS)
+
+
+def read_binary(path):
+    """
+    Reads the processes of a binary trace file one at a time.
+
+    A binary trace is a sequence of fixed-size records of five little-endian 64-bit integers
+    (number, arrival_time, burst_time, come_back, priority), as written by write_binary. The file
+    is memory-mapped and each record is unpacked straight from the mapping, so nothing is copied
+    and only the pages being read are loaded.
+
+    Parameters:
+        - path (str): The path of the file.
+
+    Yields:
+        - tuple: The fields (number, arrival_time, burst_time, come_back, priority) of each process, in file order.
+    """
+
+    with open(path, "rb") as stream:
+        size = os.fstat(stream.fileno()).st_size
+        if size % RECORD.size != 0:
+            raise ValueError(path + " is not a binary trace: its size is not a multiple of " + str(RECORD.size))
+        if size == 0:
+            return
+
+        with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            for offset in range(0, size, RECORD.size):
+                yield RECORD.unpack_from(mapping, offset)
+
+
+def write_binary(path, records):
+    """
+    Writes processes to a binary trace file, as read by read_binary.
+
+    Parameters:
+        - path (str): The path of the file.
+        - records (iterable): The fields (number, arrival_time, burst_time, come_back, priority) of
+            each process, for example as yielded by read_csv.
+    """
+
+    with open(path, "wb") as stream:
+        batch = []
+        for record in records:
+            batch.append(RECORD.pack(*record))
+            if len(batch) == 4096:
+                stream.write(b"".join(batch))
+                batch = []
+        stream.write(b"".join(batch))
+
+
+def read_trace(path):
+    """
+    Reads the processes of a trace file one at a time, choosing the reader from the file extension:
+    .jsonl for JSON Lines, .bin for binary traces and CSV otherwise.
+
+    Parameters:
+        - path (str): The path of the file.
+
+    Returns:
+        - generator: The fields (number, arrival_time, burst_time, come_back, priority) of each process.
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".jsonl":
+        return read_jsonl(path)
+    if extension == ".bin":
+        return read_binary(path)
+    return read_csv(path)
+
+
+def stream_processes(path):
+    """
+    Creates the processes of a trace file one at a time.
+
+    Passed to a run_algorithm_* function or run_simulation, the stream is read lazily as the
+    simulation reaches each arrival time, so the trace must be sorted by arrival time and the
+    processes that have not arrived yet are never held in memory. The processes that have arrived
+    and still come back stay in memory.
+
+    Parameters:
+        - path (str): The path of the trace file (see read_trace).
+
+    Yields:
+        - Process: The processes, in file order.
+    """
+
+    for fields in read_trace(path):
+        yield Process(*fields)
+
+
+def load_workload(path):
+    """
+    Reads a whole workload from a trace file (see read_trace).
+
+    Parameters:
+        - path (str): The path of the trace file.
+
+    Returns:
+        - list: The processes of the workload, in file order.
+    """
+    return list(stream_processes(path))
@@ -0,0 +1,70 @@
+"""
+Compares the BatchEngine, which runs a batch of workloads in lockstep with NumPy arrays, against
+running the same workloads one after the other with the tick loops and with the event-driven engine.
+
+The workloads are randomized variants of the 7-process sample of Scheduler.py, run up to time 200.
+
+Usage:
+    python benchmarks/bench_batch.py [batch size ...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from BatchEngine import *
+from Scheduler import *
+
+# The algorithms of the batch engine, with their name for run_simulation
+POLICIES = (("FCFS", "FCFS", True), ("SJF", "SJF", True), ("SRTF", "SRTF", True), ("RR", "RR", True),
+            ("PP", "PP", True), ("NPP", "PP", False))
+
+HORIZON = 200
+
+
+def make_workloads(count, seed=0):
+    """
+    Creates randomized variants of the sample workload: 7 processes, the first arriving at time 0.
+    """
+
+    rng = random.Random(seed)
+    workloads = []
+    for _ in range(count):
+        arrivals = [0] + sorted(rng.randint(1, 10) for _ in range(6))
+        workloads.append(Workload(range(1, 8), arrivals, [rng.randint(4, 14) for _ in range(7)],
+                                  [rng.randint(2, 9) for _ in range(7)], [rng.randint(0, 3) for _ in range(7)]))
+    return workloads
+
+
+def bench_separate(workloads, name, event_driven):
+    start = time.perf_counter()
+    for workload in workloads:
+        run_simulation(workload.processes(), name, HORIZON, event_driven, GanttRecorder(NullSink()))
+    return time.perf_counter() - start
+
+
+def bench_batch(workloads, algorithm, is_preemptive):
+    start = time.perf_counter()
+    engine = BatchEngine.from_workloads(workloads, algorithm, HORIZON, is_preemptive)
+    engine.run()
+    engine.metrics()
+    return time.perf_counter() - start
+
+
+def main(counts):
+    print("%-8s %-6s %11s %11s %11s %9s %9s" % ("batch", "algo", "tick", "event", "batch", "vs tick", "vs event"))
+    for count in counts:
+        workloads = make_workloads(count)
+        for name, algorithm, is_preemptive in POLICIES:
+            tick = bench_separate(workloads, name, False)
+            event = bench_separate(workloads, name, True)
+            batch = bench_batch(workloads, algorithm, is_preemptive)
+            print("%-8d %-6s %10.3fs %10.3fs %10.3fs %8.1fx %8.1fx" % (count, name, tick, event, batch,
+                                                                      tick / batch, event / batch))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000])
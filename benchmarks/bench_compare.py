@@ -0,0 +1,52 @@
+"""
+Compares compare_policies, which runs the six menu algorithms over a workload in one call,
+against six separate runs of run_simulation with the tick loop (the default, as the menu runs them)
+and with the event-driven engine.
+
+Usage:
+    python benchmarks/bench_compare.py [size ...]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Comparison import *
+from bench_suite import make_workload
+
+# The algorithms of the menu, compared in every benchmark
+POLICIES = tuple(MENU_OPTIONS.values())
+
+
+def bench_separate(workload, horizon, event_driven):
+    start = time.perf_counter()
+    for algorithm in POLICIES:
+        run_simulation(workload.processes(), algorithm, horizon, event_driven, GanttRecorder(NullSink()))
+    return time.perf_counter() - start
+
+
+def bench_compare(workload, horizon):
+    start = time.perf_counter()
+    compare_policies(workload, POLICIES, horizon)
+    return time.perf_counter() - start
+
+
+def main(sizes):
+    print("%-10s %-10s %12s %12s %12s %9s %9s" % ("size", "horizon", "tick", "event", "compare",
+                                                  "vs tick", "vs event"))
+    for size in sizes:
+        workload = make_workload(size)
+        # a horizon covering every arrival, as in the size sweep of bench_suite.py
+        horizon = max(200, 20 * size)
+        tick = bench_separate(workload, horizon, False)
+        event = bench_separate(workload, horizon, True)
+        compare = bench_compare(workload, horizon)
+        print("%-10d %-10d %11.4fs %11.4fs %11.4fs %8.2fx %8.2fx" % (size, horizon, tick, event, compare,
+                                                                     tick / compare, event / compare))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 1000])
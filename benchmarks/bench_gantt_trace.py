@@ -0,0 +1,72 @@
+"""
+Measures the columnar Gantt chart file of GanttTrace.py on a long synthetic timeline: writing the
+segments with their summaries, opening the file, rendering the whole timeline and a zoomed-in part
+of it (downsampled from the summaries), and reading every segment back as columns for comparison.
+
+The timeline has back-to-back segments of 1 to 100 time units, with idle gaps, spread over about
+50 time units per segment (10^8 time units for two million segments).
+
+Usage:
+    python benchmarks/bench_gantt_trace.py [segments ...]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GanttTrace import *
+
+# The number of segments written per block, as with the default buffer of GanttRecorder
+BATCH = 4096
+
+
+def write_timeline(path, count, seed=0):
+    rng = random.Random(seed)
+    now = 0
+    start = time.perf_counter()
+    with GanttWriter(path) as writer:
+        for first in range(0, count, BATCH):
+            starts, ends, pids = array("q"), array("q"), array("q")
+            for _ in range(min(BATCH, count - first)):
+                now = now + (rng.randint(1, 40) if rng.random() < 0.1 else 0)
+                starts.append(now)
+                now = now + rng.randint(1, 100)
+                ends.append(now)
+                pids.append(rng.randint(1, 500))
+            writer.write(starts, ends, pids)
+    return time.perf_counter() - start, now
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main(counts):
+    print("%-10s %-11s %9s %9s %9s %9s %9s %9s" % ("segments", "timeline", "MB", "write", "open", "render",
+                                                   "zoom", "columns"))
+    for count in counts:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "chart.gantt")
+            write, horizon = write_timeline(path, count)
+
+            start = time.perf_counter()
+            trace = GanttTrace(path)
+            opened = time.perf_counter() - start
+
+            render = timed(render_text, trace, 0, horizon, 120)
+            zoom = timed(render_text, trace, horizon // 2, horizon // 2 + 5000, 120)
+            columns = timed(trace.columns)
+            print("%-10d %-11d %9.1f %8.3fs %8.4fs %8.4fs %8.4fs %8.3fs" % (count, horizon, os.path.getsize(path) / 2 ** 20,
+                                                                            write, opened, render, zoom, columns))
+            trace.close()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100000, 2000000])
@@ -0,0 +1,137 @@
+"""
+Compares IndexedPriorityQueue against the heapq tuple wrapper PriorityQueue, and the SJF and SRTF
+ready queues (BurstTimeQueue and RemainingTimeQueue) against PriorityQueue with the same orderings.
+
+Usage:
+    python benchmarks/bench_priority_queue.py [size ...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PriorityQueue import *
+from Process import *
+
+
+class Item:
+    """
+    A queued item with a mutable integer key, standing in for a Process.
+    """
+
+    def __init__(self, key):
+        self.key = key
+
+
+def make_items(size, seed=0):
+    """
+    Creates items with distinct keys, so the tuple wrapper never has to compare items.
+    """
+
+    rng = random.Random(seed)
+    return [Item(key) for key in rng.sample(range(size * 10), size)]
+
+
+def bench_push_pop(queue_class, size):
+    items = make_items(size)
+    queue = queue_class(lambda item: item.key)
+
+    start = time.perf_counter()
+    for item in items:
+        queue.append(item)
+    while not queue.is_empty():
+        queue.pop()
+    return time.perf_counter() - start
+
+
+def bench_remove(queue_class, size, count):
+    items = make_items(size)
+    queue = queue_class(lambda item: item.key)
+    handles = [queue.append(item) for item in items]
+    targets = random.Random(1).sample(range(size), count)
+
+    start = time.perf_counter()
+    for index in targets:
+        if queue_class is IndexedPriorityQueue:
+            queue.remove(handles[index])
+        else:
+            queue.remove(items[index])
+    return time.perf_counter() - start
+
+
+def bench_reprioritise(queue_class, size, count):
+    items = make_items(size)
+    queue = queue_class(lambda item: item.key)
+    handles = [queue.append(item) for item in items]
+    targets = random.Random(2).sample(range(size), count)
+
+    start = time.perf_counter()
+    for index in targets:
+        item = items[index]
+        if queue_class is IndexedPriorityQueue:
+            item.key = -item.key - 1
+            queue.decrease_key(handles[index])
+        else:
+            # the tuple wrapper has no way to change a key in place
+            queue.remove(item)
+            item.key = -item.key - 1
+            queue.append(item)
+    return time.perf_counter() - start
+
+
+def make_processes(size, seed=0):
+    """
+    Creates processes with bursts of 1 to 20, as in a scheduling workload, so most keys are tied.
+    """
+
+    rng = random.Random(seed)
+    processes = [Process(number, 0, rng.randint(1, 20), 0, 0) for number in range(size)]
+    for process in processes:
+        process.remaining_time = rng.randint(1, process.burst_time)
+        process.ready_queue_time = rng.randrange(size)
+    return processes
+
+
+def bench_ready_queue(make_queue, size):
+    processes = make_processes(size)
+    queue = make_queue()
+
+    start = time.perf_counter()
+    for process in processes:
+        queue.append(process)
+    while not queue.is_empty():
+        queue.peek()
+        queue.pop()
+    return time.perf_counter() - start
+
+
+def main(sizes):
+    print("%-10s %-28s %14s %14s %8s" % ("size", "operation", "PriorityQueue", "Indexed", "ratio"))
+    for size in sizes:
+        count = min(size // 2, 1000)
+        rows = [("push + pop all", lambda queue_class: bench_push_pop(queue_class, size)),
+                ("remove %d" % count, lambda queue_class: bench_remove(queue_class, size, count)),
+                ("re-prioritise %d" % count, lambda queue_class: bench_reprioritise(queue_class, size, count))]
+        for name, bench in rows:
+            base = bench(PriorityQueue)
+            indexed = bench(IndexedPriorityQueue)
+            print("%-10d %-28s %13.4fs %13.4fs %7.2fx" % (size, name, base, indexed, base / indexed))
+
+    print()
+    print("%-10s %-28s %14s %14s %8s" % ("size", "ready queue", "PriorityQueue", "Specialised", "ratio"))
+    for size in sizes:
+        rows = [("SJF (burst time)", lambda: PriorityQueue(lambda item: item.burst_time), BurstTimeQueue),
+                ("SRTF (remaining, ready time)", lambda: PriorityQueue(lambda item: item.remaining_time,
+                                                                        lambda item: item.ready_queue_time),
+                 RemainingTimeQueue)]
+        for name, generic, specialised in rows:
+            base = bench_ready_queue(generic, size)
+            fast = bench_ready_queue(specialised, size)
+            print("%-10d %-28s %13.4fs %13.4fs %7.2fx" % (size, name, base, fast, base / fast))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 30000])
@@ -0,0 +1,364 @@
+"""
+Benchmark suite: runs every scheduling algorithm and every queue operation over seeded synthetic
+workloads, and reports wall time, cost per scheduling event, peak memory and scaling curves.
+
+The results can be saved as a baseline and later runs compared against it; the comparison exits
+with status 1 if any benchmark got slower than the threshold allows.
+
+Usage:
+    python benchmarks/bench_suite.py [--preset quick|full] [--algorithms RR SRTF ...] [--no-memory]
+                                     [--save baseline.json] [--compare baseline.json] [--threshold 1.25]
+
+The quick preset runs workloads of 10 to 10^4 processes and horizons up to 10^6 in a few minutes.
+The full preset goes up to 10^6 processes and horizons of 10^8, which takes much longer.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Scheduler import *
+
+# The workload sizes, horizons and tick loop limit of each preset. The size sweep runs each
+# workload up to a horizon covering all its arrivals; the horizon sweep runs a fixed workload.
+PRESETS = {
+    "quick": {"sizes": (10, 100, 1000, 10000), "horizon_size": 1000, "horizons": (10 ** 4, 10 ** 5, 10 ** 6),
+              "tick_limit": 10 ** 5, "queue_sizes": (10 ** 3, 10 ** 4, 10 ** 5)},
+    "full": {"sizes": (10, 100, 1000, 10 ** 4, 10 ** 5, 10 ** 6), "horizon_size": 1000,
+             "horizons": (10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8),
+             "tick_limit": 10 ** 6, "queue_sizes": (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)},
+}
+
+# The mean time between two arrivals of a synthetic workload; bursts average 10.5 time units
+MEAN_GAP = 12
+
+
+def make_workload(size, seed=0):
+    """
+    Creates a seeded synthetic workload.
+
+    Bursts are uniform between 1 and 20 and arrivals are spread so that the first bursts keep the
+    CPU about 90% busy. Half of the processes never come back; the others come back 20 to 200
+    time units after each burst, so long horizons keep the CPU saturated. Several processes may
+    arrive at the same time, including time 0, and every one of them is admitted and runs.
+
+    Parameters:
+        - size (int): The number of processes.
+        - seed (int): The seed of the random generator.
+
+    Returns:
+        - Workload: The workload.
+    """
+
+    rng = random.Random(seed)
+    arrivals = [0] * size
+    for index in range(1, size):
+        arrivals[index] = arrivals[index - 1] + rng.randint(0, 2 * MEAN_GAP)
+
+    return Workload(range(1, size + 1), arrivals,
+                    [rng.randint(1, 20) for _ in range(size)],
+                    [0 if rng.random() < 0.5 else rng.randint(20, 200) for _ in range(size)],
+                    [rng.randint(0, 10) for _ in range(size)])
+
+
+def timed(function, minimum=0.2, repeat=5):
+    """
+    Calls a function until it has run for a minimum total time or a number of times,
+    and returns its fastest call in seconds along with the value of that call.
+    """
+
+    best, value, total, calls = None, None, 0, 0
+    while calls < repeat and (calls == 0 or total < minimum):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best, value = elapsed, result
+        total = total + elapsed
+        calls = calls + 1
+    return best, value
+
+
+def peak_memory(function):
+    """
+    Returns the peak memory allocated by a call of a function, in megabytes.
+    """
+
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def count_events(workload, algorithm, horizon, event_driven):
+    """
+    Counts the scheduling events of a run: the arrivals, comebacks, completions and preemptions it
+    handles. The count comes from a separate instrumented run, so it does not slow the timed runs,
+    and it is the same for the tick loop and the event-driven engine.
+
+    Returns:
+        - tuple: The number of events and the number of processes that executed.
+    """
+
+    instruments = Instrumentation()
+    processes = workload.processes()
+    result = run_simulation(processes, algorithm, horizon, event_driven, GanttRecorder(NullSink()),
+                            instruments=instruments)
+    report = instruments.report()
+    phases = report["phases"]
+    events = (phases["arrivals"]["processes"] + phases["comebacks"]["processes"]
+              + phases["completions"]["processes"] + report["preemptions"])
+    return events, result["metrics"]["executed"]
+
+
+def bench_run(workload, algorithm, horizon, event_driven, memory):
+    """
+    Runs one algorithm over a workload.
+
+    Returns:
+        - dict: seconds (wall time of the run), events (scheduling events handled, see count_events),
+            us_per_event, executed (processes that ran), segments (Gantt chart segments recorded),
+            and peak_mb (or None without memory measurement), or error if the run raised.
+    """
+
+    def run():
+        gantt = GanttRecorder(NullSink())
+        processes = workload.processes()
+        start = time.perf_counter()
+        run_simulation(processes, algorithm, horizon, event_driven, gantt)
+        return time.perf_counter() - start, gantt.count
+
+    try:
+        _, (seconds, segments) = timed(lambda: run())
+    except Exception as error:
+        return {"error": type(error).__name__ + ": " + str(error)}
+
+    events, executed = count_events(workload, algorithm, horizon, event_driven)
+    result = {"seconds": seconds, "events": events, "us_per_event": 1e6 * seconds / events if events else None,
+              "executed": executed, "segments": segments, "peak_mb": None}
+    if memory:
+        result["peak_mb"] = peak_memory(run)
+    return result
+
+
+def queue_benchmarks(size, seed=0):
+    """
+    Creates the queue operation benchmarks for a queue size.
+
+    Returns:
+        - list: (name, function) pairs; each function fills and drains a queue of `size`
+            processes and returns the number of operations it performed.
+    """
+
+    processes = make_workload(size, seed).processes()
+    rng = random.Random(seed)
+    for process in processes:
+        process.ready_queue_time = rng.randrange(size)
+        process.finish_time = rng.randrange(size)
+
+    def fill_and_drain(queue, pop):
+        for process in processes:
+            queue.append(process)
+        while queue:
+            pop(queue)
+        return 2 * size
+
+    def aging_queue():
+        queue = AgingQueue()
+        for process in processes:
+            queue.append(process)
+        time_now = size
+        while queue:
+            time_now = time_now + 1
+            queue.age(time_now)
+            queue.pop()
+        return 2 * size
+
+    def waiting_queue():
+        queue = WaitingQueue()
+        for process in processes:
+            queue.append(process)
+        time_now = 0
+        while queue:
+            time_now = time_now + 1
+            queue.pop_comebacks(time_now)
+        return size + time_now
+
+    def arrival_index():
+        arrivals = ArrivalIndex(processes)
+        time_now = 0
+        while not arrivals.is_empty():
+            time_now = time_now + 1
+            arrivals.pop_arrivals(time_now)
+        return size + time_now
+
+    return [("deque", lambda: fill_and_drain(deque(), deque.popleft)),
+            ("PriorityQueue", lambda: fill_and_drain(PriorityQueue(lambda item: item.burst_time,
+                                                                   lambda item: item.number), PriorityQueue.pop)),
+            ("BurstTimeQueue", lambda: fill_and_drain(BurstTimeQueue(), BurstTimeQueue.pop)),
+            ("RemainingTimeQueue", lambda: fill_and_drain(RemainingTimeQueue(), RemainingTimeQueue.pop)),
+            ("IndexedPriorityQueue", lambda: fill_and_drain(IndexedPriorityQueue(lambda item: item.burst_time),
+                                                            IndexedPriorityQueue.pop)),
+            ("AgingQueue", aging_queue),
+            ("WaitingQueue", waiting_queue),
+            ("ArrivalIndex", arrival_index)]
+
+
+def scaling_exponent(points):
+    """
+    Fits time = c * x^k to (x, time) points by least squares on a log-log scale and returns k,
+    or None with fewer than two usable points.
+    """
+
+    points = [(math.log(x), math.log(y)) for x, y in points if x > 0 and y and y > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if spread == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def run_suite(preset, algorithms, memory):
+    """
+    Runs the benchmarks of a preset, printing each result as it is measured.
+
+    Returns:
+        - dict: Maps a benchmark name to its result.
+    """
+
+    settings = PRESETS[preset]
+    results = {}
+
+    def report(name, result):
+        results[name] = result
+        if "error" in result:
+            print("%-52s %s" % (name, result["error"]), flush=True)
+            return
+        line = "%-52s %10.4fs" % (name, result["seconds"])
+        if result.get("us_per_event") is not None:
+            line = line + " %9d events %8.2f us/event" % (result["events"], result["us_per_event"])
+        if result.get("ns_per_op") is not None:
+            line = line + " %10.1f ns/op" % result["ns_per_op"]
+        if result.get("peak_mb") is not None:
+            line = line + " %9.2f MB peak" % result["peak_mb"]
+        print(line, flush=True)
+
+    print("== queue operations")
+    for size in settings["queue_sizes"]:
+        for queue_name, function in queue_benchmarks(size):
+            seconds, operations = timed(function)
+            report("queue/%s/n=%d" % (queue_name, size),
+                   {"seconds": seconds, "operations": operations, "ns_per_op": 1e9 * seconds / operations})
+
+    print("== workload size (horizon covers every arrival)")
+    for size in settings["sizes"]:
+        workload = make_workload(size)
+        horizon = workload.arrival_time[-1] + 1000
+        for algorithm in algorithms:
+            for engine in ("tick", "event"):
+                if engine == "tick" and horizon > settings["tick_limit"]:
+                    continue
+                report("size/%s/%s/n=%d" % (algorithm, engine, size),
+                       bench_run(workload, algorithm, horizon, engine == "event", memory))
+
+    print("== horizon (%d processes)" % settings["horizon_size"])
+    workload = make_workload(settings["horizon_size"])
+    for horizon in settings["horizons"]:
+        for algorithm in algorithms:
+            for engine in ("tick", "event"):
+                if engine == "tick" and horizon > settings["tick_limit"]:
+                    continue
+                report("horizon/%s/%s/h=%d" % (algorithm, engine, horizon),
+                       bench_run(workload, algorithm, horizon, engine == "event", memory))
+
+    return results
+
+
+def print_scaling(results):
+    """
+    Prints the scaling exponent of each series of size and horizon benchmarks:
+    about 1 for linear scaling, more for super-linear.
+    """
+
+    series = {}
+    for name, result in results.items():
+        kind, *rest = name.split("/")
+        if kind not in ("size", "horizon", "queue") or "error" in result:
+            continue
+        prefix, parameter = name.rsplit("/", 1)
+        series.setdefault(prefix, []).append((int(parameter.split("=")[1]), result["seconds"]))
+
+    print("== scaling exponents (time ~ parameter^k)")
+    for prefix, points in sorted(series.items()):
+        exponent = scaling_exponent(points)
+        if exponent is not None:
+            curve = "  ".join("%d:%.3gs" % point for point in sorted(points))
+            print("%-40s k=%5.2f   %s" % (prefix, exponent, curve))
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares results with a saved baseline and prints the ratio of every common benchmark.
+
+    Returns:
+        - int: The number of benchmarks slower than threshold times their baseline.
+    """
+
+    regressions = 0
+    print("== comparison with baseline (new / old)")
+    for name, result in results.items():
+        old = baseline["results"].get(name)
+        if old is None or "error" in old or "error" in result:
+            continue
+        ratio = result["seconds"] / old["seconds"]
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions = regressions + 1
+        print("%-52s %8.2fx%s" % (name, ratio, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark suite for the scheduling algorithms and queues.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--algorithms", nargs="+", type=str.upper, choices=ALGORITHMS, default=list(ALGORITHMS))
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory measurements")
+    parser.add_argument("--save", help="save the results as a baseline JSON file")
+    parser.add_argument("--compare", help="compare the results with a baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio above which a benchmark counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.preset, args.algorithms, not args.no_memory)
+    print_scaling(results)
+
+    if args.save:
+        with open(args.save, "w") as stream:
+            json.dump({"preset": args.preset, "python": platform.python_version(),
+                       "machine": platform.machine(), "results": results}, stream, indent=1)
+
+    if args.compare:
+        with open(args.compare) as stream:
+            regressions = compare(results, json.load(stream), args.threshold)
+        if regressions:
+            print("%d regressions" % regressions)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()